@@ -1,7 +1,10 @@
 from MAVez.controller import Controller
 from MAVez.flight_controller import FlightController
 from MAVez.mission import Mission
+from MAVez.mission_download import MissionDownload
 from MAVez.mission_item import MissionItem
+from MAVez.mission_upload import MissionUpload
+from MAVez.vehicle_router import VehicleRouter
 from MAVez.enums.mav_landed_state import MAVLandedState
 from MAVez.enums.mav_message import MAVMessage
 from MAVez.enums.mav_mission_result import MAVMissionResult
@@ -11,7 +14,10 @@ __all__ = [
     "Controller",
     "FlightController",
     "Mission",
+    "MissionDownload",
     "MissionItem",
+    "MissionUpload",
+    "VehicleRouter",
     "MAVLandedState",
     "MAVMessage",
     "MAVMissionResult",
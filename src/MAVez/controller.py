@@ -1,8 +1,8 @@
 # mav_controller.py
-# version: 3.8.0
+# version: 3.25.4
 # Author: Theodore Tasman
 # Creation Date: 2025-01-30
-# Last Modified: 2026-03-26
+# Last Modified: 2026-10-18
 # Organization: PSU UAS
 
 """
@@ -10,7 +10,11 @@ This module is responsible for controlling ardupilot.
 """
 
 import asyncio
-from collections import defaultdict
+import concurrent.futures
+import functools
+import multiprocessing
+import threading
+from collections import deque
 import time
 from logging import Logger
 from typing import Callable
@@ -19,7 +23,15 @@ from pyparsing import Any # type: ignore[import]
 
 from lingo import Publisher, Message
 
-from MAVez.translate_message import translate_message
+from MAVez.translate_message import LazyMessage, raw_frame_message, translate_topic
+from MAVez.message_stream import MessageStream
+from MAVez.publish_queue import PublishQueue
+from MAVez.publish_rate import PublishRateLimiter
+from MAVez.publish_batch import PublishBatcher
+from MAVez.shared_state import SharedStateWriter
+from MAVez.process_reader import ProcessReader
+from MAVez.message_filter import MessageFilter
+from MAVez.link_health import LinkDeduplicator, LinkHealth
 from MAVez.coordinate import Coordinate
 from MAVez.safe_logger import SafeLogger
 
@@ -29,6 +41,61 @@ from MAVez.enums.mav_result import MAVResult
 from MAVez.enums.mav_message import MAVMessage
 
 
+class _MessageWaiter:
+    """
+    A pending receive_message call, resolved directly by the message pump.
+
+    Args:
+        future (asyncio.Future): Future resolved with the matching message dict, or None on timeout.
+        min_seq (int): The minimum sequence of the message type desired.
+        matches (Callable[[dict], bool]): Requirement for the message to be returned.
+    """
+
+    __slots__ = ("future", "min_seq", "matches")
+
+    def __init__(self, future: asyncio.Future, min_seq: int, matches: Callable[[dict], bool]):
+        self.future = future
+        self.min_seq = min_seq
+        self.matches = matches
+
+    def expire(self):
+        """
+        Resolve the waiter with None once its deadline passes.
+        """
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class _MessageSlot:
+    """
+    Bookkeeping of one message type, stored in a list indexed by message id so the pump needs no string lookups.
+
+    Args:
+        name (str): The MAVLink message type name.
+        history_depth (int): Number of recent messages kept.
+        key_field (str | None): The discriminator field waiters can register on.
+        publish (bool): Whether messages of the type are published.
+        shared (bool): Whether messages of the type are written to the shared state block.
+        filtered (bool): Whether the type is dropped at the frame header and only counted.
+    """
+
+    __slots__ = ("name", "seq", "history", "waiters", "key_field", "streams", "publish", "shared", "filtered", "filtered_bytes")
+
+    def __init__(self, name: str, history_depth: int, key_field: str | None, publish: bool, shared: bool, filtered: bool):
+        self.name = name
+        self.seq = 0
+        # ring buffer of (seq, message), newest last
+        self.history: deque[tuple[int, LazyMessage]] = deque(maxlen=history_depth)
+        # per discriminator key (None for any message of the type), the waiting receivers
+        self.waiters: dict[Any, list[_MessageWaiter]] = {}
+        self.key_field = key_field
+        self.streams: list[MessageStream] = []
+        self.publish = publish
+        self.shared = shared
+        self.filtered = filtered
+        self.filtered_bytes = 0
+
+
 class Controller:
     """
     Controller class for atomic MAVLink communication with ardupilot.
@@ -40,6 +107,37 @@ class Controller:
         message_host (str): The host for the messaging system. Default is "127.0.0.1".
         message_port (int): The port for the messaging system. Default is 5555.
         message_topic (str): The topic prefix for the messaging system. Default is "".
+        timesync (bool): Whether to enable time synchronization. Default is False.
+        publish_wait_time (float): Seconds the publisher sleeps when it has nothing to send. Default is 0, which polls continuously.
+        reader (str): How the message pump reads the link. "executor" runs a blocking read in the default executor for every message, "asyncio" feeds bytes from the event loop straight into the parser (tcp, udp and serial links only),
+            "thread" reads and parses continuously in a dedicated thread that hands messages to the event loop (any link, suited to serial),
+            "process" reads, decodes and extracts fields in a forked child process that passes records back through shared memory (platforms with fork only). Default is "executor".
+        batch (bool): Whether the message pump drains every buffered message on each wakeup and wakes waiters once per batch. Default is False.
+        history_depths (dict[MAVMessage, int] | None): Number of recent messages kept per message type, overriding DEFAULT_HISTORY_DEPTH for the given types. Default is None.
+        publish_types (list[MAVMessage] | None): Message types forwarded to the publisher. Other types are only translated when read. Default is None, which publishes every type.
+        publish_queue_size (int): Most messages waiting for the publisher. When it falls behind, messages are dropped by publish_policy instead of growing the queue. 0 leaves the queue unbounded. Default is 1024.
+        publish_policy (str): How a full publish queue drops messages: "drop_oldest", "drop_newest" or "coalesce" (keep only the latest queued message per topic). Dropped messages are counted in msg_queue.dropped. Default is "drop_oldest".
+        publish_rates (dict[MAVMessage | str, float | None] | None): Maximum publish rate in Hz per message type, with "*" for every other type, e.g. {MAVMessage.ATTITUDE: 10, MAVMessage.RC_CHANNELS: 2, "*": 0}.
+            0 stops publishing a type and None publishes every message. Decimated types always publish their latest sample, and skipped messages are never translated. Applies to the types allowed by publish_types. Default is None, which publishes every message.
+        publish_format (str): How messages are published on their per-type topics. "dict" publishes the translated fields as the header,
+            "raw" publishes the original MAVLink frame as the payload with an empty header, and "raw_batch" publishes the frames of each type received in one pump wakeup joined in a single payload.
+            Decode raw payloads with translate_message.decode_raw_message. Default is "dict".
+        publish_batch_size (int): Most messages coalesced into one published frame on the "<message_topic>_BATCH" topic (or "BATCH"), split them with publish_batch.unbatch_message. Default is 0, which publishes every message on its own.
+        publish_batch_delay (float): Most seconds a message waits for its batch to fill. Default is 0.005.
+        shared_state_path (str | None): File of a memory-mapped block kept updated with the latest message of each shared_state_types type, for other processes to read with shared_state.SharedStateReader. Default is None, which disables the block.
+        shared_state_types (list[MAVMessage] | None): Message types kept in the shared state block. Default is None, which keeps HEARTBEAT, GLOBAL_POSITION_INT and ATTITUDE.
+        allow_types (list[MAVMessage] | None): Only these message types are decoded, every other type is dropped at the frame header and only counted (see get_message_seq and get_filtered_bytes).
+            Keep the types the controller waits on (e.g. COMMAND_ACK, MISSION_REQUEST, MISSION_ACK) allowed. Default is None, which decodes every type.
+        deny_types (list[MAVMessage] | None): Message types dropped at the frame header and only counted. Default is None.
+        master (mavfile | None): An open pymavlink connection that has already received a heartbeat, as returned by the probes of connect. Default is None, which opens connection_string and waits for a heartbeat, blocking for up to TIMEOUT_DURATION.
+            Prefer await Controller.connect(...) from async code.
+        target_system (int): System id commands are addressed to. Default is 0, which addresses every system on the link.
+        target_component (int): Component id commands are addressed to. Default is 0, which addresses every component.
+        router (Controller | None): The VehicleRouter this controller is a per-vehicle view of, as created by VehicleRouter.vehicle. A view never reads the link:
+            the router hands it the messages of its vehicle, it publishes through the router's publisher and its blocking streams hold back the router's pump. Default is None.
+        links (list[str] | None): Connection strings of redundant links to the same vehicles, e.g. an LTE modem next to the radio on connection_string. Every link is read concurrently with the reader mode,
+            messages received on several links are dispatched once (by source, packet sequence, message id and checksum, within link_health.LinkDeduplicator.DUPLICATE_TIMEOUT), and outbound messages go on the healthiest link by live lag and loss (see links and link_health.LinkDeduplicator).
+            Only connection_string is waited on for a heartbeat, a link that cannot be opened is skipped. Default is None.
 
     Raises:
         ConnectionError: If the connection to ardupilot fails.
@@ -51,6 +149,29 @@ class Controller:
     UNKNOWN_MODE = 111
 
     TIMEOUT_DURATION = 5  # timeout duration in seconds
+    PROBE_INTERVAL = 0.1  # seconds a connect probe blocks waiting for a heartbeat before checking if another endpoint won
+
+    # message pump reader modes
+    READER_MODES = ("executor", "asyncio", "thread", "process")
+    READ_SIZE = 4096  # bytes read per wakeup by the asyncio reader
+    MAX_BATCH_SIZE = 256  # most messages dispatched per wakeup by the executor reader in batch mode
+    MAX_DRAIN_BYTES = 65536  # most bytes drained per wakeup by the asyncio reader in batch mode
+    THREAD_READ_TIMEOUT = 0.5  # seconds the reader thread blocks on a silent link before checking for shutdown
+
+    DEFAULT_HISTORY_DEPTH = 16  # recent messages kept per message type
+
+    PUBLISH_FORMATS = ("dict", "raw", "raw_batch")
+
+    # discriminator field per message type, waiters can register on a value of this field to only be woken by matching messages
+    WAITER_KEYS = {
+        "COMMAND_ACK": "command",
+        "MISSION_REQUEST": "seq",
+        "MISSION_REQUEST_INT": "seq",
+        "MISSION_ITEM": "seq",
+        "MISSION_ITEM_INT": "seq",
+        "MISSION_ITEM_REACHED": "seq",
+        "PARAM_VALUE": "param_id",
+    }
 
     def __init__(self, connection_string: str = "tcp:127.0.0.1:5762", 
                  baud: int = 57600, 
@@ -58,7 +179,27 @@ class Controller:
                  message_host: str = "127.0.0.1", 
                  message_port: int = 5555, 
                  message_topic: str = "",
-                 timesync: bool = False) -> None:
+                 timesync: bool = False,
+                 publish_wait_time: float = 0,
+                 reader: str = "executor",
+                 batch: bool = False,
+                 history_depths: dict[MAVMessage, int] | None = None,
+                 publish_types: list[MAVMessage] | None = None,
+                 publish_queue_size: int = 1024,
+                 publish_policy: str = "drop_oldest",
+                 publish_rates: dict[MAVMessage | str, float | None] | None = None,
+                 publish_format: str = "dict",
+                 publish_batch_size: int = 0,
+                 publish_batch_delay: float = 0.005,
+                 shared_state_path: str | None = None,
+                 shared_state_types: list[MAVMessage] | None = None,
+                 allow_types: list[MAVMessage] | None = None,
+                 deny_types: list[MAVMessage] | None = None,
+                 master=None,
+                 target_system: int = 0,
+                 target_component: int = 0,
+                 router: "Controller | None" = None,
+                 links: list[str] | None = None) -> None:
         """
         Initialize the controller.
 
@@ -70,8 +211,29 @@ class Controller:
             message_port (int): The port for the messaging system. Default is 5555.
             message_topic (str): The topic prefix for the messaging system. Default is "".
             timesync (bool): Whether to enable time synchronization. Default is False.
+            publish_wait_time (float): Seconds the publisher sleeps when it has nothing to send. Default is 0.
+            reader (str): Message pump reader mode, "executor", "asyncio", "thread" or "process". Default is "executor".
+            batch (bool): Whether to drain and dispatch every buffered message per wakeup. Default is False.
+            history_depths (dict[MAVMessage, int] | None): Recent messages kept per message type, for types that need more (or less) than DEFAULT_HISTORY_DEPTH. Default is None.
+            publish_types (list[MAVMessage] | None): Message types forwarded to the publisher. Default is None, which publishes every type.
+            publish_queue_size (int): Most messages waiting for the publisher, 0 for unbounded. Default is 1024.
+            publish_policy (str): Drop policy of a full publish queue, "drop_oldest", "drop_newest" or "coalesce". Default is "drop_oldest".
+            publish_rates (dict[MAVMessage | str, float | None] | None): Maximum publish rate in Hz per message type, "*" for every other type. Default is None.
+            publish_format (str): "dict", "raw" or "raw_batch". Default is "dict".
+            publish_batch_size (int): Most messages per published batch, 0 to publish every message on its own. Default is 0.
+            publish_batch_delay (float): Most seconds a message waits for its batch to fill. Default is 0.005.
+            shared_state_path (str | None): File of the shared state block, None to disable it. Default is None.
+            shared_state_types (list[MAVMessage] | None): Message types kept in the shared state block. Default is None, which keeps HEARTBEAT, GLOBAL_POSITION_INT and ATTITUDE.
+            allow_types (list[MAVMessage] | None): Only these message types are decoded. Default is None, which decodes every type.
+            deny_types (list[MAVMessage] | None): Message types never decoded. Default is None.
+            master (mavfile | None): An open pymavlink connection that has already received a heartbeat. Default is None, which opens connection_string.
+            target_system (int): System id commands are addressed to, 0 for every system. Default is 0.
+            target_component (int): Component id commands are addressed to, 0 for every component. Default is 0.
+            router (Controller | None): The VehicleRouter this controller is a view of. Default is None.
+            links (list[str] | None): Connection strings of redundant links to the same vehicles. Default is None.
         Raises:
             ConnectionError: If the connection to ardupilot fails.
+            ValueError: If the reader mode, publish policy or publish format is unknown, a publish rate is negative, the batch delay is negative, a history depth is below 1 or a router view filters message types.
 
         Returns:
             None
@@ -79,31 +241,102 @@ class Controller:
 
         self.logger = SafeLogger(logger)
 
-        self.msg_queue = asyncio.Queue()
-
-        self.master = mavutil.mavlink_connection(connection_string, baud=baud)  # type: ignore
+        if reader not in self.READER_MODES:
+            raise ValueError(f"Unknown reader mode: {reader}")
+        self.reader = reader
+        self.batch = batch
+        if publish_format not in self.PUBLISH_FORMATS:
+            raise ValueError(f"Unknown publish format: {publish_format}")
+        self.publish_format = publish_format
+        # checked here, the deque of a type is only built once the pump receives it
+        for message_type, depth in (history_depths or {}).items():
+            if not isinstance(depth, int) or isinstance(depth, bool) or depth < 1:
+                raise ValueError(f"History depth of {message_type.name} must be an integer of at least 1, not {depth!r}")
+
+        self.target_system = target_system
+        self.target_component = target_component
+        self.__router = router
+
+        if router is not None:
+            # a view shares the link, its message filter and the publisher of its router
+            if allow_types is not None or deny_types:
+                raise ValueError("Message types are filtered on the router, its link is shared by every view")
+            self.msg_queue = router.msg_queue
+            self.__message_filter = router.__message_filter
+            self.pub = None
+            self.links = []
+            self.__link_deduplicator = None
+        else:
+            self.msg_queue = PublishQueue(publish_queue_size, publish_policy)
+
+            if master is None:
+                master = mavutil.mavlink_connection(connection_string, baud=baud)  # type: ignore
+
+                response = master.wait_heartbeat(  # type: ignore
+                    blocking=True, timeout=self.TIMEOUT_DURATION
+                ) 
+                # check if the connection was successful
+                if not response:
+                    self.logger.error("[Controller] Connection failed")
+                    raise ConnectionError("Connection failed")
+            self.logger.info(f"[Controller] Connection successful. Heartbeat from system (system {master.target_system} component {master.target_component})")  # type: ignore
+
+            # redundant links, deduplicated and ranked when there are several
+            self.links = [LinkHealth(connection_string, master)]
+            for link in links or []:
+                try:
+                    self.links.append(LinkHealth(link, mavutil.mavlink_connection(link, baud=baud)))
+                    self.logger.info(f"[Controller] Redundant link {link} opened")
+                except Exception as e:
+                    self.logger.error(f"[Controller] Could not open redundant link {link}: {e}")
+            self.__link_deduplicator = LinkDeduplicator(self.links) if len(self.links) > 1 else None
 
-        response = self.master.wait_heartbeat(  # type: ignore
-            blocking=True, timeout=self.TIMEOUT_DURATION
-        ) 
-        # check if the connection was successful
-        if not response:
-            self.logger.error("[Controller] Connection failed")
-            raise ConnectionError("Connection failed")
-        self.logger.info(f"[Controller] Connection successful. Heartbeat from system (system {self.master.target_system} component {self.master.target_component})")  # type: ignore
+            # drop unwanted types before they are unpacked
+            self.__message_filter = None
+            if allow_types is not None or deny_types:
+                self.__message_filter = MessageFilter(allow_types, deny_types)
+                for link in self.links:
+                    self.__message_filter.install(link.master)
 
-        self.pub = Publisher(host=message_host, port=message_port, outbound_queue=self.msg_queue)
+            self.pub = Publisher(host=message_host, port=message_port, outbound_queue=self.msg_queue, wait_time=publish_wait_time)
         self.message_topic = message_topic
+        self.__publish_types = None if publish_types is None else {message_type.name for message_type in publish_types}
+        # batches telemetry in front of the publish queue, when enabled
+        self.__publish_batcher = None
+        self.__enqueue = self.msg_queue.put_nowait
+        if publish_batch_size > 0:
+            self.__publish_batcher = PublishBatcher(translate_topic("BATCH", message_topic), publish_batch_size, publish_batch_delay, self.msg_queue.put_nowait)
+            self.__enqueue = self.__publish_batcher.add
+        self.__publish_limiter = None
+        if publish_rates:
+            rates = {getattr(message_type, "name", message_type): rate for message_type, rate in publish_rates.items()}
+            self.__publish_limiter = PublishRateLimiter(rates, self.__publish)
+        # latest message per type for other local processes, when enabled
+        self.__shared_state = None
+        if shared_state_path is not None:
+            self.__shared_state = SharedStateWriter(shared_state_path, shared_state_types or SharedStateWriter.DEFAULT_TYPES)
+            self.logger.info(f"[Controller] Shared state block at {shared_state_path}")
+        # raw frames per type collected during a pump wakeup in raw_batch format
+        self.__raw_frames: dict[str, list[memoryview]] | None = None
         self.message_host = message_host
         self.message_port = message_port
-        self.logger.info(f"[Controller] Publisher initialized at {message_host}:{message_port}")
+        if self.pub is not None:
+            self.logger.info(f"[Controller] Publisher initialized at {message_host}:{message_port}")
 
         self.__running = False
         self.__message_pump_task = None
         self.__clock_sync_task = None
-        self.__waiters_by_type: defaultdict[str, list[asyncio.Event]] = defaultdict(list)
-        self.__message_seq_by_type: defaultdict[str, int] = defaultdict(int)
-        self.__latest_messages: dict[str, Message] = {}
+        # per type bookkeeping indexed by message id, grown on demand, and the same slots by type name
+        self.__slots: list[_MessageSlot | None] = []
+        self.__slots_by_name: dict[str, _MessageSlot] = {}
+        self.__history_depths = {message_type.value: depth for message_type, depth in (history_depths or {}).items()}
+        # streams that hold the pump back when full, a view's hold back its router's pump
+        self.__blocking_streams: set[MessageStream] = router.__blocking_streams if router is not None else set()
+
+        # fields of the items the vehicle holds per mission type, kept by mission transfers, used for differential uploads
+        self.uploaded_missions: dict[int, list[tuple]] = {}
+        # opaque id the vehicle gave the mission it holds per mission type, if its MAVLink dialect has them
+        self.mission_opaque_ids: dict[int, int] = {}
 
         # clock sync variables
         self.timesync = timesync
@@ -116,6 +349,126 @@ class Controller:
         self.local_samples = []
         self.peer_samples = []
 
+    @property
+    def master(self):
+        """
+        The pymavlink connection messages are sent on: the link, the healthiest of several links, or the router's for a view.
+
+        Returns:
+            mavfile: The connection.
+        """
+        if self.__router is not None:
+            return self.__router.master
+        if self.__link_deduplicator is not None:
+            return self.__link_deduplicator.active.master
+        return self.links[0].master
+
+    @classmethod
+    async def connect(cls, endpoints: str | list[str], baud: int = 57600, timeout: float | None = None, **kwargs) -> "Controller":
+        """
+        Connect to ardupilot without blocking the event loop, then create the controller.
+        Candidate endpoints are opened and probed for a heartbeat concurrently, the first to answer is used and the others are closed.
+
+        Example:
+            controller = await FlightController.connect(["udp:0.0.0.0:14550", "tcp:127.0.0.1:5762"], logger=logger)
+
+        Args:
+            endpoints (str | list[str]): The connection string, or candidate connection strings.
+            baud (int): The baud rate for serial endpoints. Default is 57600.
+            timeout (float | None): Seconds to wait for a heartbeat, including opening the endpoint. Default is None, which uses TIMEOUT_DURATION.
+            **kwargs: The other arguments of the constructor.
+
+        Raises:
+            ValueError: If no endpoint is given.
+            ConnectionError: If no endpoint answered in time.
+
+        Returns:
+            Controller: The connected controller, of the class connect was called on.
+        """
+        if isinstance(endpoints, str):
+            endpoints = [endpoints]
+        if not endpoints:
+            raise ValueError("No endpoint to connect to")
+        timeout = cls.TIMEOUT_DURATION if timeout is None else timeout
+        logger = SafeLogger(kwargs.get("logger"))
+        loop = asyncio.get_running_loop()
+        cancelled = threading.Event()
+        results: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+        def report(endpoint: str, master):
+            # a probe answering after the winner was picked closes its connection
+            if cancelled.is_set():
+                if master is not None:
+                    master.close()
+                return
+            results.put_nowait((endpoint, master))
+
+        for endpoint in endpoints:
+            thread = threading.Thread(target=cls.__probe, args=(loop, endpoint, baud, timeout, cancelled, report, logger), name=f"MAVez probe {endpoint}", daemon=True)
+            thread.start()
+
+        endpoint, master = None, None
+        try:
+            for _ in endpoints:
+                endpoint, master = await results.get()
+                if master is not None:
+                    break
+        finally:
+            cancelled.set()
+            while not results.empty():
+                _, unused = results.get_nowait()
+                if unused is not None and unused is not master:
+                    unused.close()
+
+        if master is None:
+            logger.error("[Controller] Connection failed")
+            raise ConnectionError(f"No heartbeat from {', '.join(endpoints)}")
+        try:
+            return cls(connection_string=endpoint, baud=baud, master=master, **kwargs)
+        except BaseException:
+            master.close()
+            raise
+
+    @classmethod
+    def __probe(cls, loop: asyncio.AbstractEventLoop, endpoint: str, baud: int, timeout: float, cancelled: threading.Event, report: Callable, logger: SafeLogger):
+        """
+        Open an endpoint and wait for a heartbeat, in a probe thread. Hands the connection, or None, to report on the event loop.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop running connect.
+            endpoint (str): The connection string.
+            baud (int): The baud rate for serial endpoints.
+            timeout (float): Seconds to wait for a heartbeat, including opening the endpoint.
+            cancelled (threading.Event): Set once another endpoint answered, or connect was cancelled.
+            report (Callable): Called on the event loop with the endpoint and the connection, or None if it did not answer.
+            logger (SafeLogger): The logger.
+
+        Returns:
+            None
+        """
+        deadline = time.monotonic() + timeout
+        master = None
+        try:
+            master = mavutil.mavlink_connection(endpoint, baud=baud)  # type: ignore
+            while not cancelled.is_set() and time.monotonic() < deadline:
+                if master.wait_heartbeat(blocking=True, timeout=max(0, min(cls.PROBE_INTERVAL, deadline - time.monotonic()))):  # type: ignore
+                    logger.info(f"[Controller] Heartbeat on {endpoint}")
+                    break
+            else:
+                master.close()  # type: ignore
+                master = None
+        except Exception as e:
+            logger.warning(f"[Controller] Could not connect to {endpoint}: {e}")
+            if master is not None:
+                master.close()
+            master = None
+        try:
+            loop.call_soon_threadsafe(report, endpoint, master)
+        except RuntimeError:
+            # the event loop has been closed
+            if master is not None:
+                master.close()
+
     def decode_error(self, error_code: int) -> str:
         """
         Decode the error code into a human-readable string.
@@ -136,13 +489,13 @@ class Controller:
     
     async def start(self):
         """
-        Start the controller by initiating the message pump.
+        Start the controller by initiating the message pump. A router view has no pump of its own.
 
         Returns:
             None
         """
-        if self.__message_pump_task is None:
-            self.__running = True
+        self.__running = True
+        if self.__message_pump_task is None and self.__router is None:
             self.__message_pump_task = asyncio.create_task(self.message_pump())
             self.logger.debug("[Controller] Message pump started")
         
@@ -178,6 +531,20 @@ class Controller:
                 self.logger.debug("[Controller] Clock synchronizer stopped")
             self.__clock_sync_task = None
 
+        if self.__publish_limiter is not None:
+            self.__publish_limiter.close()
+        if self.__publish_batcher is not None:
+            self.__publish_batcher.close()
+        if self.__shared_state is not None:
+            self.__shared_state.close()
+            self.__shared_state = None
+            for slot in self.__slots_by_name.values():
+                slot.shared = False
+
+        for slot in list(self.__slots_by_name.values()):
+            for stream in list(slot.streams):
+                stream.close()
+
         if self.pub:
             self.pub.close()
             self.logger.debug("[Controller] Publisher closed")
@@ -195,25 +562,11 @@ class Controller:
         if self.pub:
             self.pub.start()
         try:
-            while self.__running:
-                try:
-                    # use run_in_executor to make recv_match async
-                    mav_msg = await loop.run_in_executor(None, lambda: self.master.recv_match(blocking=True))
-
-                    if mav_msg:
-                        msg = translate_message(mav_msg, self.message_topic)
-                        if msg:
-                            # update cache and seq with new message
-                            self.__latest_messages[mav_msg.get_type()] = msg
-                            self.__message_seq_by_type[mav_msg.get_type()] += 1
-                            # wake up all waiters
-                            for waiter in self.__waiters_by_type[mav_msg.get_type()]:
-                                waiter.set()
-                            # publish message for listeners
-                            await self.msg_queue.put(msg)
-
-                except Exception as e:
-                    self.logger.error(f"[Controller] Error in message pump: {e}")
+            if self.__link_deduplicator is None:
+                await self.__read_link(loop, self.links[0].master, self.dispatch)
+            else:
+                # read every link concurrently, each hands its batches through the deduplicator
+                await asyncio.gather(*(self.__read_link(loop, link.master, functools.partial(self.__dispatch_link, link)) for link in self.links))
         
         # Handle shutdown gracefully
         except asyncio.CancelledError:
@@ -223,6 +576,483 @@ class Controller:
             if self.pub:
                 self.pub.close()
 
+    async def __read_link(self, loop: asyncio.AbstractEventLoop, master, deliver: Callable[[list], None]):
+        """
+        Read a link with the reader mode, falling back to the executor reader where the mode is not supported.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The running event loop.
+            master (mavfile): The link to read.
+            deliver (Callable[[list], None]): Called with each batch of received messages, oldest first.
+
+        Returns:
+            None
+        """
+        if self.reader == "asyncio" and self.__supports_asyncio_reader(master):
+            await self.__asyncio_reader(loop, master, deliver)
+        elif self.reader == "thread":
+            await self.__thread_reader(loop, master, deliver)
+        elif self.reader == "process" and self.__supports_process_reader():
+            await self.__process_reader(loop, master, deliver)
+        else:
+            await self.__executor_reader(loop, master, deliver)
+
+    def __dispatch_link(self, link: LinkHealth, mav_msgs: list):
+        """
+        Dispatch the messages of one of several links that were not already received on another, and follow the healthiest link.
+
+        Args:
+            link (LinkHealth): The link the messages came from.
+            mav_msgs (list): The pymavlink messages received, oldest first.
+
+        Returns:
+            None
+        """
+        active = self.__link_deduplicator.active
+        mav_msgs = self.__link_deduplicator.filter(link, mav_msgs)
+        if self.__link_deduplicator.active is not active:
+            self.logger.info(f"[Controller] Sending on {self.__link_deduplicator.active.name}, healthier than {active.name}")
+        if mav_msgs:
+            self.dispatch(mav_msgs)
+
+    async def __executor_reader(self, loop: asyncio.AbstractEventLoop, master, deliver: Callable[[list], None]):
+        """
+        Read messages with a blocking recv_match in the default executor.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The running event loop.
+            master (mavfile): The link to read.
+            deliver (Callable[[list], None]): Called with each batch of received messages.
+
+        Returns:
+            None
+        """
+        while self.__running:
+            try:
+                # use run_in_executor to make recv_match async
+                if self.batch:
+                    mav_msgs = await loop.run_in_executor(None, self.__read_batch, master)
+                    deliver(mav_msgs)
+                else:
+                    mav_msg = await loop.run_in_executor(None, lambda: master.recv_match(blocking=True))
+                    if mav_msg:
+                        deliver([mav_msg])
+                # stop reading until every full blocking stream has room
+                if self.__blocking_streams:
+                    await self.__wait_for_streams()
+
+            except Exception as e:
+                self.logger.error(f"[Controller] Error in message pump: {e}")
+
+    def __read_batch(self, master, timeout: float | None = None) -> list:
+        """
+        Block for the next message, then drain every complete message already buffered on the link.
+
+        Args:
+            master (mavfile): The link to read.
+            timeout (float | None): Most seconds to block for the first message. Default is None, which blocks until one arrives.
+
+        Returns:
+            list: The received pymavlink messages, oldest first. Empty if the timeout passed.
+        """
+        mav_msgs = []
+        mav_msg = master.recv_match(blocking=True, timeout=timeout)
+        while mav_msg is not None:
+            mav_msgs.append(mav_msg)
+            if len(mav_msgs) >= self.MAX_BATCH_SIZE:
+                break
+            mav_msg = master.recv_msg()
+        return mav_msgs
+
+    async def __thread_reader(self, loop: asyncio.AbstractEventLoop, master, deliver: Callable[[list], None]):
+        """
+        Read messages in a dedicated thread that owns the link for reading, handing each batch to the event loop with one call_soon_threadsafe.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The running event loop.
+            master (mavfile): The link to read.
+            deliver (Callable[[list], None]): Called on the event loop with each batch of received messages.
+
+        Returns:
+            None
+        """
+        stopped = threading.Event()
+        finished = loop.create_future()
+
+        def read():
+            try:
+                while not stopped.is_set():
+                    try:
+                        if self.batch:
+                            mav_msgs = self.__read_batch(master, self.THREAD_READ_TIMEOUT)
+                        else:
+                            mav_msg = master.recv_match(blocking=True, timeout=self.THREAD_READ_TIMEOUT)
+                            mav_msgs = [mav_msg] if mav_msg else []
+                        if not mav_msgs:
+                            continue
+                        loop.call_soon_threadsafe(deliver, mav_msgs)
+                        # stop reading until every full blocking stream has room
+                        if self.__blocking_streams and not self.__wait_for_streams_threadsafe(loop, stopped):
+                            return
+                    except RuntimeError:
+                        # the event loop has been closed
+                        return
+                    except Exception as e:
+                        self.logger.error(f"[Controller] Error in message pump: {e}")
+            finally:
+                try:
+                    loop.call_soon_threadsafe(lambda: finished.done() or finished.set_result(None))
+                except RuntimeError:
+                    pass
+
+        thread = threading.Thread(target=read, name="MAVez reader", daemon=True)
+        thread.start()
+        self.logger.debug("[Controller] Reader thread started")
+        try:
+            await finished
+        finally:
+            # the thread exits within THREAD_READ_TIMEOUT
+            stopped.set()
+
+    def __wait_for_streams_threadsafe(self, loop: asyncio.AbstractEventLoop, stopped: threading.Event) -> bool:
+        """
+        Wait from the reader thread until no blocking stream is full, giving up if the pump stops or the event loop is no longer running.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop the streams belong to.
+            stopped (threading.Event): Set when the reader thread should exit.
+
+        Returns:
+            bool: True once the streams have room, False if the reader should exit.
+        """
+        waiting = asyncio.run_coroutine_threadsafe(self.__wait_for_streams(), loop)
+        while True:
+            try:
+                waiting.result(self.THREAD_READ_TIMEOUT)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stopped.is_set() or not self.__running or not loop.is_running():
+                    waiting.cancel()
+                    return False
+
+    def __supports_asyncio_reader(self, master) -> bool:
+        """
+        Check if a connection can be read from the event loop directly.
+
+        Args:
+            master (mavfile): The link to read.
+
+        Returns:
+            bool: True if the link is a tcp, udp or serial connection with a selectable file descriptor.
+        """
+        if not isinstance(master, (mavutil.mavtcp, mavutil.mavudp, mavutil.mavserial)) or master.fd is None:
+            self.logger.warning("[Controller] Asyncio reader not supported for this connection, using executor reader")
+            return False
+        return True
+
+    async def __asyncio_reader(self, loop: asyncio.AbstractEventLoop, master, deliver: Callable[[list], None]):
+        """
+        Read messages from an event loop reader callback, feeding raw bytes straight into the parser.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The running event loop.
+            master (mavfile): The link to read.
+            deliver (Callable[[list], None]): Called with each batch of received messages.
+
+        Returns:
+            None
+        """
+        fd = master.fd
+        closed = loop.create_future()
+        is_datagram = isinstance(master, mavutil.mavudp)
+        resume_task = None
+
+        async def resume():
+            await self.__wait_for_streams()
+            if not closed.done():
+                loop.add_reader(fd, on_readable)
+
+        def on_readable():
+            nonlocal resume_task
+            try:
+                data = master.recv(self.READ_SIZE)
+            except Exception as e:
+                self.logger.error(f"[Controller] Error reading from connection: {e}")
+                data = b""
+                is_closed = True
+            else:
+                # a readable stream with no data has been closed by the peer
+                is_closed = not data and not is_datagram
+
+            if is_closed:
+                loop.remove_reader(fd)
+                if not closed.done():
+                    closed.set_result(None)
+                return
+            if not data:
+                return
+
+            try:
+                if master.first_byte:
+                    master.auto_mavlink_version(data)
+                if self.batch:
+                    # drain everything already buffered on the link before dispatching
+                    buffered = bytearray(data)
+                    while len(buffered) < self.MAX_DRAIN_BYTES:
+                        chunk = master.recv(self.READ_SIZE)
+                        if not chunk:
+                            break
+                        buffered += chunk
+                    mav_msgs = master.mav.parse_buffer(buffered) or []
+                    for mav_msg in mav_msgs:
+                        master.post_message(mav_msg)
+                    deliver(mav_msgs)
+                else:
+                    for mav_msg in master.mav.parse_buffer(data) or []:
+                        master.post_message(mav_msg)
+                        deliver([mav_msg])
+            except Exception as e:
+                self.logger.error(f"[Controller] Error in message pump: {e}")
+
+            # stop watching the link until every full blocking stream has room
+            if self.__blocking_streams and any(stream.full for stream in self.__blocking_streams):
+                loop.remove_reader(fd)
+                resume_task = loop.create_task(resume())
+
+        try:
+            loop.add_reader(fd, on_readable)
+        except NotImplementedError:
+            # event loops without reader support (e.g. Windows proactor) fall back to the executor
+            self.logger.warning("[Controller] Event loop does not support readers, using executor reader")
+            await self.__executor_reader(loop, master, deliver)
+            return
+
+        self.logger.debug("[Controller] Asyncio reader started")
+        try:
+            await closed
+            self.logger.error("[Controller] Connection closed")
+        finally:
+            loop.remove_reader(fd)
+            if resume_task is not None:
+                resume_task.cancel()
+
+    def __supports_process_reader(self) -> bool:
+        """
+        Check if the connection can be read from a forked child process.
+
+        Returns:
+            bool: True if the platform can fork.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            self.logger.warning("[Controller] Process reader needs fork, using executor reader")
+            return False
+        return True
+
+    async def __process_reader(self, loop: asyncio.AbstractEventLoop, master, deliver: Callable[[list], None]):
+        """
+        Read messages decoded by a child process, collecting each batch when its notification pipe is readable.
+        The child only reads from the connection, this process keeps sending on it.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The running event loop.
+            master (mavfile): The link to read.
+            deliver (Callable[[list], None]): Called with each batch of received messages.
+
+        Returns:
+            None
+        """
+        process_reader = ProcessReader(master, with_frames=self.publish_format != "dict" or self.__shared_state is not None)
+        fd = process_reader.fileno()
+        closed = loop.create_future()
+        resume_task = None
+
+        async def resume():
+            await self.__wait_for_streams()
+            if not closed.done():
+                loop.add_reader(fd, on_readable)
+
+        def on_readable():
+            nonlocal resume_task
+            try:
+                mav_msgs = process_reader.read()
+            except Exception as e:
+                self.logger.error(f"[Controller] Error reading from reader process: {e}")
+                mav_msgs = None
+
+            if mav_msgs is None:
+                loop.remove_reader(fd)
+                if not closed.done():
+                    closed.set_result(None)
+                return
+
+            try:
+                deliver(mav_msgs)
+            except Exception as e:
+                self.logger.error(f"[Controller] Error in message pump: {e}")
+
+            # stop collecting until every full blocking stream has room, the child waits once the ring is full
+            if self.__blocking_streams and any(stream.full for stream in self.__blocking_streams):
+                loop.remove_reader(fd)
+                resume_task = loop.create_task(resume())
+
+        process_reader.start()
+        loop.add_reader(fd, on_readable)
+        self.logger.debug("[Controller] Reader process started")
+        try:
+            await closed
+            self.logger.error("[Controller] Reader process exited")
+        finally:
+            loop.remove_reader(fd)
+            if resume_task is not None:
+                resume_task.cancel()
+            process_reader.close()
+
+    def dispatch(self, mav_msgs: list):
+        """
+        Update the cache with received MAVLink messages, queue published types for publishing and resolve the waiters each message satisfies.
+        Messages are only translated once something reads them, so types nobody listens to cost a seq bump and a cache slot.
+        The message pump calls this with everything it reads, a VehicleRouter with the messages of the view's vehicle.
+
+        Args:
+            mav_msgs (list): The pymavlink messages received, oldest first.
+
+        Returns:
+            None
+        """
+        if self.publish_format == "raw_batch":
+            self.__raw_frames = {}
+        slots = self.__slots
+        for mav_msg in mav_msgs:
+            msgid = mav_msg.get_msgId()
+            if msgid < 0:
+                continue
+            slot = slots[msgid] if msgid < len(slots) else None
+            if slot is None:
+                msg_type = mav_msg.get_type()
+                if msg_type.startswith('UNKNOWN'):
+                    continue
+                slot = self.__create_slot(msgid, mav_msg.name if msg_type == "FILTERED" else msg_type)
+            if slot.filtered:
+                # dropped at the frame header, only counted
+                slot.seq += 1
+                slot.filtered_bytes += mav_msg.length
+                continue
+            msg = LazyMessage(mav_msg, self.message_topic)
+            # update cache and seq with new message
+            slot.seq += 1
+            seq = slot.seq
+            slot.history.append((seq, msg))
+            if slot.shared:
+                self.__shared_state.update(slot.name, mav_msg)
+            # resolve the waiters registered on this type and on this message's key
+            waiters_by_key = slot.waiters
+            if waiters_by_key:
+                self.__resolve_waiters(waiters_by_key.get(None), seq, msg)
+                if slot.key_field is not None:
+                    self.__resolve_waiters(waiters_by_key.get(getattr(mav_msg, slot.key_field)), seq, msg)
+            # feed open streams
+            if slot.streams:
+                for stream in slot.streams:
+                    stream.put(msg.header)
+            # publish message for listeners
+            if slot.publish:
+                if self.__publish_limiter is None:
+                    self.__publish(msg)
+                else:
+                    self.__publish_limiter.offer(slot.name, msg)
+
+        if self.__raw_frames is not None:
+            raw_frames, self.__raw_frames = self.__raw_frames, None
+            for msg_type, frames in raw_frames.items():
+                self.__enqueue(Message(topic=translate_topic(msg_type, self.message_topic), header={}, payload=b"".join(frames)))
+
+    def __create_slot(self, msgid: int, name: str) -> _MessageSlot:
+        """
+        Create the bookkeeping of a message type on its first use.
+
+        Args:
+            msgid (int): The MAVLink message id.
+            name (str): The MAVLink message type name.
+
+        Returns:
+            _MessageSlot: The new slot.
+        """
+        slot = _MessageSlot(
+            name,
+            self.__history_depths.get(msgid, self.DEFAULT_HISTORY_DEPTH),
+            self.WAITER_KEYS.get(name),
+            self.__publish_types is None or name in self.__publish_types,
+            self.__shared_state is not None and any(message_type.name == name for message_type in self.__shared_state.message_types),
+            self.__message_filter is not None and not self.__message_filter.wants(msgid),
+        )
+        if msgid >= len(self.__slots):
+            self.__slots.extend([None] * (msgid + 1 - len(self.__slots)))
+        self.__slots[msgid] = slot
+        self.__slots_by_name[name] = slot
+        return slot
+
+    def __get_slot(self, message_type: MAVMessage) -> _MessageSlot:
+        """
+        Get the bookkeeping of a message type, creating it if nothing of the type has been received yet.
+
+        Args:
+            message_type (MAVMessage): The message type.
+
+        Returns:
+            _MessageSlot: The slot of the type.
+        """
+        msgid = message_type.value
+        slot = self.__slots[msgid] if msgid < len(self.__slots) else None
+        if slot is None:
+            slot = self.__create_slot(msgid, message_type.name)
+        return slot
+
+    def __publish(self, msg: LazyMessage):
+        """
+        Queue a received message for the publisher in the configured publish format.
+
+        Args:
+            msg (LazyMessage): The received message.
+
+        Returns:
+            None
+        """
+        if self.publish_format == "dict":
+            self.__enqueue(msg.message)
+        elif self.__raw_frames is not None:
+            # the frames are views of the parser's buffers, joined once per type at the end of the wakeup
+            self.__raw_frames.setdefault(msg.raw.get_type(), []).append(memoryview(msg.raw.get_msgbuf()))
+        else:
+            self.__enqueue(raw_frame_message(msg.raw, self.message_topic))
+
+    def __resolve_waiters(self, waiters: list[_MessageWaiter] | None, seq: int, msg: LazyMessage):
+        """
+        Resolve and remove every waiter in a list that a received message satisfies.
+
+        Args:
+            waiters (list[_MessageWaiter] | None): The waiters registered for the message.
+            seq (int): The sequence of the message within its type.
+            msg (LazyMessage): The received message.
+
+        Returns:
+            None
+        """
+        if not waiters:
+            return
+        for waiter in waiters[:]:
+            if waiter.future.done() or seq < waiter.min_seq:
+                continue
+            try:
+                matched = waiter.matches(msg.header)
+            except Exception as e:
+                # a failing qualifier is raised in the receiver, not the pump
+                waiter.future.set_exception(e)
+                waiters.remove(waiter)
+                continue
+            if matched:
+                waiter.future.set_result(msg.header)
+                waiters.remove(waiter)
+
     async def __aenter__(self):
         await self.start()
         return self
@@ -232,8 +1062,8 @@ class Controller:
     
     async def request_message(self, message_type: MAVMessage, qualifier: Callable[[dict], bool] = lambda _: True, timeout: float = 5.0) -> dict | None:
         request = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_REQUEST_MESSAGE,  # command
             0,  # confirmation
             1,  # param1
@@ -249,7 +1079,7 @@ class Controller:
         self.send_message(request)
         return await self.receive_message(message_type, message_seq, qualifier, timeout)
 
-    async def receive_message(self, message_type: MAVMessage, seq: int = -1, qualifier: Callable[[dict], bool] = lambda _: True, timeout: float = 5.0) -> dict | None:
+    async def receive_message(self, message_type: MAVMessage, seq: int = -1, qualifier: Callable[[dict], bool] = lambda _: True, timeout: float = 5.0, key: Any = None) -> dict | None:
         """
         Wait for a specific MAVLink message type from ardupilot.
 
@@ -258,52 +1088,126 @@ class Controller:
             seq (int, optional): The minimum sequence of the message type desired. If omitted, waits for the next new message
             qualifier (Callable[[dict], bool]): Additional requirement for message to be returned. By default the first matching message is returned.
             timeout (float): The timeout duration in seconds. Default is 5 seconds.
+            key (Any, optional): Required value of the message type's discriminator field (see WAITER_KEYS), e.g. the command id of a COMMAND_ACK. Only messages carrying this value wake the receiver. Default is None.
+
+        Raises:
+            ValueError: If a key is given for a message type without a discriminator field.
 
         Returns:
             dict | None: Dictionary representation of MAVLink message if successful, None if the response timed out.
         """
+        slot = self.__get_slot(message_type)
+        if key is not None:
+            key_field = slot.key_field
+            if key_field is None:
+                raise ValueError(f"{slot.name} has no discriminator field to wait on")
+            matches = lambda msg: msg.get(key_field) == key and qualifier(msg)
+        else:
+            matches = qualifier
+
         # Set seq to next new message by default
         if seq == -1:
-            seq = self.__message_seq_by_type[message_type.name] + 1
+            seq = slot.seq + 1
 
-        # Check latest messages cache if seq already met
-        latest = self.__latest_messages.get(message_type.name)
-        if self.__message_seq_by_type[message_type.name] >= seq and latest is not None and qualifier(latest.header):
-            return latest.header
+        # Check message history if seq already met
+        msg = self.__find_message(slot, seq, matches)
+        if msg is not None:
+            return msg
+        # only messages received after this point still need checking
+        seq = max(seq, slot.seq + 1)
 
-        # Add signal to wake up when new message received
-        signal = asyncio.Event()
-        self.__waiters_by_type[message_type.name].append(signal)
+        # Register a waiter for the pump to resolve, with a single deadline for the timeout
+        loop = asyncio.get_running_loop()
+        waiter = _MessageWaiter(loop.create_future(), seq, matches)
+        waiters = slot.waiters.setdefault(key, [])
+        waiters.append(waiter)
+        deadline = loop.call_at(loop.time() + timeout, waiter.expire)
 
         try:
-            start_time = time.monotonic()
-            while time.monotonic() - start_time < timeout:
-                # wait up to timeout for new message signal
-                remaining = timeout - (time.monotonic() - start_time)
-                try:
-                    await asyncio.wait_for(signal.wait(), timeout=remaining)
-                except asyncio.TimeoutError:
-                    return
-                # verify that the message is new and valid and meets qualifications
-                msg = self.__latest_messages.get(message_type.name)
-                if msg is not None and qualifier(msg.header) and self.__message_seq_by_type[message_type.name] >= seq:
-                    return msg.header
-                # reset signal on unwanted message
-                signal.clear()
-            
-            return
-        
-        # clean up signal from waiters
+            return await waiter.future
+
+        # clean up waiter and deadline
         finally:
-            waiters = self.__waiters_by_type.get(message_type.name)
-            if waiters is not None:
-                try:
-                    waiters.remove(signal)
-                except ValueError:
-                    pass
-                if not waiters:
-                    del self.__waiters_by_type[message_type.name]
+            deadline.cancel()
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass
+            if not waiters and slot.waiters.get(key) is waiters:
+                del slot.waiters[key]
+
+    def stream(self, message_type: MAVMessage, maxlen: int = 1024, overflow: str = "drop_oldest") -> MessageStream:
+        """
+        Open a stream of every message of a type received from now on, in order.
+        Unlike repeated receive_message calls no message is skipped between iterations, up to the overflow policy.
+
+        Example:
+            async with controller.stream(MAVMessage.GLOBAL_POSITION_INT) as positions:
+                async for position in positions:
+                    ...
+
+        Args:
+            message_type (MAVMessage): The type of MAVLink message to stream.
+            maxlen (int): Most messages buffered for a slow consumer. Default is 1024.
+            overflow (str): "drop_oldest" discards the oldest buffered message and counts it in MessageStream.dropped,
+                "block" stops the message pump reading the link until the consumer catches up, which also holds back every other reader of the controller. Default is "drop_oldest".
+
+        Raises:
+            ValueError: If the overflow policy is unknown or maxlen is not positive.
+
+        Returns:
+            MessageStream: Async iterator of message dictionaries. Close it (or leave its async with block) to stop streaming.
+        """
+        stream = MessageStream(message_type.name, maxlen, overflow, on_close=self.__remove_stream)
+        self.__get_slot(message_type).streams.append(stream)
+        if overflow == "block":
+            self.__blocking_streams.add(stream)
+        return stream
+
+    def __remove_stream(self, stream: MessageStream):
+        """
+        Unregister a closed stream.
+
+        Args:
+            stream (MessageStream): The closed stream.
+
+        Returns:
+            None
+        """
+        self.__blocking_streams.discard(stream)
+        slot = self.__slots_by_name.get(stream.message_type)
+        if slot is not None and stream in slot.streams:
+            slot.streams.remove(stream)
 
+    async def __wait_for_streams(self):
+        """
+        Wait until no blocking stream is full.
+
+        Returns:
+            None
+        """
+        for stream in list(self.__blocking_streams):
+            await stream.wait_for_space()
+
+    def __find_message(self, slot: _MessageSlot, seq: int, qualifier: Callable[[dict], bool]) -> dict | None:
+        """
+        Find the oldest buffered message of a type at or after a sequence number that meets the qualifier.
+
+        Args:
+            slot (_MessageSlot): The bookkeeping of the message type.
+            seq (int): The minimum sequence of the message.
+            qualifier (Callable[[dict], bool]): Requirement for the message to be returned.
+
+        Returns:
+            dict | None: Dictionary representation of the message if found, otherwise None.
+        """
+        history = slot.history
+        if not history or history[-1][0] < seq:
+            return None
+        for msg_seq, msg in history:
+            if msg_seq >= seq and qualifier(msg.header):
+                return msg.header
+        return None
 
     async def receive_mission_request(self, seq: int, timeout: float = 5.0) -> int:
         """
@@ -361,6 +1265,10 @@ class Controller:
         Returns:
             None
         """
+        # address messages left to every system to the target, e.g. mission items
+        if self.target_system and getattr(message, "target_system", None) == 0:
+            message.target_system = self.target_system
+            message.target_component = self.target_component
         self.master.mav.send(message) # type: ignore
 
     async def send_command_with_ack(self, message, command_id: int, timeout: int) -> int:
@@ -374,13 +1282,13 @@ class Controller:
         Returns:
             int: COMMAND_ACK result if received, TIMEOUT_ERROR if timeout, or BAD_RESPONSE_ERROR if non-COMMAND_ACK received
         """
-        next_seq = self.__message_seq_by_type["COMMAND_ACK"] + 1
+        next_seq = self.get_message_seq("COMMAND_ACK") + 1
         self.send_message(message)
 
         message = await self.receive_message(
             message_type=MAVMessage.COMMAND_ACK, 
             seq=next_seq, 
-            qualifier=lambda msg: msg.get("command") == command_id,
+            key=command_id,
             timeout=timeout
         )
 
@@ -403,14 +1311,93 @@ class Controller:
             int: 0 if the mission count was sent successfully.
         """
         self.master.mav.mission_count_send( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             count,  # count
             mission_type,  # mission_type
         )
         self.logger.debug(f"[Controller] Sent mission count: {count}")
         return 0
 
+    def send_mission_write_partial_list(self, start_index, end_index, mission_type=0) -> int:
+        """
+        Start replacing a range of the mission on ardupilot, answered with requests for each item of the range.
+
+        Args:
+            start_index (int): The index of the first mission item to replace.
+            end_index (int): The index of the last mission item to replace.
+            mission_type (int): The type of mission (default is 0 for MISSION_TYPE 0).
+
+        Returns:
+            int: 0 if the mission write partial list was sent successfully.
+        """
+        self.master.mav.mission_write_partial_list_send( # type: ignore
+            self.target_system,  # target_system
+            self.target_component,  # target_component
+            start_index,  # start_index
+            end_index,  # end_index
+            mission_type,  # mission_type
+        )
+        self.logger.debug(f"[Controller] Sent mission write partial list: {start_index} to {end_index}")
+        return 0
+
+    def send_mission_request_list(self, mission_type=0) -> int:
+        """
+        Ask ardupilot for the number of items of its mission, answered with MISSION_COUNT.
+
+        Args:
+            mission_type (int): The type of mission (default is 0 for MISSION_TYPE 0).
+
+        Returns:
+            int: 0 if the mission request list was sent successfully.
+        """
+        self.master.mav.mission_request_list_send( # type: ignore
+            self.target_system,  # target_system
+            self.target_component,  # target_component
+            mission_type,  # mission_type
+        )
+        self.logger.debug("[Controller] Sent mission request list")
+        return 0
+
+    def send_mission_request(self, seq, mission_type=0) -> int:
+        """
+        Ask ardupilot for one item of its mission, answered with MISSION_ITEM_INT.
+
+        Args:
+            seq (int): The index of the mission item.
+            mission_type (int): The type of mission (default is 0 for MISSION_TYPE 0).
+
+        Returns:
+            int: 0 if the mission request was sent successfully.
+        """
+        self.master.mav.mission_request_int_send( # type: ignore
+            self.target_system,  # target_system
+            self.target_component,  # target_component
+            seq,  # seq
+            mission_type,  # mission_type
+        )
+        return 0
+
+    def send_mission_ack(self, result=0, mission_type=0) -> int:
+        """
+        Acknowledge a mission transfer from ardupilot.
+
+        Args:
+            result (int): The MAV_MISSION_RESULT (default is 0 for MAV_MISSION_ACCEPTED).
+            mission_type (int): The type of mission (default is 0 for MISSION_TYPE 0).
+
+        Returns:
+            int: 0 if the mission ack was sent successfully.
+        """
+        self.master.mav.mission_ack_send( # type: ignore
+            self.target_system,  # target_system
+            self.target_component,  # target_component
+            result,  # type
+            mission_type,  # mission_type
+        )
+        self.logger.debug(f"[Controller] Sent mission ack: {result}")
+        return 0
+
     async def receive_mission_item_reached(self, seq: int=-1, timeout: int = 240) -> int:
         """
         Wait for a mission item reached message from ardupilot.
@@ -432,17 +1419,49 @@ class Controller:
             self.logger.error("[Controller] Bad response received for mission item reached")
             return self.BAD_RESPONSE_ERROR
 
-    def send_clear_mission(self) -> int:
+    def send_clear_mission(self, mission_type=0) -> int:
         """
         Clear the mission on ardupilot.
 
+        Args:
+            mission_type (int): The type of mission (default is 0 for MISSION_TYPE 0).
+
         Returns:
             int: 0 if the mission was cleared successfully
         """
-        self.master.waypoint_clear_all_send() # type: ignore
+        self.master.mav.mission_clear_all_send( # type: ignore
+            self.target_system,  # target_system
+            self.target_component,  # target_component
+            mission_type,  # mission_type
+        )
         self.logger.info("[Controller] Sent clear mission")
         return 0
 
+    def mode_mapping(self) -> dict[str, int] | None:
+        """
+        The flight modes of the vehicle commands are addressed to, from the newest HEARTBEAT it sent.
+        Without a target system, the modes of the first vehicle heard on the link.
+
+        Returns:
+            dict[str, int] | None: Mode numbers by name, None if no HEARTBEAT from the vehicle has been received.
+        """
+        slot = self.__get_slot(MAVMessage.HEARTBEAT)
+        for _, msg in reversed(slot.history):
+            heartbeat = msg.raw
+            if self.target_system and heartbeat.get_srcSystem() != self.target_system:
+                continue
+            if self.target_component and heartbeat.get_srcComponent() != self.target_component:
+                continue
+            # ground stations and companion computers send heartbeats too
+            if heartbeat.autopilot == mavutil.mavlink.MAV_AUTOPILOT_INVALID:
+                continue
+            if heartbeat.autopilot == mavutil.mavlink.MAV_AUTOPILOT_PX4:
+                return mavutil.px4_map
+            return mavutil.mode_mapping_byname(heartbeat.type)
+        if not self.target_system:
+            return self.master.mode_mapping() # type: ignore
+        return None
+
     async def set_mode(self, mode: str) -> int:
         """
         Set the ardupilot mode.
@@ -453,14 +1472,18 @@ class Controller:
         Returns:
             int: 0 if the mode was set successfully, 111 if the mode is unknown, 101 if the response timed out.
         """
-        if mode not in self.master.mode_mapping(): # type: ignore
+        mode_mapping = self.mode_mapping()
+        if mode_mapping is None:
+            self.logger.error(f"[Controller] No heartbeat from system {self.target_system} yet, its modes are unknown")
+            return self.UNKNOWN_MODE
+        if mode not in mode_mapping:
             self.logger.error(f"[Controller] Unknown mode: {mode}")
             return self.UNKNOWN_MODE
 
-        mode_id = self.master.mode_mapping()[mode] # type: ignore
+        mode_id = mode_mapping[mode]
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_DO_SET_MODE,  # command
             0,  # confirmation
             mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED,  # param1
@@ -499,8 +1522,8 @@ class Controller:
             int: 0 if ardupilot was armed successfully, error code if there was an error, 101 if the response timed out.
         """
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM,  # command
             0,  # confirmation
             1,  # param1
@@ -539,8 +1562,8 @@ class Controller:
         """
 
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM,  # command
             0,  # confirmation
             0,  # param1
@@ -576,8 +1599,8 @@ class Controller:
         """
 
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_DO_FENCE_ENABLE,  # command
             0,  # confirmation
             1,  # param1
@@ -616,8 +1639,8 @@ class Controller:
         """
 
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_DO_FENCE_ENABLE,  # command
             0,  # confirmation
             2 if floor_only else 0,  # param1
@@ -667,8 +1690,8 @@ class Controller:
 
 
         message = self.master.mav.command_int_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             0,  # frame - MAV_FRAME_GLOBAL
             mavutil.mavlink.MAV_CMD_DO_SET_HOME,  # command
             0,  # current
@@ -709,8 +1732,8 @@ class Controller:
             int: 0 if the servo was set successfully, error code if there was an error, 101 if the response timed out.
         """
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_DO_SET_SERVO,  # command
             0,  # confirmation
             servo_number,  # param1
@@ -863,8 +1886,8 @@ class Controller:
             int: 0 if the message interval was set successfully, error code if there was an error, 101 if the response timed out.
         """
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL,  # command
             0,  # confirmation
             message_type.value,  # param1
@@ -903,8 +1926,8 @@ class Controller:
             int: 0 if the message interval was disabled successfully, error code if there was an error, 101 if the response timed out.
         """
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL,  # command
             0,  # confirmation
             message_type.value,  # param1
@@ -960,8 +1983,8 @@ class Controller:
             int: 0 if the current mission index was set successfully, error code if there was an error, 101 if the response timed out.
         """
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_DO_SET_MISSION_CURRENT,  # command
             0,  # confirmation
             index,  # param1
@@ -1000,8 +2023,8 @@ class Controller:
             int: 0 if the mission was started successfully, error code if there was an error, 101 if the response timed out.
         """
         message = self.master.mav.command_long_encode( # type: ignore
-            0,  # target_system
-            0,  # target_component
+            self.target_system,  # target_system
+            self.target_component,  # target_component
             mavutil.mavlink.MAV_CMD_MISSION_START,  # command
             0,  # confirmation
             start_index,  # param1
@@ -1102,7 +2125,7 @@ class Controller:
         offset_samples = []
         while i < NUM_SAMPLES:
             ts1 = time.monotonic_ns()
-            next_seq = self.__message_seq_by_type["TIMESYNC"] + 1
+            next_seq = self.get_message_seq("TIMESYNC") + 1
             self.request_timesync(ts1)
 
             response = await self.receive_timesync(next_seq)
@@ -1174,4 +2197,27 @@ class Controller:
         return time.monotonic_ns() - self.start_time
     
     def get_message_seq(self, message_type: str) -> int:
-        return self.__message_seq_by_type[message_type]
+        """
+        Get the number of messages of a type received so far, the sequence of its latest message.
+
+        Args:
+            message_type (str): The MAVLink message type name.
+
+        Returns:
+            int: The sequence of the latest message of the type, 0 if none has been received.
+        """
+        slot = self.__slots_by_name.get(message_type)
+        return slot.seq if slot is not None else 0
+
+    def get_filtered_bytes(self, message_type: str) -> int:
+        """
+        Get the bytes received in frames of a message type dropped by allow_types or deny_types.
+
+        Args:
+            message_type (str): The MAVLink message type name.
+
+        Returns:
+            int: Total frame bytes of the type filtered so far.
+        """
+        slot = self.__slots_by_name.get(message_type)
+        return slot.filtered_bytes if slot is not None else 0
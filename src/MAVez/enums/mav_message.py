@@ -1,8 +1,8 @@
 # mav_message.py
-# version: 1.0.0
+# version: 1.2.0
 # ENUMS FROM MAVLINK
 # Creation Date: 2026-03-04
-# Last Modified: 2025-03-04
+# Last Modified: 2026-10-18
 # Organization: PSU UAS
 
 from enum import Enum
@@ -10,6 +10,7 @@ from enum import Enum
 class MAVMessage(Enum):
     """Enum for MAVLink message types.
     """
+    HEARTBEAT = 0
     SYS_STATUS = 1
     SYSTEM_TIME = 2
     PING = 4
@@ -126,6 +127,7 @@ class MAVMessage(Enum):
     FOLLOW_TARGET = 144
     CONTROL_SYSTEM_STATE = 146
     BATTERY_STATUS = 147
+    AUTOPILOT_VERSION = 148
     LANDING_TARGET = 149
     SENSOR_OFFSETS = 150
     SET_MAG_OFFSETS = 151
@@ -288,6 +290,7 @@ class MAVMessage(Enum):
     UAVIONIX_ADSB_GET = 10006
     UAVIONIX_ADSB_OUT_CONTROL = 10007
     UAVIONIX_ADSB_OUT_STATUS = 10008
+    LOWEHEISER_GOV_EFI = 10151
     DEVICE_OP_READ = 11000
     DEVICE_OP_READ_REPLY = 11001
     DEVICE_OP_WRITE = 11002
@@ -323,6 +326,15 @@ class MAVMessage(Enum):
     OPEN_DRONE_ID_ARM_STATUS = 12918
     OPEN_DRONE_ID_SYSTEM_UPDATE = 12919
     HYGROMETER_SENSOR = 12920
+    ICAROUS_HEARTBEAT = 42000
+    ICAROUS_KINEMATIC_BANDS = 42001
+    CUBEPILOT_RAW_RC = 50001
+    HERELINK_VIDEO_STREAM_INFORMATION = 50002
+    HERELINK_TELEM = 50003
+    CUBEPILOT_FIRMWARE_UPDATE_START = 50004
+    CUBEPILOT_FIRMWARE_UPDATE_RESP = 50005
+    AIRLINK_AUTH = 52000
+    AIRLINK_AUTH_RESPONSE = 52001
 
     @staticmethod
     def string(message_code: int | None) -> str:
@@ -336,7 +348,7 @@ class MAVMessage(Enum):
         """
         if message_code is None:
             return "UNKNOWN"
-        
+
         try:
             return MAVMessage(message_code).name
         except ValueError:
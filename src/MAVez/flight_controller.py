@@ -1,8 +1,8 @@
 # flight_controller.py
-# version: 3.1.2
+# version: 3.17.0
 # Original Author: Theodore Tasman
 # Creation Date: 2025-01-30
-# Last Modified: 2026-03-26
+# Last Modified: 2026-10-18
 # Organization: PSU UAS
 
 """
@@ -12,7 +12,6 @@ This module is responsible for managing the flight of ardupilot.
 # SITL Start Command:
 # python3 ./MAVLink/ardupilot/Tools/autotest/sim_vehicle.py -v ArduPlane --console --map --custom-location 38.31527628,-76.54908330,40,282.5
 
-from logging import Logger
 from pathlib import Path
 from MAVez.mission import Mission
 from MAVez.controller import Controller
@@ -24,14 +23,8 @@ class FlightController(Controller):
     Manages the flight plan for ardupilot. Extends the Controller class to provide complex flight functionalities.
 
     Args:
-        connection_string (str): The connection string to ardupilot.
-        baud (int): The baud rate for the connection. Default is 57600.
-        logger (Logger | None): Optional logger for logging flight events.
-        message_host (str): The host for messaging.
-        message_host (str): The host for the messaging system. Default is "127.0.0.1".
-        message_port (int): The port for the messaging system. Default is 5555.
-        message_topic (str): The topic prefix for the messaging system. Default is "".
-        timesync (bool): Whether to enable time synchronization. Default is False.
+        *args: Positional arguments of Controller, connection_string first.
+        **kwargs: Keyword arguments of Controller, see Controller for every option.
 
     Raises:
         ConnectionError: If the connection to ardupilot fails.
@@ -45,15 +38,9 @@ class FlightController(Controller):
     UNKNOWN_MODE_ERROR = 111  # Unknown mode error code
     INVALID_MISSION_ERROR = 301  # Invalid mission error code
 
-    def __init__(self, connection_string: str="tcp:127.0.0.1:5762", 
-                 baud: int=57600, 
-                 logger: Logger|None=None, 
-                 message_host: str="127.0.0.1", 
-                 message_port: int=5555, 
-                 message_topic: str="",
-                 timesync: bool=False) -> None:
+    def __init__(self, *args, **kwargs) -> None:
         # Initialize the controller
-        super().__init__(connection_string, logger=logger, baud=baud, message_host=message_host, message_port=message_port, message_topic=message_topic, timesync=timesync)
+        super().__init__(*args, **kwargs)
 
         self.geofence = Mission(self, type=1)  # type 1 is geofence
 
@@ -105,8 +92,8 @@ class FlightController(Controller):
 
         self.mission_queue.append(takeoff_mission)
 
-        # send the takeoff mission
-        response = await takeoff_mission.send_mission()
+        # send the takeoff mission, unless the vehicle already holds it
+        response = await takeoff_mission.send_mission(skip_identical=True)
 
         # verify that the mission was sent successfully
         if response:
@@ -186,7 +173,7 @@ class FlightController(Controller):
 
     async def auto_send_next_mission(self) -> int:
         """
-        Waits for the last waypoint to be reached, clears the mission, sends the next mission, sets mode to auto.
+        Waits for the last waypoint to be reached, sends the next mission over the current one, sets mode to auto.
 
         Returns:
             int: 0 if the next mission was sent successfully, otherwise an error code.
@@ -215,14 +202,9 @@ class FlightController(Controller):
             self.logger.critical("[Flight] Failed to wait for next mission.")
             return response
 
-        # Clear the mission
-        response = await current_mission.clear_mission()
-        if response:
-            self.logger.critical("[Flight] Failed to send next mission.")
-            return response
-
-        # Send the next mission
-        result = await next_mission.send_mission()
+        # Send the next mission, replacing the current one
+        # only the items that differ are written when the missions are the same length
+        result = await next_mission.send_mission(differential=True)
         if result:
             self.logger.critical("[Flight] Failed to send next mission.")
             return result
@@ -299,7 +281,7 @@ class FlightController(Controller):
 
         self.logger.debug("[Flight] Waiting for current mission index")
         # get the latest mission index
-        response = await self.receive_current_mission_index(seq=self.__message_seq_by_type["MISSION_CURRENT"])
+        response = await self.receive_current_mission_index(seq=self.get_message_seq("MISSION_CURRENT"))
         if response == self.TIMEOUT_ERROR:
             return response
 
@@ -379,8 +361,8 @@ class FlightController(Controller):
             self.logger.critical("[Flight] Geofence failed, mission is not a geofence")
             return self.INVALID_MISSION_ERROR
 
-        # send the geofence mission
-        response = await self.geofence.send_mission()
+        # send the geofence mission, unless the vehicle already holds it
+        response = await self.geofence.send_mission(skip_identical=True)
 
         # verify that the mission was sent successfully
         if response:
@@ -0,0 +1,165 @@
+# link_health.py
+# version: 1.1.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+"""
+Deduplicate messages received over redundant links to the same vehicles, and rank the links by live health.
+
+A packet is identified by its source (system id, component id), MAVLink packet sequence, message id and checksum,
+and a copy is dropped if the same packet was first received less than DUPLICATE_TIMEOUT seconds earlier.
+The sequence is only 8 bits and wraps every 256 packets of a source, under a second at high telemetry rates,
+so it cannot tell how far behind a late link is; the checksum tells a late copy from a newer packet that reuses its sequence number.
+A byte-identical packet sent again within DUPLICATE_TIMEOUT with the same sequence number is dropped as well, it carries nothing new.
+A link lagging more than DUPLICATE_TIMEOUT behind another has its packets dispatched twice.
+
+Each link keeps two smoothed measures:
+    loss: the share of packets missing from the sequence of each source on that link.
+    lag: how long after the first link the link delivers the same packet, 0 when it is the first.
+The cost of a link is its lag plus LOSS_COST seconds per unit of loss, and a link silent for SILENT_TIMEOUT seconds is never preferred.
+"""
+
+import math
+import time
+from collections import deque
+
+
+class LinkHealth:
+    """
+    Live health of one link.
+
+    Args:
+        name (str): The connection string of the link.
+        master (mavfile): The pymavlink connection.
+    """
+
+    __slots__ = ("name", "master", "received", "duplicates", "lost", "loss", "lag", "last_receive", "last_seqs")
+
+    def __init__(self, name: str, master):
+        self.name = name
+        self.master = master
+        self.received = 0  # packets received, including duplicates
+        self.duplicates = 0  # packets first received on another link
+        self.lost = 0  # packets missing from the sequence
+        self.loss = 0.0  # smoothed share of packets lost
+        self.lag = 0.0  # smoothed seconds behind the first link to deliver a packet
+        self.last_receive = time.monotonic()
+        # newest sequence per source, keyed by system id << 8 | component id
+        self.last_seqs: dict[int, int] = {}
+
+    def __repr__(self):
+        return f"LinkHealth({self.name}, received={self.received}, duplicates={self.duplicates}, loss={self.loss:.3f}, lag={self.lag * 1000:.1f}ms)"
+
+
+class LinkDeduplicator:
+    """
+    Drop messages already received on another link, and pick the healthiest link for outbound traffic.
+
+    Args:
+        links (list[LinkHealth]): The links, the first is active until another proves healthier.
+    """
+
+    WINDOW = 128  # largest jump in a link's sequence of a source counted as loss, a larger one is a restart or reordering
+    DUPLICATE_TIMEOUT = 2.0  # seconds after its first arrival that copies of a packet are dropped
+    SMOOTHING = 0.05  # weight of each new sample in the smoothed loss and lag
+    LOSS_COST = 1.0  # seconds of lag a link losing every packet is worth
+    SILENT_TIMEOUT = 2.0  # seconds without packets after which a link is down
+    SWITCH_MARGIN = 0.02  # seconds of cost a link must save before outbound traffic moves to it
+
+    def __init__(self, links: list[LinkHealth]):
+        self.links = links
+        self.active = links[0]
+        # first arrival time per packet key, and the keys in order of arrival
+        self.__seen: dict[int, float] = {}
+        self.__arrivals: deque[tuple[float, int]] = deque()
+
+    def filter(self, link: LinkHealth, mav_msgs: list) -> list:
+        """
+        Update the health of a link with the messages it delivered, and keep those not yet received on any link.
+
+        Args:
+            link (LinkHealth): The link the messages came from.
+            mav_msgs (list): The pymavlink messages received, oldest first.
+
+        Returns:
+            list: The messages received for the first time, oldest first.
+        """
+        now = time.monotonic()
+        link.last_receive = now
+        seen = self.__seen
+        last_seqs = link.last_seqs
+        window_size = self.WINDOW
+        smoothing = self.SMOOTHING
+        unique = []
+
+        # forget packets too old for a copy to still arrive
+        arrivals = self.__arrivals
+        expired = now - self.DUPLICATE_TIMEOUT
+        while arrivals and arrivals[0][0] <= expired:
+            del seen[arrivals.popleft()[1]]
+
+        for mav_msg in mav_msgs:
+            msgid = mav_msg.get_msgId()
+            if msgid < 0:
+                # bad data carries no usable header
+                continue
+            source = mav_msg.get_srcSystem() << 8 | mav_msg.get_srcComponent()
+            seq = mav_msg.get_seq()
+            link.received += 1
+
+            # packets missing from this link's sequence of the source
+            last = last_seqs.get(source)
+            gap = (seq - last - 1) & 0xFF if last is not None else 0
+            if gap < window_size:
+                link.lost += gap
+                link.loss += smoothing * (gap / (gap + 1) - link.loss)
+                last_seqs[source] = seq
+
+            key = ((source << 8 | seq) << 24 | msgid) << 16 | mav_msg.get_crc()
+            first_seen = seen.get(key)
+            if first_seen is not None:
+                link.duplicates += 1
+                link.lag += smoothing * (now - first_seen - link.lag)
+                continue
+            seen[key] = now
+            arrivals.append((now, key))
+            link.lag -= smoothing * link.lag
+            unique.append(mav_msg)
+
+        self.active = self.__rank(now)
+        return unique
+
+    def cost(self, link: LinkHealth, now: float | None = None) -> float:
+        """
+        The cost of sending on a link, lower is healthier.
+
+        Args:
+            link (LinkHealth): The link.
+            now (float | None): The current time.monotonic(). Default is None, which reads the clock.
+
+        Returns:
+            float: Lag plus loss in seconds, or infinity if the link is silent.
+        """
+        if now is None:
+            now = time.monotonic()
+        if now - link.last_receive > self.SILENT_TIMEOUT:
+            return math.inf
+        return link.lag + self.LOSS_COST * link.loss
+
+    def __rank(self, now: float) -> LinkHealth:
+        """
+        Pick the link for outbound traffic, staying on the active link unless another is healthier by SWITCH_MARGIN.
+
+        Args:
+            now (float): The current time.monotonic().
+
+        Returns:
+            LinkHealth: The link to send on.
+        """
+        active = self.active
+        best = min(self.links, key=lambda link: self.cost(link, now))
+        if best is not active and self.cost(best, now) + self.SWITCH_MARGIN < self.cost(active, now):
+            return best
+        return active
@@ -0,0 +1,145 @@
+# message_filter.py
+# version: 1.2.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+import sys
+
+from MAVez.enums.mav_message import MAVMessage
+
+PROTOCOL_MARKER_V1 = 0xFE
+
+
+class FilteredMessage:
+    """
+    Placeholder for a frame whose type was filtered out, built from the frame header without unpacking the payload or checking the CRC.
+    It carries enough of the pymavlink message API for the connection's bookkeeping (sequence and loss counting) and the Controller's counters.
+
+    Args:
+        msgbuf (bytearray): The complete frame.
+        name (str): The MAVLink type name of the frame.
+        msgid (int): The MAVLink message id of the frame.
+    """
+
+    _instance_field = None  # pymavlink's per-instance bookkeeping does not apply
+
+    def __init__(self, msgbuf: bytearray, name: str, msgid: int):
+        self._msgbuf = msgbuf
+        self.name = name
+        self.length = len(msgbuf)
+        self._msgid = msgid
+        if msgbuf[0] == PROTOCOL_MARKER_V1:
+            self._seq, self._src_system, self._src_component = msgbuf[2], msgbuf[3], msgbuf[4]
+        else:
+            self._seq, self._src_system, self._src_component = msgbuf[4], msgbuf[5], msgbuf[6]
+
+    def get_type(self) -> str:
+        return "FILTERED"
+
+    def get_msgId(self) -> int:
+        return self._msgid
+
+    def get_srcSystem(self) -> int:
+        return self._src_system
+
+    def get_srcComponent(self) -> int:
+        return self._src_component
+
+    def get_seq(self) -> int:
+        return self._seq
+
+    def get_msgbuf(self) -> bytearray:
+        return self._msgbuf
+
+    def get_crc(self) -> int:
+        # the checksum follows the header and payload, 6 header bytes in MAVLink 1 and 10 in MAVLink 2
+        msgbuf = self._msgbuf
+        start = (6 if msgbuf[0] == PROTOCOL_MARKER_V1 else 10) + msgbuf[1]
+        return msgbuf[start] | msgbuf[start + 1] << 8
+
+    def get_fieldnames(self) -> list[str]:
+        return ["name", "length"]
+
+    def get_signed(self) -> bool:
+        return False
+
+    def get_link_id(self) -> int:
+        return 0
+
+
+class MessageFilter:
+    """
+    Drop unwanted message types at the frame header, before pymavlink unpacks them.
+    Installs itself on a pymavlink connection by wrapping its parser's decode, so filtered frames decode to a FilteredMessage.
+
+    Args:
+        allow (list[MAVMessage] | None): Only these types are decoded. Default is None, which allows every type.
+        deny (list[MAVMessage] | None): These types are never decoded. Default is None.
+    """
+
+    def __init__(self, allow: list[MAVMessage] | None = None, deny: list[MAVMessage] | None = None):
+        self.allow = None if allow is None else {message_type.value for message_type in allow}
+        self.deny = {message_type.value for message_type in deny or []}
+
+    def wants(self, msgid: int) -> bool:
+        """
+        Check if a message id passes the filter.
+
+        Args:
+            msgid (int): The MAVLink message id.
+
+        Returns:
+            bool: True if messages of this id are decoded.
+        """
+        return (self.allow is None or msgid in self.allow) and msgid not in self.deny
+
+    def install(self, master):
+        """
+        Filter the frames parsed by a connection, including after it switches MAVLink version (which replaces its parser).
+
+        Args:
+            master (mavfile): The pymavlink connection.
+
+        Returns:
+            None
+        """
+        self.__wrap(master.mav)
+        auto_mavlink_version = master.auto_mavlink_version
+
+        def filtered_auto_mavlink_version(buf):
+            auto_mavlink_version(buf)
+            self.__wrap(master.mav)
+
+        master.auto_mavlink_version = filtered_auto_mavlink_version
+
+    def __wrap(self, mav):
+        """
+        Wrap the decode of a parser, once.
+
+        Args:
+            mav (MAVLink): The pymavlink parser.
+
+        Returns:
+            None
+        """
+        if getattr(mav, "_mavez_filtered", False):
+            return
+        mav._mavez_filtered = True
+        decode = mav.decode
+        mavlink_map = sys.modules[type(mav).__module__].mavlink_map
+        allow = self.allow
+        deny = self.deny
+
+        def filtered_decode(msgbuf):
+            if msgbuf[0] == PROTOCOL_MARKER_V1:
+                msgid = msgbuf[5]
+            else:
+                msgid = msgbuf[7] | msgbuf[8] << 8 | msgbuf[9] << 16
+            if (allow is None or msgid in allow) and msgid not in deny:
+                return decode(msgbuf)
+            message_class = mavlink_map.get(msgid)
+            return FilteredMessage(msgbuf, message_class.msgname if message_class else f"UNKNOWN_{msgid}", msgid)
+
+        mav.decode = filtered_decode
@@ -0,0 +1,138 @@
+# message_stream.py
+# version: 1.1.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+import asyncio
+from collections import deque
+from typing import Callable
+
+
+class MessageStream:
+    """
+    Async iterator over every message of one type received after it was opened, filled directly by the message pump.
+    Obtain one from Controller.stream rather than constructing it.
+
+    Args:
+        message_type (str): The MAVLink message type name streamed.
+        maxlen (int): Most messages buffered before the overflow policy applies.
+        overflow (str): "drop_oldest" discards the oldest buffered message to make room, "block" pauses the message pump until the consumer catches up.
+        on_close (Callable[[MessageStream], None] | None): Called once when the stream is closed. Default is None.
+
+    Raises:
+        ValueError: If the overflow policy is unknown or maxlen is not positive.
+    """
+
+    OVERFLOW_POLICIES = ("drop_oldest", "block")
+
+    def __init__(self, message_type: str, maxlen: int, overflow: str, on_close: Callable[["MessageStream"], None] | None = None):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.message_type = message_type
+        self.maxlen = maxlen
+        self.overflow = overflow
+        self.dropped = 0  # messages discarded by the drop_oldest policy
+        self.closed = False
+        # block streams may briefly exceed maxlen by the rest of a batch already read, so only drop_oldest bounds the deque
+        self.__buffer: deque[dict] = deque(maxlen=maxlen if overflow == "drop_oldest" else None)
+        self.__on_close = on_close
+        self.__getter: asyncio.Future | None = None
+        # one per pump reader waiting for room, several when a controller reads redundant links
+        self.__space_waiters: set[asyncio.Future] = set()
+
+    def __len__(self) -> int:
+        return len(self.__buffer)
+
+    @property
+    def full(self) -> bool:
+        """
+        Whether the stream holds maxlen or more messages.
+
+        Returns:
+            bool: True if the buffer is full.
+        """
+        return len(self.__buffer) >= self.maxlen
+
+    def put(self, message: dict):
+        """
+        Buffer a received message and wake the consumer. Called by the message pump, never blocks.
+
+        Args:
+            message (dict): Dictionary representation of the MAVLink message.
+
+        Returns:
+            None
+        """
+        if self.closed:
+            return
+        if self.overflow == "drop_oldest" and len(self.__buffer) >= self.maxlen:
+            self.dropped += 1
+        self.__buffer.append(message)
+        if self.__getter is not None and not self.__getter.done():
+            self.__getter.set_result(None)
+
+    async def wait_for_space(self):
+        """
+        Wait until the stream is below maxlen or closed. Used by the message pump for the block policy, any number of readers may wait at once.
+
+        Returns:
+            None
+        """
+        while self.full and not self.closed:
+            space = asyncio.get_running_loop().create_future()
+            self.__space_waiters.add(space)
+            try:
+                await space
+            finally:
+                self.__space_waiters.discard(space)
+
+    def __wake_space_waiters(self):
+        """
+        Wake every reader waiting for room.
+
+        Returns:
+            None
+        """
+        for space in self.__space_waiters:
+            if not space.done():
+                space.set_result(None)
+
+    def close(self):
+        """
+        Stop the stream. Messages already buffered are still yielded, then iteration ends.
+
+        Returns:
+            None
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self.__getter is not None and not self.__getter.done():
+            self.__getter.set_result(None)
+        self.__wake_space_waiters()
+        if self.__on_close is not None:
+            self.__on_close(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        while not self.__buffer:
+            if self.closed:
+                raise StopAsyncIteration
+            self.__getter = asyncio.get_running_loop().create_future()
+            await self.__getter
+        message = self.__buffer.popleft()
+        if self.__space_waiters and not self.full:
+            self.__wake_space_waiters()
+        return message
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
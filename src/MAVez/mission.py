@@ -1,8 +1,8 @@
 # mission.py
-# version: 3.1.1
+# version: 3.6.0
 # Author: Theodore Tasman
 # Creation Date: 2025-01-30
-# Last Modified: 2026-03-21
+# Last Modified: 2026-10-18
 # Organization: PSU UAS
 
 """
@@ -10,16 +10,29 @@ An ardupilot mission.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional
 from lingo import Message
 
 from MAVez.mission_item import MissionItem
+from MAVez.mission_download import MissionDownload
+from MAVez.mission_upload import MissionUpload, changed_ranges
 from MAVez.coordinate import Coordinate
 from MAVez.controller import Controller
+from MAVez.enums.mav_message import MAVMessage
 
+import hashlib
+import json
 import logging
+import os
+import struct
 import time
 
+if TYPE_CHECKING:
+    from MAVez.mission_columns import MissionColumns
+
+# MissionItem.fields as sent in MISSION_ITEM_INT, for fingerprints
+ITEM_FORMAT = struct.Struct("<BHBB4fiif")
+
 
 class Mission:
     """
@@ -37,13 +50,21 @@ class Mission:
     # if an error is function specific, it will be defined in the function and documented in class docstring
     TIMEOUT_ERROR = 101
 
-    # time to wait for mission to be sent
+    # MAV_MISSION_RESULT ending a download only started to read the item count
+    MAV_MISSION_OPERATION_CANCELLED = 15
+
+    # time to wait for mission to be sent, plus time per mission item
     MISSION_SEND_TIMEOUT = 20  # seconds
+    MISSION_ITEM_TIMEOUT = 0.5  # seconds
+
+    # fingerprint, opaque id and item count of the mission last transferred, per vehicle and mission type, kept across restarts for is_on_vehicle
+    # None keeps no record on disk
+    RECORD_FILE: Path | None = Path.home() / ".mavez" / "missions.json"
 
     def __init__(self, controller: Controller, type: int=0):
         self.controller = controller
         self.type = type
-        self.mission_items: list[MissionItem] = []
+        self.mission_items: list[MissionItem] | MissionColumns = []
         self.is_takeoff = False
         self.is_landing = False
         self.is_geofence = self.type == 1
@@ -57,6 +78,17 @@ class Mission:
 
     __repr__ = __str__
 
+    @property
+    def fingerprint(self) -> str:
+        """
+        Deterministic digest of the mission's type and items as the vehicle stores them, equal for missions the vehicle cannot tell apart.
+        Item 0 of a waypoint mission is left out, the autopilot replaces it with its home position.
+
+        Returns:
+            str: Hex digest of the mission.
+        """
+        return mission_fingerprint(self.type, [mission_item.fields for mission_item in self.mission_items])
+
     def decode_error(self, error_code: int) -> str:
         """
         Decode an error code into a human-readable string.
@@ -77,22 +109,53 @@ class Mission:
         return error_codes.get(error_code, f"\nUNKNOWN ERROR ({error_code})\n")
 
     @classmethod
-    def from_file(cls, controller: Controller, filepath: Path, type: int=0) -> Optional['Mission']:
-        """Create a Mission object directly from a QGC WPL 110 file.    
+    def from_file(cls, controller: Controller, filepath: Path, type: int=0, columnar: bool=False) -> Optional['Mission']:
+        """Create a Mission object directly from a QGC WPL 110 file.
+
+        Args:
+            controller (Controller): The controller instance to send the mission through.
+            filepath (Path): The path to the file containing the mission.
+            type (int): The type of the mission, default is 0 (waypoint mission).
+            columnar (bool): Whether to parse the file in bulk into a MissionColumns, default is False. Needs NumPy.
 
         Returns:
             Mission | None: The created mission object or None if file loading failed
         """
         mission = cls(controller, type)
-        res = mission.load_mission_from_file(filepath)
+        res = mission.load_mission_from_file(filepath, columnar=columnar)
         if res != 0:
             if controller.logger:
                 controller.logger.error(f"[Mission] Failed to load mission: {mission.decode_error(res)}")
             return None
         return mission
 
+    @classmethod
+    async def download(
+        cls, controller: Controller, type: int=0, progress: Optional[Callable[[int, int], None]] = None, timeout: Optional[float] = None, window: int = MissionDownload.WINDOW
+    ) -> Optional['Mission']:
+        """Read back the mission held by the vehicle, e.g. to verify an upload or to resume after a restart without re-uploading.
+
+        Args:
+            controller (Controller): The controller to download through, its message pump must be running.
+            type (int): The type of the mission, default is 0 (waypoint mission).
+            progress (Callable[[int, int], None] | None): Called with (items received, total items) as items arrive, default is None.
+            timeout (float | None): Seconds allowed for the download, default is None (fail only once the vehicle stops answering).
+            window (int): Most item requests outstanding at once, default is MissionDownload.WINDOW.
+
+        Returns:
+            Mission | None: The downloaded mission or None if the download failed
+        """
+        mission = cls(controller, type)
+        download = MissionDownload(mission, window, progress)
+        res = await download.run(timeout)
+        if res != 0:
+            if controller.logger:
+                controller.logger.error(f"[Mission] Failed to download mission: error {res}")
+            return None
+        return mission
+
     def load_mission_from_file(
-        self, filename: Path, start: int=0, end: int=-1, first_seq: int=-1, overwrite: bool=True
+        self, filename: Path, start: int=0, end: int=-1, first_seq: int=-1, overwrite: bool=True, columnar: bool=False
     ):
         """
         Load a QGC WPL 110 mission from a file. For details on the file format, see: https://mavlink.io/en/file_formats/
@@ -103,9 +166,15 @@ class Mission:
             end (int): The line number to stop loading at, default is -1 (load to the end).
             first_seq (int): The sequence number to start from, default is -1 (use the sequence number from the file).
             overwrite (bool): Whether to overwrite the existing mission items, default is True.
+            columnar (bool): Whether to parse the lines in bulk into a MissionColumns instead of a MissionItem per line, default is False.
+                Much faster for large generated missions, needs NumPy. When appending to a list of items, the new items are added to the list.
 
         Returns:
             int: 0 if the mission was loaded successfully, or an error code if there was an error.
+
+        Raises:
+            ImportError: If columnar is True and NumPy is not installed.
+            ValueError: If columnar is True and a line does not hold twelve numbers.
         """
 
         FILE_NOT_FOUND = 201
@@ -152,6 +221,25 @@ class Mission:
         else:
             lines = lines[start + 1 : end + 1]
 
+        if columnar:
+            # NumPy is optional, only needed here
+            from MAVez.mission_columns import parse_wpl
+
+            columns = parse_wpl(lines, first_seq, self.type)
+            if (columns.columns["command"] == 22).any():
+                self.is_takeoff = True
+            if (columns.columns["command"] == 21).any():
+                self.is_landing = True
+            if len(self.mission_items) == 0:
+                self.mission_items = columns
+            else:
+                self.mission_items.extend(columns)
+            if self.controller.logger:
+                self.controller.logger.info(
+                    f"[Mission] Loaded {len(columns)} mission items from {filename}"
+                )
+            return 0
+
         count = 0
         for line in lines:
             # skip empty lines
@@ -250,52 +338,57 @@ class Mission:
 
         return 0
 
-    async def send_mission(self, reset: bool = True) -> int:
+    async def send_mission(
+        self,
+        reset: bool = True,
+        progress: Callable[[int, int], None] | None = None,
+        timeout: float | None = None,
+        differential: bool = False,
+        skip_identical: bool = False,
+    ) -> int:
         """
         Send the mission to ardupilot.
 
         Args:
             reset (bool): Whether to reset the mission index to 0 after sending the mission, default is True.
+            progress (Callable[[int, int], None] | None): Called with (items received by the vehicle, total items) as the upload advances, default is None.
+            timeout (float | None): Seconds allowed for the upload, default is None (MISSION_SEND_TIMEOUT plus MISSION_ITEM_TIMEOUT per item sent).
+            differential (bool): Only write the ranges of items that differ from the mission last transferred through the controller, with MISSION_WRITE_PARTIAL_LIST,
+                when that is cheaper than a full upload, default is False. Assumes nothing else changed the vehicle's mission since.
+            skip_identical (bool): Skip the transfer, and leave the mission index as it is, if the vehicle already holds this mission, see is_on_vehicle, default is False.
+                Otherwise the mission is sent as if skip_identical were False.
 
         Returns:
             int: 0 if the mission was sent successfully, or an error code if there was an error.
         """
-
-        # send mission count
-        next_mission_request_seq = self.controller.get_message_seq("MISSION_REQUEST") + 1
-        next_mission_ack_seq = self.controller.get_message_seq("MISSION_ACK") + 1
-        self.controller.send_mission_count(len(self.mission_items), self.type)
-
-        # continuous loop to await mission request, or timeout
-        start_time = time.monotonic()
-        while True:
-            # await mission request
-            seq = await self.controller.receive_mission_request(next_mission_request_seq)
-            next_mission_request_seq += 1
-
-            # verify seq is not an error
-            if seq == self.controller.TIMEOUT_ERROR:
-                return self.TIMEOUT_ERROR
-
-            # send corresponding mission item
-            self.controller.send_message(self.mission_items[seq].message)
-
-            # check if all mission items have been sent
-            if seq == len(self.mission_items) - 1:
-                break
-
-            # check for timeout
-            if time.monotonic() - start_time > self.MISSION_SEND_TIMEOUT:
-                if self.controller.logger:
-                    self.controller.logger.error(
-                        f"[Mission] Mission send timeout after {self.MISSION_SEND_TIMEOUT} seconds"
-                    )
-                return self.TIMEOUT_ERROR
-
-        # after sending all mission items, wait for mission acknowledgement
-        response = await self.controller.receive_mission_ack(next_mission_ack_seq)  # returns 0 if successful
-        if response:
-            return response  # propagate error code
+        if skip_identical and await self.is_on_vehicle():
+            if self.controller.logger:
+                self.controller.logger.info(f"[Mission] Vehicle already holds mission {self.fingerprint[:12]}, skipping upload")
+            return 0
+        if differential:
+            ranges = self.__changed_ranges()
+        else:
+            ranges = None
+        if ranges is None:
+            ranges = [(0, None)]
+            total = len(self.mission_items)
+        else:
+            total = sum(end - start + 1 for start, end in ranges)
+        if timeout is None:
+            timeout = self.MISSION_SEND_TIMEOUT + self.MISSION_ITEM_TIMEOUT * total
+        deadline = time.monotonic() + timeout
+
+        done = 0
+        for start, end in ranges:
+            # progress over every range sent
+            report = (lambda count, _, done=done: progress(done + count, total)) if progress is not None else None
+            upload = MissionUpload(self.controller, self.mission_items, self.type, report, start, end)
+            response = await upload.run(deadline - time.monotonic())
+            if response:
+                self.__store_record()
+                return response  # propagate error code
+            done += len(upload)
+        self.__store_record()
 
         response = await self.controller.set_current_mission_index(0, reset=reset)
         if response:
@@ -305,6 +398,156 @@ class Mission:
 
         return 0
 
+    async def is_on_vehicle(self) -> bool:
+        """
+        Check whether the vehicle holds exactly this mission.
+        The vehicle is always asked for its item count first. The record of the mission last transferred, kept by the controller
+        or, after a restart, in RECORD_FILE, is trusted if the vehicle reports the same opaque id for its mission,
+        or, if its MAVLink dialect has no opaque ids, the same item count as the record.
+        Otherwise, if the count matches this mission, the vehicle's mission is downloaded and the fingerprints compared.
+
+        Without opaque ids, a mission changed by another ground station to one of the same length goes unnoticed until it is downloaded.
+        On a mismatch nothing is changed on the vehicle, send_mission then uploads the mission and replaces the record.
+
+        Returns:
+            bool: True if the vehicle holds the same items, False if not or if it did not answer.
+        """
+        controller = self.controller
+        next_count_seq = controller.get_message_seq("MISSION_COUNT") + 1
+        controller.send_mission_request_list(self.type)
+        count = await controller.receive_message(
+            MAVMessage.MISSION_COUNT, next_count_seq, qualifier=lambda message: message.get("mission_type", 0) == self.type, timeout=controller.TIMEOUT_DURATION
+        )
+        if count is None:
+            if controller.logger:
+                controller.logger.warning("[Mission] Vehicle did not report its mission count")
+            return False
+        # only the count was wanted, end the download
+        controller.send_mission_ack(self.MAV_MISSION_OPERATION_CANCELLED, self.type)
+
+        uploaded = controller.uploaded_missions.get(self.type)
+        if uploaded is not None:
+            record = {"fingerprint": mission_fingerprint(self.type, uploaded), "opaque_id": controller.mission_opaque_ids.get(self.type, 0), "count": len(uploaded)}
+        else:
+            record = self.__load_record()
+        if record is not None:
+            opaque_id = count.get("opaque_id", 0)
+            if opaque_id == record["opaque_id"] and (opaque_id or count["count"] == record["count"]):
+                return record["fingerprint"] == self.fingerprint
+        if count["count"] != len(self.mission_items):
+            return False
+        vehicle_mission = await Mission.download(controller, self.type)
+        if vehicle_mission is None:
+            return False
+        self.__store_record()
+        return vehicle_mission.fingerprint == self.fingerprint
+
+    def __record_key(self, mission_type: int) -> tuple[str, str]:
+        """
+        Key of a mission's record in RECORD_FILE.
+
+        Args:
+            mission_type (int): The type of the mission.
+
+        Returns:
+            tuple[str, str]: The vehicle's system id and the mission type.
+        """
+        return str(self.controller.target_system), str(mission_type)
+
+    def __read_records(self) -> dict:
+        """
+        Read RECORD_FILE.
+
+        Returns:
+            dict: Records per system id and mission type, empty if there is no file or it cannot be read.
+        """
+        if self.RECORD_FILE is None:
+            return {}
+        try:
+            with open(self.RECORD_FILE) as file:
+                records = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            if self.controller.logger:
+                self.controller.logger.warning(f"[Mission] Could not read mission records from {self.RECORD_FILE}: {e}")
+            return {}
+        return records if isinstance(records, dict) else {}
+
+    def __load_record(self) -> dict | None:
+        """
+        Load the record of the mission last transferred to the vehicle from RECORD_FILE.
+
+        Returns:
+            dict | None: The fingerprint, opaque_id and count of the mission, or None if there is no record.
+        """
+        sysid, mission_type = self.__record_key(self.type)
+        record = self.__read_records().get(sysid, {}).get(mission_type)
+        if not isinstance(record, dict) or not {"fingerprint", "opaque_id", "count"} <= record.keys():
+            return None
+        return record
+
+    def __store_record(self, mission_type: int | None = None):
+        """
+        Write the controller's record of the vehicle's mission to RECORD_FILE, or remove it if the controller has none.
+
+        Args:
+            mission_type (int | None): The type of the mission, default is None (this mission's type).
+
+        Returns:
+            None
+        """
+        if self.RECORD_FILE is None:
+            return
+        controller = self.controller
+        mission_type = self.type if mission_type is None else mission_type
+        sysid, key = self.__record_key(mission_type)
+        records = self.__read_records()
+        vehicle = records.setdefault(sysid, {})
+        uploaded = controller.uploaded_missions.get(mission_type)
+        if uploaded is None:
+            if vehicle.pop(key, None) is None:
+                return
+        else:
+            vehicle[key] = {
+                "fingerprint": mission_fingerprint(mission_type, uploaded),
+                "opaque_id": controller.mission_opaque_ids.get(mission_type, 0),
+                "count": len(uploaded),
+            }
+        path = Path(self.RECORD_FILE)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write then rename, so a crash never leaves half a file
+            temporary = path.with_name(path.name + ".tmp")
+            with open(temporary, "w") as file:
+                json.dump(records, file)
+            os.replace(temporary, path)
+        except OSError as e:
+            if controller.logger:
+                controller.logger.warning(f"[Mission] Could not write mission records to {path}: {e}")
+
+    def __changed_ranges(self) -> list[tuple[int, int]] | None:
+        """
+        Find the ranges of items to write for a differential upload.
+
+        Returns:
+            list[tuple[int, int]] | None: The first and last index of each range, or None if a full upload is needed or cheaper.
+        """
+        uploaded = self.controller.uploaded_missions.get(self.type)
+        if uploaded is None or len(uploaded) != len(self.mission_items) or not self.mission_items:
+            # a partial write cannot change the length of the vehicle's mission
+            return None
+        ranges = changed_ranges(uploaded, self.mission_items)
+        # each transfer costs about a round trip per item plus one to start it
+        if sum(end - start + 2 for start, end in ranges) >= len(self.mission_items) + 1:
+            return None
+        if self.controller.logger:
+            if ranges:
+                self.controller.logger.info(f"[Mission] Writing {len(ranges)} changed ranges of the mission: {ranges}")
+            else:
+                self.controller.logger.info("[Mission] Mission unchanged, nothing to write")
+        return ranges
+
     async def clear_mission(self) -> int:
         """
         Clear the mission from the vehicle.
@@ -323,6 +566,10 @@ class Mission:
                 self.controller.logger.critical("[Mission] Could not clear mission.")
             return response
 
+        # clearing only ever removes the waypoint mission
+        self.controller.uploaded_missions[0] = []
+        self.controller.mission_opaque_ids.pop(0, None)
+        self.__store_record(0)
         return 0
 
     def __len__(self):
@@ -330,6 +577,23 @@ class Mission:
 
 
 
+def mission_fingerprint(mission_type: int, fields: list[tuple]) -> str:
+    """Digest a mission from its type and the fields of its items.
+    Item 0 of a waypoint mission counts towards the length but its fields are left out, ArduPilot rewrites it with the home position.
+
+    Args:
+        mission_type (int): The type of the mission.
+        fields (list[tuple]): The fields of each item, as MissionItem.fields.
+
+    Returns:
+        str: Hex SHA-256 digest of the mission.
+    """
+    digest = hashlib.sha256(struct.pack("<BI", mission_type, len(fields)))
+    for item_fields in fields[1:] if mission_type == 0 else fields:
+        digest.update(ITEM_FORMAT.pack(*item_fields))
+    return digest.hexdigest()
+
+
 def get_mission_length(filepath: str, logger: logging.Logger | None = None) -> int:
     """Utility function to get the number of mission items in a mission file.
 
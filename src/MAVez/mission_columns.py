@@ -0,0 +1,207 @@
+# mission_columns.py
+# version: 1.0.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+"""
+Columnar storage for large missions, needs NumPy (pip install MAVez[numpy]).
+
+A QGC WPL 110 file is parsed in bulk into one array per field, instead of splitting every line and building a Coordinate and a MissionItem for it.
+MissionItem objects are only built from a row when an item is read, so a generated survey of tens of thousands of items
+holds about 100 bytes per item until it is uploaded or edited.
+"""
+
+from collections.abc import MutableSequence
+from typing import Iterable, Iterator
+import warnings
+
+import numpy as np
+
+from MAVez.coordinate import Coordinate
+from MAVez.mission_item import MissionItem
+
+# fields in QGC WPL 110 column order
+COLUMNS = ("seq", "current", "frame", "command", "param1", "param2", "param3", "param4", "x", "y", "z", "auto_continue")
+INT_COLUMNS = ("seq", "current", "frame", "command", "auto_continue")
+
+# rows turned into MissionItem at once while iterating
+ITER_CHUNK = 1024
+
+
+class MissionColumns(MutableSequence):
+    """
+    The items of a Mission stored as one NumPy array per field, in place of its list of MissionItem.
+
+    Reading an item builds a new MissionItem from its row, so changing that MissionItem does not change the mission.
+    Assign it back with mission.mission_items[i] = item, or edit the columns directly.
+    x and y hold what MissionItem holds, degE7 for coordinates given in degrees.
+
+    Example:
+        mission.load_mission_from_file("survey.waypoints", columnar=True)
+        mission.mission_items.columns["z"] += 10  # raise every item by 10 m
+
+    Args:
+        columns (dict[str, np.ndarray]): One array per name in COLUMNS, all the same length. The integer fields are stored as int64, the others as float64.
+        type (int): The MAV_MISSION_TYPE of the items, default is 0.
+
+    Raises:
+        ValueError: If a column is missing or the columns differ in length.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], type: int = 0):
+        missing = [name for name in COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Missing mission columns: {', '.join(missing)}")
+        if len({len(columns[name]) for name in COLUMNS}) > 1:
+            raise ValueError("Mission columns differ in length")
+        self.columns = {name: np.ascontiguousarray(columns[name], dtype=np.int64 if name in INT_COLUMNS else np.float64) for name in COLUMNS}
+        self.type = type
+
+    @classmethod
+    def from_items(cls, items: Iterable[MissionItem], type: int = 0) -> "MissionColumns":
+        """
+        Store mission items in columns.
+
+        Args:
+            items (Iterable[MissionItem]): The items.
+            type (int): The MAV_MISSION_TYPE of the items, default is 0.
+
+        Returns:
+            MissionColumns: The items in columns.
+        """
+        rows = [[getattr(item, name) for name in COLUMNS] for item in items]
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), len(COLUMNS))
+        return cls({name: table[:, index] for index, name in enumerate(COLUMNS)}, type)
+
+    def __len__(self) -> int:
+        return len(self.columns["seq"])
+
+    def __repr__(self) -> str:
+        return f"MissionColumns({len(self)} items, type {self.type})"
+
+    def __item(self, row: tuple) -> MissionItem:
+        """
+        Build a MissionItem from one row of the columns.
+
+        Args:
+            row (tuple): The row's values as Python numbers, in COLUMNS order.
+
+        Returns:
+            MissionItem: The item.
+        """
+        seq, current, frame, command, param1, param2, param3, param4, x, y, z, auto_continue = row
+        item = MissionItem(seq, frame, command, current, auto_continue, Coordinate(0, 0, z), self.type, param1, param2, param3, param4)
+        # stored as MissionItem holds them, Coordinate would rescale values within a few centimetres of 0
+        item.x = int(x) if x.is_integer() else x
+        item.y = int(y) if y.is_integer() else y
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # a copy, like slicing a list
+            return MissionColumns({name: column[index].copy() for name, column in self.columns.items()}, self.type)
+        return self.__item(tuple(self.columns[name][index].item() for name in COLUMNS))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = value if isinstance(value, MissionColumns) else MissionColumns.from_items(value, self.type)
+            for name, column in self.columns.items():
+                column[index] = value.columns[name]
+            return
+        for name, column in self.columns.items():
+            column[index] = getattr(value, name)
+
+    def __delitem__(self, index):
+        indexes = np.arange(len(self))[index]
+        self.columns = {name: np.delete(column, indexes) for name, column in self.columns.items()}
+
+    def __iter__(self) -> Iterator[MissionItem]:
+        for start in range(0, len(self), ITER_CHUNK):
+            # convert a chunk of rows to Python numbers at once rather than element by element
+            chunk = zip(*(self.columns[name][start:start + ITER_CHUNK].tolist() for name in COLUMNS))
+            for row in chunk:
+                yield self.__item(row)
+
+    def insert(self, index: int, value: MissionItem):
+        """
+        Insert a mission item before index, copying every column.
+
+        Args:
+            index (int): The index to insert at.
+            value (MissionItem): The item.
+
+        Returns:
+            None
+        """
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        self.columns = {name: np.insert(column, index, getattr(value, name)) for name, column in self.columns.items()}
+
+    def append(self, value: MissionItem):
+        """
+        Append a mission item, copying every column. Use extend to add many items.
+
+        Args:
+            value (MissionItem): The item.
+
+        Returns:
+            None
+        """
+        self.insert(len(self), value)
+
+    def extend(self, values: Iterable[MissionItem]):
+        """
+        Append mission items, copying every column once.
+
+        Args:
+            values (Iterable[MissionItem]): The items, a MissionColumns is appended without building its items.
+
+        Returns:
+            None
+        """
+        values = values if isinstance(values, MissionColumns) else MissionColumns.from_items(values, self.type)
+        self.columns = {name: np.concatenate((column, values.columns[name])) for name, column in self.columns.items()}
+
+
+def parse_wpl(lines: list[str], first_seq: int = -1, type: int = 0) -> MissionColumns:
+    """
+    Parse the item lines of a QGC WPL 110 file, without its header, as Mission.load_mission_from_file does line by line.
+    Empty lines and anything after a # are skipped.
+
+    Args:
+        lines (list[str]): The item lines, as returned by readlines.
+        first_seq (int): The sequence number of the first item, default is -1 (use the sequence numbers in the file).
+        type (int): The MAV_MISSION_TYPE of the items, default is 0.
+
+    Returns:
+        MissionColumns: The items.
+
+    Raises:
+        ValueError: If a line does not hold twelve numbers, or an integer field holds a fraction.
+    """
+    with warnings.catch_warnings():
+        # a file of only a header is an empty mission, not worth a warning
+        warnings.filterwarnings("ignore", "loadtxt: input contained no data")
+        # every line in one pass of NumPy's C reader, whitespace of any kind separates the fields
+        table = np.loadtxt(lines, dtype=np.float64, comments="#", ndmin=2)
+    if table.size == 0:
+        table = table.reshape(0, len(COLUMNS))
+    if table.shape[1] != len(COLUMNS):
+        raise ValueError(f"Mission item lines hold {table.shape[1]} fields, expected {len(COLUMNS)}")
+    rows = len(table)
+
+    columns = {name: table[:, index] for index, name in enumerate(COLUMNS)}
+    for name in INT_COLUMNS:
+        if not np.array_equal(columns[name], np.trunc(columns[name])):
+            raise ValueError(f"Mission item {name} must be an integer")
+        columns[name] = columns[name].astype(np.int64)
+    if first_seq != -1:
+        columns["seq"] = np.arange(first_seq, first_seq + rows, dtype=np.int64)
+
+    # Coordinate's conversion of degrees to degE7, for every row at once
+    x, y = columns["x"], columns["y"]
+    degrees = (np.abs(x) < 90) & (np.abs(y) < 180)
+    columns["x"] = np.where(degrees, np.trunc(x * 1e7), x)
+    columns["y"] = np.where(degrees, np.trunc(y * 1e7), y)
+    return MissionColumns(columns, type)
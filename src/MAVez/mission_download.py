@@ -0,0 +1,236 @@
+# mission_download.py
+# version: 1.2.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+"""
+Download the mission held by ardupilot with the MAVLink mission protocol, see https://mavlink.io/en/services/mission.html
+
+MISSION_REQUEST_LIST is answered with MISSION_COUNT, then each item is requested by index with MISSION_REQUEST_INT.
+The vehicle answers every request on its own, so up to a window of requests is kept outstanding instead of waiting a round trip per item.
+A request left unanswered for the retransmission timeout, computed from the measured round trip time, is sent again.
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Callable
+
+from MAVez.controller import Controller
+from MAVez.coordinate import Coordinate
+from MAVez.enums.mav_message import MAVMessage
+from MAVez.enums.mav_mission_result import MAVMissionResult
+from MAVez.mission_item import MissionItem
+from MAVez.retransmission_timer import RetransmissionTimer
+
+if TYPE_CHECKING:
+    from MAVez.mission import Mission
+
+
+class MissionDownload:
+    """
+    One download of the vehicle's mission into a Mission, usually run by Mission.download. The controller's message pump must be running.
+
+    Example:
+        download = MissionDownload(Mission(controller), progress=lambda done, total: print(f"{done}/{total}"))
+        if await download.run(timeout=60) == 0:
+            mission = download.mission
+
+    Args:
+        mission (Mission): The mission to fill, of the type to download, through its controller. Its items are replaced once the item count is known.
+        window (int): Most item requests outstanding at once. Default is WINDOW.
+        progress (Callable[[int, int], None] | None): Called with (items received, total items) whenever an item arrives. Default is None.
+
+    Raises:
+        ValueError: If the window is not positive.
+    """
+
+    TIMEOUT_ERROR = 101
+    MAV_MISSION_ACCEPTED = 0
+
+    WINDOW = 8  # item requests outstanding at once, enough to keep a 57600 baud radio busy
+    MAX_RETRIES = 5  # retransmissions of the same request before the download fails
+
+    def __init__(self, mission: "Mission", window: int = WINDOW, progress: Callable[[int, int], None] | None = None):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.mission = mission
+        self.controller: Controller = mission.controller
+        self.mission_type = mission.type
+        self.window = window
+        self.progress = progress
+        self.timer = RetransmissionTimer()
+        self.count: int | None = None  # items held by the vehicle, once known
+        self.opaque_id = 0  # id the vehicle gave its mission, 0 if its MAVLink dialect has none
+        self.received = 0  # items received
+        self.retransmissions = 0  # requests sent again after a timeout
+        self.__items: list[MissionItem | None] = []
+
+    def __add_item(self, message: dict) -> bool:
+        """
+        Store a received item and extend the mission with the items now in order.
+
+        Args:
+            message (dict): The MISSION_ITEM_INT fields.
+
+        Returns:
+            bool: True if the item had not been received before.
+        """
+        seq = message["seq"]
+        if self.__items[seq] is not None:
+            return False
+        item = MissionItem(
+            seq,
+            message["frame"],
+            message["command"],
+            message["current"],
+            message["autocontinue"],
+            Coordinate(0, 0, message["z"]),
+            self.mission_type,
+            message["param1"],
+            message["param2"],
+            message["param3"],
+            message["param4"],
+        )
+        # degE7 as received, Coordinate would rescale values within a few centimetres of 0
+        item.x = message["x"]
+        item.y = message["y"]
+        self.__items[seq] = item
+        self.received += 1
+
+        mission = self.mission
+        items = mission.mission_items
+        while len(items) < len(self.__items) and self.__items[len(items)] is not None:
+            item = self.__items[len(items)]
+            items.append(item)
+            if item.command == 22:
+                mission.is_takeoff = True
+            if item.command == 21:
+                mission.is_landing = True
+        if self.progress is not None:
+            self.progress(self.received, len(self.__items))
+        return True
+
+    async def run(self, timeout: float | None = None) -> int:
+        """
+        Request the item count, then every item, and acknowledge the transfer.
+
+        Args:
+            timeout (float | None): Seconds allowed for the whole download. Default is None, which only fails after MAX_RETRIES unanswered retransmissions.
+
+        Returns:
+            int: 0 if the whole mission was received, 101 if the download timed out, or the MAV_MISSION_RESULT the vehicle refused it with.
+        """
+        controller = self.controller
+        timer = self.timer
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        streams = [
+            controller.stream(MAVMessage.MISSION_COUNT),
+            controller.stream(MAVMessage.MISSION_ITEM_INT),
+            controller.stream(MAVMessage.MISSION_ACK),
+        ]
+        reads = {asyncio.ensure_future(stream.__anext__()): stream for stream in streams}
+
+        # send time and retransmissions per outstanding request, -1 for the request list
+        outstanding: dict[int, float] = {-1: time.monotonic()}
+        retries: dict[int, int] = {-1: 0}
+        next_seq = 0
+        controller.send_mission_request_list(self.mission_type)
+        try:
+            while True:
+                now = time.monotonic()
+                if self.count is not None:
+                    # keep the window full
+                    while len(outstanding) < self.window and next_seq < self.count:
+                        if self.__items[next_seq] is None:
+                            controller.send_mission_request(next_seq, self.mission_type)
+                            outstanding[next_seq] = now
+                            retries[next_seq] = 0
+                        next_seq += 1
+                    if not outstanding:
+                        controller.send_mission_ack(self.MAV_MISSION_ACCEPTED, self.mission_type)
+                        controller.uploaded_missions[self.mission_type] = [item.fields for item in self.mission.mission_items]
+                        if self.opaque_id:
+                            controller.mission_opaque_ids[self.mission_type] = self.opaque_id
+                        else:
+                            controller.mission_opaque_ids.pop(self.mission_type, None)
+                        controller.logger.info(f"[Mission] Downloaded {self.count} mission items, {self.retransmissions} retransmissions")
+                        return 0
+
+                if deadline is not None and now >= deadline:
+                    controller.logger.error(f"[Mission] Mission download timed out after {timeout} seconds, {self.received}/{self.count or 0} items received")
+                    return self.TIMEOUT_ERROR
+                wait = min(outstanding.values()) + timer.rto - now
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                done, _ = await asyncio.wait(reads, timeout=max(0.0, wait), return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    now = time.monotonic()
+                    expired = [seq for seq, sent_at in outstanding.items() if now - sent_at >= timer.rto]
+                    if not expired:
+                        continue
+                    for seq in expired:
+                        if retries[seq] == self.MAX_RETRIES:
+                            controller.logger.error(f"[Mission] No response from vehicle after {retries[seq]} retransmissions, {self.received}/{self.count or 0} items received")
+                            return self.TIMEOUT_ERROR
+                        retries[seq] += 1
+                        self.retransmissions += 1
+                        if seq < 0:
+                            controller.send_mission_request_list(self.mission_type)
+                        else:
+                            controller.send_mission_request(seq, self.mission_type)
+                        outstanding[seq] = now
+                    timer.backoff()
+                    controller.logger.debug(f"[Mission] Requested {len(expired)} items again, timeout now {timer.rto:.3f}s")
+                    continue
+
+                now = time.monotonic()
+                # the count before the items it makes room for
+                for read in sorted(done, key=lambda read: streams.index(reads[read])):
+                    stream = reads.pop(read)
+                    if read.exception() is not None:
+                        # the controller stopped and closed the stream
+                        controller.logger.error("[Mission] Message pump stopped during mission download")
+                        return self.TIMEOUT_ERROR
+                    reads[asyncio.ensure_future(stream.__anext__())] = stream
+                    message = read.result()
+                    if message.get("mission_type", 0) != self.mission_type:
+                        continue
+
+                    if stream is streams[0]:
+                        if self.count is not None or -1 not in outstanding:
+                            continue
+                        if not retries.pop(-1):
+                            timer.sample(now - outstanding[-1])
+                        del outstanding[-1]
+                        self.count = message["count"]
+                        self.opaque_id = message.get("opaque_id", 0)
+                        self.__items = [None] * self.count
+                        # items join the mission in order, as soon as every earlier item has arrived
+                        self.mission.mission_items = []
+                        self.mission.is_takeoff = False
+                        self.mission.is_landing = False
+                        controller.logger.debug(f"[Mission] Vehicle holds {self.count} mission items")
+                    elif stream is streams[1]:
+                        seq = message.get("seq")
+                        if self.count is None or seq is None or not 0 <= seq < self.count:
+                            continue
+                        if seq in outstanding:
+                            if not retries[seq]:
+                                timer.sample(now - outstanding[seq])
+                            del outstanding[seq]
+                            del retries[seq]
+                        self.__add_item(message)
+                    else:
+                        result = message.get("type")
+                        if result != self.MAV_MISSION_ACCEPTED:
+                            controller.logger.error(f"[Mission] Vehicle refused mission download: {MAVMissionResult.string(result_code=result)}")
+                            return result if result is not None else controller.BAD_RESPONSE_ERROR
+        finally:
+            for read in reads:
+                read.cancel()
+            for stream in streams:
+                stream.close()
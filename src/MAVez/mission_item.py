@@ -1,14 +1,16 @@
 # mission_item.py
-# version: 1.0.1
+# version: 1.1.0
 # Author: Theodore Tasman
 # Creation Date: 2025-01-30
-# Last Modified: 2025-09-15
+# Last Modified: 2026-10-18
 # Organization: PSU UAS
 
 """
 An ardupilot mission item.
 """
 
+import struct
+
 from pymavlink import mavutil # type: ignore[import]
 
 from MAVez.coordinate import Coordinate
@@ -68,6 +70,17 @@ class MissionItem:
 
     __repr__ = __str__
 
+    @property
+    def fields(self) -> tuple:
+        """
+        The item as the vehicle stores it, for comparing missions: every field but seq and type, with the float fields rounded to the 32 bits sent.
+
+        Returns:
+            tuple: (frame, command, current, auto_continue, param1, param2, param3, param4, x, y, z)
+        """
+        params = struct.unpack("<5f", struct.pack("<5f", self.param1, self.param2, self.param3, self.param4, self.z))
+        return (self.frame, self.command, self.current, self.auto_continue, *params[:4], int(self.x), int(self.y), params[4])
+
     @property
     def message(self):
         """
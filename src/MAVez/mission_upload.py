@@ -0,0 +1,291 @@
+# mission_upload.py
+# version: 1.3.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+"""
+Upload a mission to ardupilot with the MAVLink mission protocol, see https://mavlink.io/en/services/mission.html
+
+The vehicle pulls the mission: after MISSION_COUNT it requests every item by index with MISSION_REQUEST_INT (or the deprecated MISSION_REQUEST),
+and ends the transfer with MISSION_ACK. After MISSION_WRITE_PARTIAL_LIST it requests only a range of items, replacing those of its current mission. It rejects items it did not request, so the upload cannot push items ahead of the requests.
+Instead every request, including repeated and out of order ones, is answered as soon as it is read, from a table of item messages built before the transfer starts.
+
+When the vehicle goes quiet, the last message sent is retransmitted after a timeout derived from the measured round trip time (RFC 6298),
+rather than waiting for the vehicle to time out and request the item again.
+"""
+
+import asyncio
+import time
+from typing import Callable
+
+from MAVez.controller import Controller
+from MAVez.enums.mav_message import MAVMessage
+from MAVez.enums.mav_mission_result import MAVMissionResult
+from MAVez.mission_item import MissionItem
+from MAVez.retransmission_timer import RetransmissionTimer
+
+
+class MissionUpload:
+    """
+    One upload of mission items to the vehicle, the whole mission or a range of it. The controller's message pump must be running.
+    On success the controller's uploaded_missions and mission_opaque_ids record what the vehicle now holds, on failure they forget the mission type.
+
+    Example:
+        upload = MissionUpload(controller, mission.mission_items, progress=lambda done, total: print(f"{done}/{total}"))
+        result = await upload.run(timeout=60)
+
+    Args:
+        controller (Controller): The controller to upload through.
+        items (list[MissionItem]): The mission items, item i is sent when the vehicle requests index i.
+        mission_type (int): The MAV_MISSION_TYPE of the mission. Default is 0 (waypoint mission).
+        progress (Callable[[int, int], None] | None): Called with (items received by the vehicle, total items) whenever the vehicle confirms an item. Default is None.
+        start (int): Index of the first item to write. Default is 0.
+        end (int | None): Index of the last item to write. Default is None, which uploads the whole mission with MISSION_COUNT.
+            Otherwise items start to end replace those of the vehicle's mission with MISSION_WRITE_PARTIAL_LIST, which cannot change its length.
+
+    Raises:
+        struct.error: If an item does not fit its MAVLink fields, before anything is sent.
+        ValueError: If the range is not within the items.
+    """
+
+    TIMEOUT_ERROR = 101
+    MAV_MISSION_ACCEPTED = 0
+    MAV_MISSION_INVALID_SEQUENCE = 13  # the vehicle received an item it did not request, the transfer goes on
+
+    MAX_RETRIES = 5  # retransmissions of the same message before the upload fails
+
+    def __init__(
+        self, controller: Controller, items: list[MissionItem], mission_type: int = 0, progress: Callable[[int, int], None] | None = None, start: int = 0, end: int | None = None
+    ):
+        self.partial = end is not None
+        if end is None:
+            end = len(items) - 1
+        if self.partial and not 0 <= start <= end < len(items) or not self.partial and start != 0:
+            raise ValueError(f"Invalid range {start} to {end} of a {len(items)} item mission")
+        self.controller = controller
+        self.mission_type = mission_type
+        self.start = start
+        self.end = end
+        self.progress = progress
+        self.timer = RetransmissionTimer()
+        self.confirmed = 0  # items received by the vehicle
+        self.requests = 0  # requests answered, including repeats
+        self.repeated_requests = 0  # requests for an item already sent
+        self.retransmissions = 0  # messages sent again after a timeout
+
+        # encode each item once, addressed to the vehicle, so a bad item fails before the transfer starts
+        self.__items = items
+        self.__table = []
+        for index in range(start, end + 1):
+            message = items[index].message
+            message.seq = index
+            message.target_system = controller.target_system
+            message.target_component = controller.target_component
+            message.mission_type = mission_type
+            message.pack(controller.master.mav)
+            self.__table.append(message)
+
+    def __len__(self) -> int:
+        return len(self.__table)
+
+    def __open(self):
+        """
+        Send the message starting the transfer, MISSION_COUNT or MISSION_WRITE_PARTIAL_LIST.
+
+        Returns:
+            None
+        """
+        if self.partial:
+            self.controller.send_mission_write_partial_list(self.start, self.end, self.mission_type)
+        else:
+            self.controller.send_mission_count(len(self.__table), self.mission_type)
+
+    def __record(self, accepted: bool, opaque_id: int):
+        """
+        Update the controller's record of the vehicle's mission after the transfer.
+
+        Args:
+            accepted (bool): Whether the vehicle accepted the items.
+            opaque_id (int): The id the vehicle gave its new mission in MISSION_ACK, 0 if none.
+
+        Returns:
+            None
+        """
+        uploaded = self.controller.uploaded_missions
+        opaque_ids = self.controller.mission_opaque_ids
+        if accepted and opaque_id:
+            opaque_ids[self.mission_type] = opaque_id
+        else:
+            opaque_ids.pop(self.mission_type, None)
+        if not accepted:
+            # the vehicle may hold part of the transfer
+            uploaded.pop(self.mission_type, None)
+        elif not self.partial:
+            uploaded[self.mission_type] = [item.fields for item in self.__items]
+        elif self.mission_type in uploaded:
+            uploaded[self.mission_type][self.start:self.end + 1] = [item.fields for item in self.__items[self.start:self.end + 1]]
+
+    def __confirm(self, count: int):
+        """
+        Record that the vehicle holds the first count items and report progress.
+
+        Args:
+            count (int): Items received by the vehicle.
+
+        Returns:
+            None
+        """
+        if count > self.confirmed:
+            self.confirmed = count
+            if self.progress is not None:
+                self.progress(count, len(self.__table))
+
+    async def run(self, timeout: float | None = None) -> int:
+        """
+        Send MISSION_COUNT, or MISSION_WRITE_PARTIAL_LIST for a range, and answer the vehicle's requests until it acknowledges the mission.
+
+        Args:
+            timeout (float | None): Seconds allowed for the whole upload. Default is None, which only fails after MAX_RETRIES unanswered retransmissions.
+
+        Returns:
+            int: 0 if the vehicle accepted the mission, 101 if the upload timed out, or the MAV_MISSION_RESULT the vehicle rejected it with.
+        """
+        controller = self.controller
+        table = self.__table
+        start = self.start
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        # open the streams before the count so no request can slip past
+        streams = [
+            controller.stream(MAVMessage.MISSION_REQUEST_INT),
+            controller.stream(MAVMessage.MISSION_REQUEST),
+            controller.stream(MAVMessage.MISSION_ACK),
+        ]
+        reads = {asyncio.ensure_future(stream.__anext__()): stream for stream in streams}
+
+        last_sent = -1  # index in the table of the last item sent, -1 for the message starting the transfer
+        sent = [False] * len(table)
+        sent_at = time.monotonic()
+        retransmitted = False
+        retries = 0
+        self.__open()
+        accepted = False
+        opaque_id = 0
+        try:
+            while True:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    controller.logger.error(f"[Mission] Mission upload timed out after {timeout} seconds, {self.confirmed}/{len(table)} items received")
+                    return self.TIMEOUT_ERROR
+                wait = sent_at + self.timer.rto - now
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                done, _ = await asyncio.wait(reads, timeout=max(0.0, wait), return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        continue
+                    if retries == self.MAX_RETRIES:
+                        controller.logger.error(f"[Mission] No response from vehicle after {retries} retransmissions, {self.confirmed}/{len(table)} items received")
+                        return self.TIMEOUT_ERROR
+                    # resend whatever the vehicle should be answering, backing off like TCP
+                    retries += 1
+                    self.retransmissions += 1
+                    self.timer.backoff()
+                    retransmitted = True
+                    if last_sent < 0:
+                        self.__open()
+                    else:
+                        controller.send_message(table[last_sent])
+                    sent_at = time.monotonic()
+                    controller.logger.debug(f"[Mission] Retransmitted {'start' if last_sent < 0 else f'item {start + last_sent}'}, timeout now {self.timer.rto:.3f}s")
+                    continue
+
+                now = time.monotonic()
+                # requests before the ack, the vehicle sends them in that order
+                for read in sorted(done, key=lambda read: reads[read] is streams[2]):
+                    stream = reads.pop(read)
+                    if read.exception() is not None:
+                        # the controller stopped and closed the stream
+                        controller.logger.error("[Mission] Message pump stopped during mission upload")
+                        return self.TIMEOUT_ERROR
+                    reads[asyncio.ensure_future(stream.__anext__())] = stream
+                    message = read.result()
+                    if message.get("mission_type", 0) != self.mission_type:
+                        continue
+
+                    if stream is streams[2]:
+                        result = message.get("type")
+                        if result == self.MAV_MISSION_INVALID_SEQUENCE:
+                            controller.logger.debug("[Mission] Vehicle ignored an item it did not request")
+                            if retransmitted and 0 <= last_sent < len(table) - 1 and not sent[last_sent + 1]:
+                                # the vehicle already holds the resent item, so its request for the next was lost
+                                last_sent += 1
+                                controller.send_message(table[last_sent])
+                                sent[last_sent] = True
+                                retransmitted = False
+                                retries = 0
+                                sent_at = time.monotonic()
+                            continue
+                        if result != self.MAV_MISSION_ACCEPTED:
+                            controller.logger.error(f"[Mission] Vehicle rejected mission: {MAVMissionResult.string(result_code=result)}")
+                            return result if result is not None else controller.BAD_RESPONSE_ERROR
+                        if last_sent == len(table) - 1 and not retransmitted:
+                            self.timer.sample(now - sent_at)
+                        self.__confirm(len(table))
+                        accepted = True
+                        opaque_id = message.get("opaque_id", 0)
+                        controller.logger.info(
+                            f"[Mission] Uploaded {len(table)} mission items{f' from {start}' if self.partial else ''}, {self.retransmissions} retransmissions, {self.repeated_requests} repeated requests"
+                        )
+                        return 0
+
+                    seq = message.get("seq")
+                    if seq is None or not start <= seq <= self.end:
+                        controller.logger.warning(f"[Mission] Vehicle requested item {seq} outside the items {start} to {self.end} uploaded")
+                        continue
+                    seq -= start
+                    if seq == last_sent + 1 and not retransmitted:
+                        self.timer.sample(now - sent_at)
+                    self.__confirm(seq)
+                    self.requests += 1
+                    if sent[seq]:
+                        self.repeated_requests += 1
+                    controller.send_message(table[seq])
+                    retransmitted = sent[seq]
+                    sent[seq] = True
+                    if seq != last_sent:
+                        retries = 0
+                    last_sent = seq
+                    sent_at = time.monotonic()
+        finally:
+            self.__record(accepted, opaque_id)
+            for read in reads:
+                read.cancel()
+            for stream in streams:
+                stream.close()
+
+
+def changed_ranges(uploaded: list[tuple], items: list[MissionItem]) -> list[tuple[int, int]]:
+    """
+    Find the ranges of items that differ from the items the vehicle holds.
+    Ranges one unchanged item apart are merged, since a transfer costs about a round trip per item plus one to start it.
+
+    Args:
+        uploaded (list[tuple]): The fields of the items the vehicle holds, as MissionItem.fields, as many as items.
+        items (list[MissionItem]): The new items.
+
+    Returns:
+        list[tuple[int, int]]: The first and last index of each range, in order, empty if nothing changed.
+    """
+    ranges: list[tuple[int, int]] = []
+    for index, item in enumerate(items):
+        if item.fields == uploaded[index]:
+            continue
+        if ranges and index - ranges[-1][1] <= 2:
+            ranges[-1] = (ranges[-1][0], index)
+        else:
+            ranges.append((index, index))
+    return ranges
@@ -0,0 +1,293 @@
+# process_reader.py
+# version: 1.1.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+"""
+Read and decode a MAVLink connection in a child process, so decoding does not compete with the event loop for the GIL.
+
+The child is forked with the connection and only ever reads from it, the parent keeps writing to it.
+A MessageFilter installed on the connection before the fork also filters in the child.
+Each decoded message becomes a compact marshal record (message id, type, source, sequence, checksum, fields and optionally the frame),
+written to a single producer single consumer ring in anonymous shared memory:
+
+    [0:8] bytes written by the child (u64), [8:16] bytes consumed by the parent (u64), records from RING_OFFSET:
+    record: length (u32) then payload, or WRAP (u32) where the rest of the ring is skipped.
+
+After each batch the child writes one byte to a pipe. The parent reads the ring whenever the pipe is readable,
+so both sides cross a system call, and with it a memory barrier, between writing and reading the ring.
+"""
+
+import marshal
+import mmap
+import multiprocessing
+import os
+import select
+import struct
+import time
+
+from pymavlink import mavutil
+
+from MAVez.translate_message import register_extractor, translate_fields
+
+_POSITION = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+WRAP = 0xFFFFFFFF
+RING_OFFSET = 64
+
+
+class ProcessMessage:
+    """
+    A message decoded by the reader process, mimicking the pymavlink message API used by the Controller.
+    Fields are available as attributes, like on a pymavlink message.
+
+    Args:
+        record (tuple): (message id, type, source system, source component, sequence, checksum, fields, frame) as sent by the reader process.
+    """
+
+    __slots__ = ("_msgid", "_type", "_src_system", "_src_component", "_seq", "_crc", "fields", "_msgbuf")
+
+    def __init__(self, record: tuple):
+        self._msgid, self._type, self._src_system, self._src_component, self._seq, self._crc, self.fields, self._msgbuf = record
+
+    def __getattr__(self, name: str):
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def get_type(self) -> str:
+        return self._type
+
+    def get_msgId(self) -> int:
+        return self._msgid
+
+    def get_srcSystem(self) -> int:
+        return self._src_system
+
+    def get_srcComponent(self) -> int:
+        return self._src_component
+
+    def get_seq(self) -> int:
+        return self._seq
+
+    def get_crc(self) -> int:
+        return self._crc
+
+    def get_fieldnames(self) -> list[str]:
+        return list(self.fields)
+
+    def get_msgbuf(self) -> bytes:
+        """
+        The original MAVLink frame.
+
+        Returns:
+            bytes: The frame, or b"" if the reader process was not asked to forward frames.
+        """
+        return self._msgbuf
+
+    def to_dict(self) -> dict:
+        return {"mavpackettype": self._type, **self.fields}
+
+
+# records already carry their fields
+register_extractor(ProcessMessage, lambda msg: msg.fields)
+
+
+class ProcessReader:
+    """
+    Fork a child process reading and decoding a connection, and collect its messages in the parent.
+
+    Args:
+        master (mavfile): The pymavlink connection. The parent must not read from it while the reader runs.
+        ring_size (int): Bytes of the shared ring. Default is 4 MiB.
+        with_frames (bool): Whether records include the original frame, needed for raw publishing and shared state. Default is False.
+
+    Raises:
+        ValueError: If the platform cannot fork.
+    """
+
+    READ_TIMEOUT = 0.5  # seconds the child blocks on a silent link before checking on the parent
+    MAX_BATCH_SIZE = 256  # most messages decoded before notifying the parent
+    READ_SIZE = 65536  # bytes read per wakeup on tcp, udp and serial links
+
+    def __init__(self, master, ring_size: int = 4 * 1024 * 1024, with_frames: bool = False):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise ValueError("The process reader needs the fork start method")
+        self.master = master
+        self.capacity = ring_size
+        self.with_frames = with_frames
+        self.__ring = mmap.mmap(-1, RING_OFFSET + ring_size)
+        self.__buffer = memoryview(self.__ring)
+        self.__tail = 0
+        self.__notify_read, self.__notify_write = os.pipe()
+        self.__process = None
+
+    def fileno(self) -> int:
+        """
+        The pipe readable whenever the child has written a batch, for loop.add_reader.
+
+        Returns:
+            int: The read end of the notification pipe.
+        """
+        return self.__notify_read
+
+    def start(self):
+        """
+        Fork the reader process.
+
+        Returns:
+            None
+        """
+        self.__process = multiprocessing.get_context("fork").Process(target=self.__run, name="MAVez reader", daemon=True)
+        self.__process.start()
+        os.close(self.__notify_write)
+
+    # child side
+
+    def __run(self):
+        os.close(self.__notify_read)
+        parent = os.getppid()
+        head = 0
+        try:
+            while os.getppid() == parent:
+                written = 0
+                for mav_msg in self.__receive():
+                    msgid = mav_msg.get_msgId()
+                    if msgid < 0:
+                        continue
+                    record = (
+                        msgid,
+                        mav_msg.get_type(),
+                        mav_msg.get_srcSystem(),
+                        mav_msg.get_srcComponent(),
+                        mav_msg.get_seq(),
+                        mav_msg.get_crc(),
+                        translate_fields(mav_msg),
+                        bytes(mav_msg.get_msgbuf()) if self.with_frames else b"",
+                    )
+                    head = self.__write(head, marshal.dumps(record), parent)
+                    written += 1
+                if written:
+                    os.write(self.__notify_write, b"\0")
+        except (BrokenPipeError, KeyboardInterrupt):
+            pass
+        finally:
+            os._exit(0)
+
+    def __receive(self) -> list:
+        """
+        Wait up to READ_TIMEOUT for messages. Tcp, udp and serial links are read in large chunks and parsed at once,
+        other links go through recv_match.
+
+        Raises:
+            BrokenPipeError: If the connection was closed.
+
+        Returns:
+            list: The decoded pymavlink messages, oldest first.
+        """
+        master = self.master
+        if isinstance(master, (mavutil.mavtcp, mavutil.mavudp, mavutil.mavserial)) and master.fd is not None:
+            if not select.select([master.fd], [], [], self.READ_TIMEOUT)[0]:
+                return []
+            data = master.recv(self.READ_SIZE)
+            if not data:
+                if isinstance(master, mavutil.mavudp):
+                    return []
+                raise BrokenPipeError
+            if master.first_byte:
+                master.auto_mavlink_version(data)
+            return master.mav.parse_buffer(data) or []
+
+        mav_msgs = []
+        mav_msg = master.recv_match(blocking=True, timeout=self.READ_TIMEOUT)
+        while mav_msg is not None:
+            mav_msgs.append(mav_msg)
+            if len(mav_msgs) >= self.MAX_BATCH_SIZE:
+                break
+            mav_msg = master.recv_msg()
+        return mav_msgs
+
+    def __write(self, head: int, payload: bytes, parent: int) -> int:
+        """
+        Write a record to the ring, waiting for the parent to make room if it is full.
+
+        Args:
+            head (int): Bytes written so far.
+            payload (bytes): The marshalled record.
+            parent (int): Process id of the parent, waiting stops if it exits.
+
+        Returns:
+            int: Bytes written after this record.
+        """
+        buffer = self.__buffer
+        capacity = self.capacity
+        position = head % capacity
+        needed = _LENGTH.size + len(payload)
+        skip = capacity - position if capacity - position < needed else 0
+        while capacity - (head - _POSITION.unpack_from(buffer, 8)[0]) < skip + needed:
+            if os.getppid() != parent:
+                raise BrokenPipeError
+            # let the parent know there is data, then wait for it to consume
+            os.write(self.__notify_write, b"\0")
+            time.sleep(0.001)
+        if skip:
+            if skip >= _LENGTH.size:
+                _LENGTH.pack_into(buffer, RING_OFFSET + position, WRAP)
+            head += skip
+            position = 0
+        _LENGTH.pack_into(buffer, RING_OFFSET + position, len(payload))
+        start = RING_OFFSET + position + _LENGTH.size
+        buffer[start:start + len(payload)] = payload
+        head += needed
+        _POSITION.pack_into(buffer, 0, head)
+        return head
+
+    # parent side
+
+    def read(self) -> list[ProcessMessage] | None:
+        """
+        Collect every message the child has written so far. Call when fileno() is readable.
+
+        Returns:
+            list[ProcessMessage] | None: The messages, oldest first, or None if the reader process has exited.
+        """
+        if not os.read(self.__notify_read, 4096):
+            return None
+        buffer = self.__buffer
+        capacity = self.capacity
+        head = _POSITION.unpack_from(buffer, 0)[0]
+        tail = self.__tail
+        messages = []
+        while tail < head:
+            position = tail % capacity
+            if capacity - position < _LENGTH.size:
+                tail += capacity - position
+                continue
+            length = _LENGTH.unpack_from(buffer, RING_OFFSET + position)[0]
+            if length == WRAP:
+                tail += capacity - position
+                continue
+            start = RING_OFFSET + position + _LENGTH.size
+            messages.append(ProcessMessage(marshal.loads(buffer[start:start + length])))
+            tail += _LENGTH.size + length
+        self.__tail = tail
+        _POSITION.pack_into(buffer, 8, tail)
+        return messages
+
+    def close(self):
+        """
+        Stop the reader process and release the ring.
+
+        Returns:
+            None
+        """
+        if self.__process is not None:
+            self.__process.terminate()
+            self.__process.join(1)
+            self.__process = None
+        os.close(self.__notify_read)
+        self.__buffer.release()
+        self.__ring.close()
@@ -0,0 +1,106 @@
+# publish_batch.py
+# version: 1.0.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+import asyncio
+from typing import Callable
+
+from lingo import Message
+
+
+class PublishBatcher:
+    """
+    Coalesce outgoing messages into one multi-message frame per batch, so the publisher makes one send per batch instead of one per message.
+    A batch is emitted once it holds max_size messages or max_delay seconds after its first message, whichever comes first.
+
+    The batch Message carries every message's topic, header and payload size in its header under "messages", and their payloads joined in its payload.
+    Split it back into the original messages with unbatch_message.
+
+    Args:
+        topic (str): The topic batches are published on.
+        max_size (int): Most messages per batch.
+        max_delay (float): Most seconds a message waits for its batch to fill.
+        emit (Callable[[Message], None]): Called with each batch to publish.
+
+    Raises:
+        ValueError: If max_size is not positive or max_delay is negative.
+    """
+
+    def __init__(self, topic: str, max_size: int, max_delay: float, emit: Callable[[Message], None]):
+        if max_size < 1:
+            raise ValueError("Publish batch size must be at least 1")
+        if max_delay < 0:
+            raise ValueError("Publish batch delay must not be negative")
+        self.topic = topic
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.emit = emit
+        self.__messages: list[Message] = []
+        self.__handle: asyncio.TimerHandle | None = None
+
+    def add(self, message: Message):
+        """
+        Add a message to the current batch, emitting the batch if it is full.
+
+        Args:
+            message (Message): The lingo Message to publish.
+
+        Returns:
+            None
+        """
+        self.__messages.append(message)
+        if len(self.__messages) >= self.max_size:
+            self.flush()
+        elif self.__handle is None:
+            loop = asyncio.get_running_loop()
+            self.__handle = loop.call_at(loop.time() + self.max_delay, self.flush)
+
+    def flush(self):
+        """
+        Emit the current batch, if any.
+
+        Returns:
+            None
+        """
+        if self.__handle is not None:
+            self.__handle.cancel()
+            self.__handle = None
+        if not self.__messages:
+            return
+        messages, self.__messages = self.__messages, []
+        header = {"messages": [{"topic": message.topic, "header": message.header, "size": len(message.payload)} for message in messages]}
+        self.emit(Message(topic=self.topic, header=header, payload=b"".join(message.payload for message in messages)))
+
+    def close(self):
+        """
+        Cancel the pending emit and discard the current batch.
+
+        Returns:
+            None
+        """
+        if self.__handle is not None:
+            self.__handle.cancel()
+            self.__handle = None
+        self.__messages.clear()
+
+
+def unbatch_message(message: Message) -> list[Message]:
+    """
+    Split a batch published by PublishBatcher back into its messages.
+
+    Args:
+        message (Message): The batch Message received by a subscriber.
+
+    Returns:
+        list[Message]: The batched messages, in the order they were published.
+    """
+    messages = []
+    offset = 0
+    for entry in message.header["messages"]:
+        size = entry["size"]
+        messages.append(Message(topic=entry["topic"], header=entry["header"], payload=message.payload[offset:offset + size]))
+        offset += size
+    return messages
@@ -0,0 +1,97 @@
+# publish_queue.py
+# version: 1.0.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+import asyncio
+from collections import defaultdict
+
+from lingo import Message
+
+
+class PublishQueue(asyncio.Queue):
+    """
+    Bounded outbound queue for the lingo Publisher that never blocks the producer.
+    When the queue is full a message is dropped according to the policy and counted instead.
+
+    Policies:
+        "drop_oldest": discard the oldest queued message to make room for the new one.
+        "drop_newest": discard the new message.
+        "coalesce": keep at most one message per topic, a new message replaces the queued one of its topic in place.
+            maxsize then bounds the number of topics queued, and a new topic on a full queue discards the oldest.
+
+    Args:
+        maxsize (int): Most messages queued. 0 leaves the queue unbounded. Default is 1024.
+        policy (str): The drop policy. Default is "drop_oldest".
+
+    Raises:
+        ValueError: If the policy is unknown.
+    """
+
+    POLICIES = ("drop_oldest", "drop_newest", "coalesce")
+
+    def __init__(self, maxsize: int = 1024, policy: str = "drop_oldest"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown publish queue policy: {policy}")
+        self.policy = policy
+        self.dropped = 0  # messages discarded or replaced before publishing
+        self.dropped_by_topic: defaultdict[str, int] = defaultdict(int)
+        super().__init__(maxsize)
+
+    # storage hooks of asyncio.Queue, coalescing keeps an insertion ordered dict of topic to message
+    def _init(self, maxsize):
+        if self.policy == "coalesce":
+            self._queue = {}
+        else:
+            super()._init(maxsize)
+
+    def _put(self, item):
+        if self.policy == "coalesce":
+            self._queue[item.topic] = item
+        else:
+            super()._put(item)
+
+    def _get(self):
+        if self.policy == "coalesce":
+            return self._queue.pop(next(iter(self._queue)))
+        return super()._get()
+
+    def __drop(self, message: Message):
+        self.dropped += 1
+        self.dropped_by_topic[message.topic] += 1
+
+    def put_nowait(self, item: Message):
+        """
+        Queue a message for publishing, dropping one if the queue is full.
+
+        Args:
+            item (Message): The lingo Message to publish.
+
+        Returns:
+            None
+        """
+        if self.policy == "coalesce" and item.topic in self._queue:
+            self.__drop(self._queue[item.topic])
+            self._queue[item.topic] = item
+            return
+        if self.full():
+            if self.policy == "drop_newest":
+                self.__drop(item)
+                return
+            self.__drop(self._get())
+            self.task_done()
+        super().put_nowait(item)
+
+    async def put(self, item: Message):
+        """
+        Queue a message for publishing. Never waits, see put_nowait.
+
+        Args:
+            item (Message): The lingo Message to publish.
+
+        Returns:
+            None
+        """
+        self.put_nowait(item)
@@ -0,0 +1,103 @@
+# publish_rate.py
+# version: 1.0.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+import asyncio
+from typing import Callable
+
+from MAVez.translate_message import LazyMessage
+
+
+class PublishRateLimiter:
+    """
+    Decimate published message types to a maximum rate, always publishing the freshest sample.
+    A message due immediately is emitted as it arrives. Otherwise it is held until the type's next slot,
+    where only the latest held message of the type is emitted. Messages are not translated until emitted.
+
+    Args:
+        rates (dict[str, float | None]): Maximum publish rate in Hz per message type name, "*" for every other type.
+            A rate of 0 never publishes the type and None publishes every message. Types without an entry and without "*" publish every message.
+        emit (Callable[[LazyMessage], None]): Called with each message to publish.
+
+    Raises:
+        ValueError: If a rate is negative.
+    """
+
+    def __init__(self, rates: dict[str, float | None], emit: Callable[[LazyMessage], None]):
+        for msg_type, rate in rates.items():
+            if rate is not None and rate < 0:
+                raise ValueError(f"Publish rate for {msg_type} must not be negative")
+        self.intervals = {msg_type: self.__interval(rate) for msg_type, rate in rates.items() if msg_type != "*"}
+        self.default_interval = self.__interval(rates.get("*"))
+        self.emit = emit
+        self.__next_time: dict[str, float] = {}
+        self.__pending: dict[str, LazyMessage] = {}
+        self.__handles: dict[str, asyncio.TimerHandle] = {}
+
+    @staticmethod
+    def __interval(rate: float | None) -> float | None:
+        # None publishes everything, 0 is never, otherwise seconds between publishes
+        if rate is None:
+            return None
+        return 0.0 if rate == 0 else 1 / rate
+
+    def offer(self, msg_type: str, msg: LazyMessage):
+        """
+        Publish a received message now, hold it for the type's next slot, or drop it.
+
+        Args:
+            msg_type (str): The MAVLink message type name.
+            msg (LazyMessage): The received message.
+
+        Returns:
+            None
+        """
+        interval = self.intervals.get(msg_type, self.default_interval)
+        if interval is None:
+            self.emit(msg)
+            return
+        if interval == 0.0:
+            return
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if msg_type not in self.__handles and now >= self.__next_time.get(msg_type, 0.0):
+            self.__next_time[msg_type] = now + interval
+            self.emit(msg)
+            return
+        # coalesce to the latest message until the next slot
+        self.__pending[msg_type] = msg
+        if msg_type not in self.__handles:
+            self.__handles[msg_type] = loop.call_at(self.__next_time[msg_type], self.__flush, msg_type, interval)
+
+    def __flush(self, msg_type: str, interval: float):
+        """
+        Emit the latest held message of a type at its slot.
+
+        Args:
+            msg_type (str): The MAVLink message type name.
+            interval (float): Seconds between publishes of the type.
+
+        Returns:
+            None
+        """
+        del self.__handles[msg_type]
+        msg = self.__pending.pop(msg_type, None)
+        if msg is not None:
+            self.__next_time[msg_type] = asyncio.get_running_loop().time() + interval
+            self.emit(msg)
+
+    def close(self):
+        """
+        Cancel scheduled publishes and discard held messages.
+
+        Returns:
+            None
+        """
+        for handle in self.__handles.values():
+            handle.cancel()
+        self.__handles.clear()
+        self.__pending.clear()
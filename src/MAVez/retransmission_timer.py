@@ -0,0 +1,53 @@
+# retransmission_timer.py
+# version: 1.0.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+"""
+Retransmission timeout for request/response transfers with the vehicle, computed from measured round trip times as TCP does (RFC 6298).
+"""
+
+
+class RetransmissionTimer:
+    """
+    Smoothed round trip time and the timeout after which an unanswered message is sent again.
+    Only sample messages sent once, since the answer to a retransmitted message could belong to either copy (Karn's algorithm).
+    """
+
+    INITIAL_RTO = 1.0  # seconds, until a round trip is measured
+    MIN_RTO = 0.2  # seconds, below this jitter from telemetry sharing the link causes needless retransmissions
+    MAX_RTO = 3.0  # seconds
+
+    def __init__(self):
+        self.rto = self.INITIAL_RTO
+        self.srtt: float | None = None  # smoothed round trip time in seconds
+        self.rttvar = 0.0
+
+    def sample(self, rtt: float):
+        """
+        Update the timeout with a measured round trip time.
+
+        Args:
+            rtt (float): Seconds from sending a message to receiving the vehicle's answer.
+
+        Returns:
+            None
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.rto = min(self.MAX_RTO, max(self.MIN_RTO, self.srtt + 4 * self.rttvar))
+
+    def backoff(self):
+        """
+        Double the timeout after a retransmission, until the next sample.
+
+        Returns:
+            None
+        """
+        self.rto = min(self.MAX_RTO, self.rto * 2)
@@ -0,0 +1,238 @@
+# shared_state.py
+# version: 1.1.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+"""
+A memory-mapped block holding the latest message of selected types, for processes on the same machine as the Controller.
+
+Layout (little endian):
+    header: magic b"MVZS", layout version (u16), slot count (u16), slot size (u32)
+    directory: message id (u32) per slot
+    slots, 8 byte aligned, each: seqlock (u32), messages written (u32), receive time (f64, time.time()), frame length (u16), padding, frame (MAX_FRAME bytes)
+
+Each slot holds the raw MAVLink frame of the latest message of its type, behind a seqlock.
+The writer makes the seqlock odd, writes the slot and makes it even again.
+A reader copies the slot and retries if the seqlock was odd or changed in the meantime, so neither side ever waits on a lock.
+A reader that keeps finding the slot mid-write yields to the writer, and gives up after READ_TIMEOUT in case the writer died mid-write.
+"""
+
+import mmap
+import struct
+import time
+
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from MAVez.enums.mav_message import MAVMessage
+from MAVez.translate_message import translate_fields
+
+MAGIC = b"MVZS"
+LAYOUT_VERSION = 1
+MAX_FRAME = 280  # longest MAVLink 2 frame, including the signature
+
+_HEADER = struct.Struct("<4sHHI")
+_MSGID = struct.Struct("<I")
+_LOCK = struct.Struct("<I")
+_SLOT = struct.Struct("<IdH6x")  # follows the seqlock
+_FRAME_OFFSET = _LOCK.size + _SLOT.size
+SLOT_SIZE = _FRAME_OFFSET + MAX_FRAME
+
+
+def _slots_offset(slot_count: int) -> int:
+    directory_end = _HEADER.size + _MSGID.size * slot_count
+    return (directory_end + 7) & ~7
+
+
+class SharedStateWriter:
+    """
+    Create the shared state block and keep it updated with received messages. Owned by the Controller.
+
+    Args:
+        path (str): File backing the block, e.g. under /dev/shm. Created or overwritten.
+        message_types (list[MAVMessage]): The message types kept in the block.
+
+    Raises:
+        ValueError: If no message type is given.
+    """
+
+    DEFAULT_TYPES = [MAVMessage.HEARTBEAT, MAVMessage.GLOBAL_POSITION_INT, MAVMessage.ATTITUDE]
+
+    def __init__(self, path: str, message_types: list[MAVMessage]):
+        if not message_types:
+            raise ValueError("Shared state needs at least one message type")
+        self.path = path
+        self.message_types = list(dict.fromkeys(message_types))
+        slots_offset = _slots_offset(len(self.message_types))
+        size = slots_offset + SLOT_SIZE * len(self.message_types)
+
+        with open(path, "wb+") as file:
+            file.truncate(size)
+            self.__map = mmap.mmap(file.fileno(), size)
+        self.__buffer = memoryview(self.__map)
+        _HEADER.pack_into(self.__buffer, 0, MAGIC, LAYOUT_VERSION, len(self.message_types), SLOT_SIZE)
+        # per type name: [slot offset, seqlock, messages written]
+        self.__slots: dict[str, list[int]] = {}
+        for index, message_type in enumerate(self.message_types):
+            _MSGID.pack_into(self.__buffer, _HEADER.size + _MSGID.size * index, message_type.value)
+            self.__slots[message_type.name] = [slots_offset + SLOT_SIZE * index, 0, 0]
+
+    def update(self, msg_type: str, mav_msg):
+        """
+        Write a received message into its slot, if its type is kept.
+
+        Args:
+            msg_type (str): The MAVLink message type name.
+            mav_msg (MAVLink_message): The received pymavlink message.
+
+        Returns:
+            None
+        """
+        slot = self.__slots.get(msg_type)
+        if slot is None:
+            return
+        frame = mav_msg.get_msgbuf()
+        length = len(frame)
+        if length > MAX_FRAME:
+            return
+        offset, lock, count = slot
+        buffer = self.__buffer
+        _LOCK.pack_into(buffer, offset, (lock + 1) & 0xFFFFFFFF)
+        count = (count + 1) & 0xFFFFFFFF
+        _SLOT.pack_into(buffer, offset + _LOCK.size, count, time.time(), length)
+        buffer[offset + _FRAME_OFFSET:offset + _FRAME_OFFSET + length] = frame
+        lock = (lock + 2) & 0xFFFFFFFF
+        _LOCK.pack_into(buffer, offset, lock)
+        slot[1] = lock
+        slot[2] = count
+
+    def close(self):
+        """
+        Unmap the block. The backing file is left for readers still attached.
+
+        Returns:
+            None
+        """
+        self.__buffer.release()
+        self.__map.close()
+
+
+class SharedStateReader:
+    """
+    Read the latest messages from a shared state block written by a Controller, from any process.
+
+    Example:
+        with SharedStateReader("/dev/shm/mavez_state") as state:
+            position = state.read(MAVMessage.GLOBAL_POSITION_INT)
+
+    Args:
+        path (str): File backing the block.
+
+    Raises:
+        ValueError: If the file is not a shared state block of this layout version.
+    """
+
+    # copies of a slot retried back to back before yielding to the writer between retries
+    SPIN_RETRIES = 100
+    # seconds a slot may stay mid-write before the writer is taken for dead
+    READ_TIMEOUT = 0.1
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__buffer = memoryview(self.__map)
+        magic, version, slot_count, slot_size = _HEADER.unpack_from(self.__buffer, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION or slot_size != SLOT_SIZE:
+            self.close()
+            raise ValueError(f"{path} is not a MAVez shared state block (version {LAYOUT_VERSION})")
+        slots_offset = _slots_offset(slot_count)
+        self.__offsets: dict[int, int] = {}
+        for index in range(slot_count):
+            msgid = _MSGID.unpack_from(self.__buffer, _HEADER.size + _MSGID.size * index)[0]
+            self.__offsets[msgid] = slots_offset + SLOT_SIZE * index
+        self.__parser = mavlink2.MAVLink(None)
+
+    @property
+    def message_types(self) -> list[MAVMessage]:
+        """
+        The message types kept in the block.
+
+        Returns:
+            list[MAVMessage]: The message types, in slot order.
+        """
+        return [MAVMessage(msgid) for msgid in self.__offsets]
+
+    def read_frame(self, message_type: MAVMessage) -> tuple[bytes, int, float] | None:
+        """
+        Take a consistent snapshot of the slot of a message type.
+
+        Args:
+            message_type (MAVMessage): The message type to read.
+
+        Raises:
+            KeyError: If the message type is not kept in the block.
+            TimeoutError: If no consistent copy could be taken within READ_TIMEOUT.
+
+        Returns:
+            tuple[bytes, int, float] | None: The raw MAVLink frame, the number of messages of the type written so far and the time.time() it was received,
+                or None if no message of the type has been received yet.
+        """
+        offset = self.__offsets[message_type.value]
+        buffer = self.__buffer
+        retries = 0
+        deadline = None
+        while True:
+            lock = _LOCK.unpack_from(buffer, offset)[0]
+            if not lock & 1:
+                count, timestamp, length = _SLOT.unpack_from(buffer, offset + _LOCK.size)
+                frame = bytes(buffer[offset + _FRAME_OFFSET:offset + _FRAME_OFFSET + length])
+                if _LOCK.unpack_from(buffer, offset)[0] == lock:
+                    break
+            retries += 1
+            if retries >= self.SPIN_RETRIES:
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.READ_TIMEOUT
+                elif now >= deadline:
+                    raise TimeoutError(f"Shared state slot of {message_type.name} stayed mid-write for {self.READ_TIMEOUT} seconds")
+                # let the writer, possibly on this core, finish its write
+                time.sleep(0)
+        if lock == 0:
+            return None
+        return frame, count, timestamp
+
+    def read(self, message_type: MAVMessage) -> dict | None:
+        """
+        Read the latest message of a type.
+
+        Args:
+            message_type (MAVMessage): The message type to read.
+
+        Raises:
+            KeyError: If the message type is not kept in the block.
+            TimeoutError: If no consistent copy could be taken within READ_TIMEOUT.
+
+        Returns:
+            dict | None: Dictionary representation of the latest MAVLink message, or None if none has been received yet.
+        """
+        snapshot = self.read_frame(message_type)
+        if snapshot is None:
+            return None
+        return translate_fields(self.__parser.decode(bytearray(snapshot[0])))
+
+    def close(self):
+        """
+        Unmap the block.
+
+        Returns:
+            None
+        """
+        self.__buffer.release()
+        self.__map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,11 +1,105 @@
 # translate_message.py
-# version: 2.1.0
+# version: 2.5.2
 # Original Author: Theodore Tasman
 # Creation Date: 2025-09-24
-# Last Modified: 2026-03-21
+# Last Modified: 2026-10-18
 # Organization: PSU UAS
 
+from typing import Callable
+
 from lingo import Message
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+# per message class: extractor returning the field dict of a message
+_extractors: dict[type, Callable[..., dict]] = {}
+# per (topic prefix, message type): full topic string
+_topics: dict[tuple[str, str], str] = {}
+# parser for raw frame payloads, MAVLink 2 dialects also parse MAVLink 1 frames
+_raw_parser = None
+
+def _compile_extractor(csvm) -> Callable[..., dict]:
+    """
+    Build and cache the field extractor for the class of a CSVMessage object.
+    pymavlink stores the fields as instance attributes, so the extractor copies the instance dict in one call
+    and deletes the bookkeeping attributes (_header, _crc, _timestamp...) found on the first message of the class, instead of a getattr call per field.
+    Extractors are keyed by class rather than message id since MAVLink 1 and 2 dialects define different fields for the same id.
+
+    Args:
+        csvm (CSVMessage): A message of the class to compile.
+
+    Returns:
+        Callable[..., dict]: A function mapping a message of this class to its field dict.
+    """
+    fields = tuple(csvm.get_fieldnames())
+    attributes = getattr(csvm, "__dict__", None)
+    if attributes is None or not all(field in attributes for field in fields):
+        # fields are not plain attributes, read them one by one
+        extractor = lambda msg: {field: getattr(msg, field) for field in fields}
+    else:
+        field_set = set(fields)
+        others = tuple(name for name in attributes if name not in field_set)
+        count = len(fields)
+
+        def extractor(msg) -> dict:
+            values = msg.__dict__.copy()
+            try:
+                for name in others:
+                    del values[name]
+            except KeyError:
+                pass
+            if len(values) != count:
+                # bookkeeping attributes differ from the first message's, e.g. read by another reader mode
+                return {field: values[field] for field in fields}
+            return values
+
+    _extractors[type(csvm)] = extractor
+    return extractor
+
+def register_extractor(message_class: type, extractor: Callable[..., dict]):
+    """
+    Use a custom field extractor for a message class, e.g. for message-like records that already carry their fields.
+
+    Args:
+        message_class (type): The class of the messages.
+        extractor (Callable[..., dict]): A function mapping a message of this class to its field dict.
+
+    Returns:
+        None
+    """
+    _extractors[message_class] = extractor
+
+def translate_topic(msg_type: str, topic: str = "") -> str:
+    """
+    Get the publishing topic for a message type.
+
+    Args:
+        msg_type (str): The MAVLink message type name.
+        topic (str): The topic prefix for the messaging system. Default is "".
+
+    Returns:
+        str: The topic the message type is published on.
+    """
+    key = (topic, msg_type)
+    full_topic = _topics.get(key)
+    if full_topic is None:
+        full_topic = f"{topic}_{msg_type}" if topic else msg_type
+        _topics[key] = full_topic
+    return full_topic
+
+def translate_fields(csvm) -> dict:
+    """
+    Convert the fields of a CSVMessage object to a Python dictionary.
+
+    Args:
+        csvm (CSVMessage): The CSVMessage object to convert.
+
+    Returns:
+        dict: Field names mapped to their values.
+    """
+    extractor = _extractors.get(type(csvm))
+    if extractor is None:
+        extractor = _compile_extractor(csvm)
+    return extractor(csvm)
 
 def translate_message(csvm, topic: str = "") -> Message | None:
     """
@@ -20,8 +114,79 @@ def translate_message(csvm, topic: str = "") -> Message | None:
     if csvm.get_type().startswith('UNKNOWN'):
         return None
 
-    fields = csvm.get_fieldnames()
+    data = translate_fields(csvm)
+
+    return Message(topic=translate_topic(csvm.get_type(), topic), header=data)
+
+def raw_frame_message(csvm, topic: str = "") -> Message:
+    """
+    Wrap the original MAVLink frame of a received CSVMessage in a lingo Message, without extracting any fields.
+
+    Args:
+        csvm (CSVMessage): The received CSVMessage object.
+        topic (str): The topic prefix for the messaging system. Default is "".
+
+    Returns:
+        Message: a lingo Message with an empty header and the frame bytes as payload.
+    """
+    return Message(topic=translate_topic(csvm.get_type(), topic), header={}, payload=bytes(csvm.get_msgbuf()))
+
+def decode_raw_message(message: Message, parser=None) -> list:
+    """
+    Decode the MAVLink frames carried in the payload of a raw frame Message, one or many.
+
+    Args:
+        message (Message): A lingo Message published in raw frame mode.
+        parser (MAVLink | None): The pymavlink parser to decode with. Default is None, which uses the MAVLink 2 ardupilotmega dialect.
+
+    Returns:
+        list: The decoded pymavlink messages, in the order they were received.
+    """
+    global _raw_parser
+    if parser is None:
+        if _raw_parser is None:
+            _raw_parser = mavlink2.MAVLink(None)
+        parser = _raw_parser
+    return parser.parse_buffer(message.payload) or []
+
+
+class LazyMessage:
+    """
+    A received CSVMessage that is only translated when it is read.
+
+    Args:
+        csvm (CSVMessage): The received CSVMessage object.
+        topic (str): The topic prefix for the messaging system. Default is "".
+    """
+
+    __slots__ = ("raw", "topic", "_header", "_message")
+
+    def __init__(self, csvm, topic: str = ""):
+        self.raw = csvm
+        self.topic = topic
+        self._header: dict | None = None
+        self._message: Message | None = None
+
+    @property
+    def header(self) -> dict:
+        """
+        The message fields, translated on first access.
+
+        Returns:
+            dict: Field names mapped to their values.
+        """
+        if self._header is None:
+            self._header = translate_fields(self.raw)
+        return self._header
 
-    data = {field: getattr(csvm, field) for field in fields}
+    @property
+    def message(self) -> Message:
+        """
+        The lingo Message for publishing, built on first access.
 
-    return Message(topic=f"{topic}_{csvm.get_type()}" if topic else csvm.get_type(), header=data)
\ No newline at end of file
+        Returns:
+            Message: a lingo Message object containing the data from the CSVMessage.
+        """
+        if self._message is None:
+            self._message = Message(topic=translate_topic(self.raw.get_type(), self.topic), header=self.header)
+        return self._message
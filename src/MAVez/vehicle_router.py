@@ -0,0 +1,143 @@
+# vehicle_router.py
+# version: 1.0.0
+# Author: Theodore Tasman
+# Creation Date: 2026-10-18
+# Last Modified: 2026-10-18
+# Organization: PSU UAS
+
+from MAVez.controller import Controller
+from MAVez.flight_controller import FlightController
+
+
+class VehicleRouter(Controller):
+    """
+    Controller owning one link shared by several vehicles (a telemetry radio or MAVLink router carrying a swarm), demultiplexing it into per-vehicle controller views.
+
+    Each view, by default a FlightController, keeps its own sequence counters, history, waiters and streams, and addresses its commands to its vehicle.
+    The router reads the link and hands each message to the view of its (system id, component id) source, so the dispatch cost per message does not grow with the number of vehicles.
+    Messages from sources without a view are handled by the router itself, as a Controller addressing every system.
+    Views publish through the router's publisher, each under its own topic prefix.
+
+    Example:
+        router = await VehicleRouter.connect("udp:0.0.0.0:14550", reader="asyncio", batch=True, logger=logger)
+        alpha = router.vehicle(1)
+        bravo = router.vehicle(2)
+        await router.start()
+        await asyncio.gather(alpha.arm(), bravo.arm())
+
+    Args:
+        connection_string (str): The connection string of the shared link. Default is "tcp:127.0.0.1:5762" used for SITL.
+        **kwargs: The other arguments of Controller, configuring the link, its reader, the message filter and the publisher shared by the views.
+
+    Raises:
+        ConnectionError: If the connection fails.
+    """
+
+    def __init__(self, connection_string: str = "tcp:127.0.0.1:5762", **kwargs) -> None:
+        super().__init__(connection_string, **kwargs)
+        self.__logger = kwargs.get("logger")
+        # view per source, keyed by system id << 8 | component id
+        self.__views: dict[int, Controller] = {}
+        self.__unrouted_sources: set[int] = set()
+
+    @property
+    def vehicles(self) -> dict[tuple[int, int], Controller]:
+        """
+        The views created so far.
+
+        Returns:
+            dict[tuple[int, int], Controller]: The view per (system id, component id).
+        """
+        return {(source >> 8, source & 0xFF): view for source, view in self.__views.items()}
+
+    @property
+    def unrouted_sources(self) -> set[tuple[int, int]]:
+        """
+        Sources that sent a heartbeat but have no view, e.g. vehicles joining the link.
+
+        Returns:
+            set[tuple[int, int]]: The (system id, component id) of each source.
+        """
+        return {(source >> 8, source & 0xFF) for source in self.__unrouted_sources}
+
+    def vehicle(self, system: int, component: int = 1, controller_class: type[Controller] = FlightController, **kwargs) -> Controller:
+        """
+        Get the view of a vehicle, creating it on first use. Messages received before the view was created are not in its history.
+
+        Args:
+            system (int): System id of the vehicle.
+            component (int): Component id of the vehicle's autopilot. Default is 1.
+            controller_class (type[Controller]): Class of a new view. Default is FlightController.
+            **kwargs: Other arguments of a new view, e.g. publish_types or history_depths. The link, publisher and filter arguments do not apply to views.
+                Its message_topic defaults to "VEHICLE_<system>_<component>" after the router's topic, and its logger to the router's.
+
+        Raises:
+            ValueError: If the system or component id is out of range.
+
+        Returns:
+            Controller: The view of the vehicle.
+        """
+        if not 0 < system < 256 or not 0 <= component < 256:
+            raise ValueError(f"Invalid vehicle source: system {system} component {component}")
+        source = system << 8 | component
+        view = self.__views.get(source)
+        if view is None:
+            topic = f"VEHICLE_{system}_{component}"
+            kwargs.setdefault("message_topic", f"{self.message_topic}_{topic}" if self.message_topic else topic)
+            kwargs.setdefault("logger", self.__logger)
+            view = controller_class(target_system=system, target_component=component, router=self, **kwargs)
+            self.__views[source] = view
+            self.__unrouted_sources.discard(source)
+            self.logger.info(f"[Router] Routing system {system} component {component}")
+        return view
+
+    def dispatch(self, mav_msgs: list):
+        """
+        Hand each message to the view of its source, one batch per view, and handle messages from other sources as the router.
+
+        Args:
+            mav_msgs (list): The pymavlink messages received, oldest first.
+
+        Returns:
+            None
+        """
+        views = self.__views
+        batches: dict[int, list] = {}
+        unrouted = []
+        for mav_msg in mav_msgs:
+            source = mav_msg.get_srcSystem() << 8 | mav_msg.get_srcComponent()
+            batch = batches.get(source)
+            if batch is not None:
+                batch.append(mav_msg)
+            elif source in views:
+                batches[source] = [mav_msg]
+            else:
+                unrouted.append(mav_msg)
+                if mav_msg.get_type() == "HEARTBEAT":
+                    self.__unrouted_sources.add(source)
+        for source, batch in batches.items():
+            views[source].dispatch(batch)
+        if unrouted:
+            super().dispatch(unrouted)
+
+    async def start(self):
+        """
+        Start the message pump of the link, then the views.
+
+        Returns:
+            None
+        """
+        await super().start()
+        for view in list(self.__views.values()):
+            await view.start()
+
+    async def stop(self):
+        """
+        Stop the views, then the message pump and publisher of the link.
+
+        Returns:
+            None
+        """
+        for view in list(self.__views.values()):
+            await view.stop()
+        await super().stop()
@@ -0,0 +1,62 @@
+"""
+Micro-benchmark the message pump's per-message bookkeeping, without any link I/O.
+
+Feeds pre-decoded telemetry straight into the controller's batch handler, with publishing disabled,
+so only the cache, sequence and waiter bookkeeping is measured.
+
+Run:
+    python testing/bench_dispatch.py --count 200000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fake_autopilot import FakeAutopilot, start_fake_autopilot
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from MAVez.controller import Controller
+from MAVez.enums.mav_message import MAVMessage
+
+
+def telemetry(count: int) -> list:
+    autopilot = FakeAutopilot(0)
+    data = b"".join(autopilot.telemetry(i) for i in range(count))
+    return mavlink2.MAVLink(None).parse_buffer(data)
+
+
+async def main(count: int, batch_size: int):
+    autopilot = start_fake_autopilot(5773, rate=1)
+    try:
+        controller = Controller(connection_string="tcp:127.0.0.1:5773", message_port=5630, publish_types=[])
+        messages = telemetry(count)
+        batches = [messages[i:i + batch_size] for i in range(0, count, batch_size)]
+
+        # a few idle waiters, like a flight controller waiting on acks and mission progress
+        waiters = [
+            asyncio.create_task(controller.receive_message(MAVMessage.COMMAND_ACK, timeout=60)),
+            asyncio.create_task(controller.receive_message(MAVMessage.MISSION_ITEM_REACHED, timeout=60)),
+        ]
+        await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        for batch in batches:
+            controller.dispatch(batch)
+        elapsed = time.perf_counter() - start
+
+        for waiter in waiters:
+            waiter.cancel()
+        assert controller.get_message_seq("ATTITUDE") == count // 5
+        print(f"{count} messages in batches of {batch_size}: {count / elapsed:.0f} msg/s, {elapsed / count * 1e6:.2f} us/msg")
+        controller.pub.close()
+        controller.master.close()
+    finally:
+        autopilot.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.batch_size))
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark header-level message filtering in the pymavlink parser.
+
+Parses a buffer of the stand-in autopilot's telemetry with no filter, and with allow lists keeping fewer types,
+reporting frames parsed per second.
+
+Run:
+    python testing/bench_filter.py --count 100000
+"""
+
+import argparse
+import time
+
+from fake_autopilot import FakeAutopilot
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from MAVez.enums.mav_message import MAVMessage
+from MAVez.message_filter import MessageFilter
+
+
+class _Connection:
+    """Just enough of a mavfile for MessageFilter.install."""
+
+    def __init__(self):
+        self.mav = mavlink2.MAVLink(None)
+
+    def auto_mavlink_version(self, buf):
+        pass
+
+
+def parse_rate(data: bytes, count: int, allow: list[MAVMessage] | None) -> float:
+    connection = _Connection()
+    if allow is not None:
+        MessageFilter(allow).install(connection)
+    start = time.perf_counter()
+    parsed = len(connection.mav.parse_buffer(data) or [])
+    elapsed = time.perf_counter() - start
+    assert parsed == count
+    return count / elapsed
+
+
+def main(count: int):
+    autopilot = FakeAutopilot(0)
+    data = b"".join(autopilot.telemetry(i) for i in range(count))
+    cases = [
+        ("no filter", None),
+        ("allow 3 of 5", [MAVMessage.ATTITUDE, MAVMessage.GLOBAL_POSITION_INT, MAVMessage.VFR_HUD]),
+        ("allow 1 of 5", [MAVMessage.ATTITUDE]),
+        ("allow 0 of 5", []),
+    ]
+    print(f"{count} frames of 5 telemetry types")
+    print(f"{'':<14}{'frames/s':>12}")
+    for name, allow in cases:
+        print(f"{name:<14}{parse_rate(data, count, allow):>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+    main(args.count)
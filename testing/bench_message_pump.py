@@ -0,0 +1,101 @@
+"""
+Benchmark the Controller message pump reader modes against the stand-in autopilot.
+
+For each reader mode this reports:
+    - throughput: messages/sec handled while the autopilot streams as fast as the link allows
+    - load: CPU% of this process while the autopilot streams at a fixed telemetry rate
+    - latency: median and 95th percentile COMMAND_LONG to COMMAND_ACK round trip while the autopilot streams at the fixed rate
+
+Run:
+    python testing/bench_message_pump.py --duration 5 --rate 400
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fake_autopilot import start_fake_autopilot
+from MAVez.controller import Controller
+from pymavlink import mavutil
+
+TELEMETRY = ["HEARTBEAT", "ATTITUDE", "GLOBAL_POSITION_INT", "RC_CHANNELS", "VFR_HUD", "SYS_STATUS"]
+
+
+def count_messages(controller: Controller) -> int:
+    return sum(controller.get_message_seq(name) for name in TELEMETRY)
+
+
+async def ack_latency(controller: Controller, count: int) -> tuple[float, float]:
+    """
+    Time command round trips through the message pump.
+
+    Returns:
+        tuple[float, float]: median and 95th percentile round trip in milliseconds.
+    """
+    samples = []
+    for i in range(count):
+        message = controller.master.mav.command_long_encode(0, 0, mavutil.mavlink.MAV_CMD_DO_SET_SERVO, 0, 9, 1500 + i, 0, 0, 0, 0, 0)
+        start = time.perf_counter()
+        result = await controller.send_command_with_ack(message, mavutil.mavlink.MAV_CMD_DO_SET_SERVO, timeout=5)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert result == 0, controller.decode_error(result)
+    samples.sort()
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+
+async def measure(reader: str, batch: bool, port: int, message_port: int, duration: float, latency_count: int = 0) -> tuple[float, float, tuple[float, float] | None]:
+    """
+    Run a controller for the given duration, then time latency_count command round trips.
+
+    Returns:
+        tuple[float, float, tuple[float, float] | None]: messages per second, CPU percent of this process, median and p95 round trip in milliseconds if measured.
+    """
+    controller = Controller(
+        connection_string=f"tcp:127.0.0.1:{port}",
+        message_port=message_port,
+        publish_wait_time=0.001,  # keep the publisher from spinning so CPU% reflects the pump
+        reader=reader,
+        batch=batch,
+    )
+    await controller.start()
+    await asyncio.sleep(0.5)  # let the link settle
+
+    start_count = count_messages(controller)
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    await asyncio.sleep(duration)
+    cpu = time.process_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+    count = count_messages(controller) - start_count
+    latency = await ack_latency(controller, latency_count) if latency_count else None
+
+    await controller.stop()
+    controller.master.close()
+    return count / wall, 100 * cpu / wall, latency
+
+
+async def main(readers: list[str], duration: float, rate: float):
+    unthrottled = start_fake_autopilot(5770, rate=0)
+    throttled = start_fake_autopilot(5771, rate=rate)
+    message_port = 5600
+    try:
+        print(f"{'reader':<10}{'batch':<7}{'max msg/s':>12}{'CPU% @ max':>12}{f'CPU% @ {rate:g}/s':>16}{'ack ms p50':>12}{'ack ms p95':>12}")
+        for reader in readers:
+            for batch in (False, True):
+                max_rate, max_cpu, _ = await measure(reader, batch, 5770, message_port, duration)
+                _, cpu, (p50, p95) = await measure(reader, batch, 5771, message_port + 1, duration, latency_count=100)
+                message_port += 2
+                print(f"{reader:<10}{str(batch):<7}{max_rate:>12.0f}{max_cpu:>12.1f}{cpu:>16.1f}{p50:>12.2f}{p95:>12.2f}")
+    finally:
+        unthrottled.terminate()
+        throttled.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", nargs="+", default=list(Controller.READER_MODES))
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--rate", type=float, default=400, help="fixed telemetry rate for the CPU measurement")
+    args = parser.parse_args()
+    asyncio.run(main(args.readers, args.duration, args.rate))
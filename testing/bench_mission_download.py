@@ -0,0 +1,74 @@
+"""
+Benchmark reading a survey mission back from the vehicle through a simulated telemetry radio.
+
+Uploads a lawnmower survey to a FakeAutopilot once, then downloads it through a RadioLink shaped like a 57600 baud radio
+with MissionDownload at several request windows and frame losses, checks it matches what was uploaded,
+and reports the download time and the requests sent again. A window of 1 is the classic one request per round trip.
+
+Run:
+    python testing/bench_mission_download.py --items 600 --windows 1 4 8 16 --losses 0 0.02
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_mission_upload import survey
+from fake_autopilot import start_fake_autopilot
+from radio_link import start_radio_link
+
+from MAVez.controller import Controller
+from MAVez.mission import Mission
+from MAVez.mission_download import MissionDownload
+from MAVez.mission_upload import MissionUpload
+
+
+def fields(mission: Mission) -> list[tuple]:
+    return [(item.seq, item.command, item.x, item.y, item.z) for item in mission.mission_items]
+
+
+async def main(items: int, windows: list[int], losses: list[float], baud: int, latency: float, rate: float):
+    autopilot = start_fake_autopilot(5778, rate=rate)
+    try:
+        controller = await Controller.connect("tcp:127.0.0.1:5778", message_port=5637, publish_types=[])
+        await controller.start()
+        expected = survey(controller, items)
+        assert await MissionUpload(controller, expected.mission_items).run(timeout=60) == 0
+        await controller.stop()
+        controller.master.close()
+
+        print(f"{items} items at {baud} baud, {latency * 1000:.0f} ms latency, {rate:.0f} telemetry msg/s")
+        print(f"{'loss':<8}{'window':>8}{'result':>8}{'seconds':>10}{'items/s':>10}{'srtt ms':>10}{'resent':>8}")
+        port = 5806
+        for loss in losses:
+            for window in windows:
+                radio = start_radio_link(port, 5778, baud, latency, loss)
+                controller = await Controller.connect(f"tcp:127.0.0.1:{port}", message_port=5638, publish_types=[])
+                await controller.start()
+                try:
+                    download = MissionDownload(Mission(controller), window)
+                    start = time.perf_counter()
+                    result = await download.run(timeout=600)
+                    elapsed = time.perf_counter() - start
+                    assert result != 0 or fields(download.mission) == fields(expected)
+                finally:
+                    await controller.stop()
+                    controller.master.close()
+                    radio.terminate()
+                    port += 1
+                srtt = download.timer.srtt * 1000 if download.timer.srtt is not None else float("nan")
+                print(f"{loss:<8}{window:>8}{result:>8}{elapsed:>10.2f}{items / elapsed:>10.1f}{srtt:>10.1f}{download.retransmissions:>8}")
+    finally:
+        autopilot.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=600)
+    parser.add_argument("--windows", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--losses", type=float, nargs="+", default=[0, 0.02])
+    parser.add_argument("--baud", type=int, default=57600)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every frame by the radio")
+    parser.add_argument("--rate", type=float, default=40, help="telemetry messages per second")
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.windows, args.losses, args.baud, args.latency, args.rate))
@@ -0,0 +1,74 @@
+"""
+Benchmark retasking a survey mission through a simulated telemetry radio.
+
+Uploads a lawnmower survey to a FakeAutopilot through a RadioLink shaped like a 57600 baud radio, then moves a few waypoints
+and sends the mission again, in full and with differential=True, timing Mission.send_mission including its mission index reset.
+Each differential result is checked by downloading the mission back.
+
+Run:
+    python testing/bench_mission_retask.py --items 600
+"""
+
+import argparse
+import asyncio
+import time
+
+from bench_mission_upload import survey
+from fake_autopilot import start_fake_autopilot
+from radio_link import start_radio_link
+
+from MAVez.controller import Controller
+from MAVez.mission import Mission
+
+
+# name: indexes of the waypoints moved
+def edits(items: int) -> dict[str, list[int]]:
+    return {
+        "1 waypoint": [items // 2],
+        "5 adjacent": list(range(items // 2, items // 2 + 5)),
+        "5 scattered": [items * k // 6 for k in range(1, 6)],
+        "every 2nd": list(range(0, items, 2)),
+    }
+
+
+def fields(mission: Mission) -> list[tuple]:
+    return [item.fields for item in mission.mission_items]
+
+
+async def main(items: int, baud: int, latency: float, rate: float):
+    autopilot = start_fake_autopilot(5779, rate=rate)
+    radio = start_radio_link(5816, 5779, baud, latency)
+    try:
+        controller = await Controller.connect("tcp:127.0.0.1:5816", message_port=5640, publish_types=[])
+        await controller.start()
+        mission = survey(controller, items)
+        assert await mission.send_mission() == 0
+
+        print(f"{items} items at {baud} baud, {latency * 1000:.0f} ms latency, {rate:.0f} telemetry msg/s")
+        print(f"{'edit':<14}{'full s':>10}{'diff s':>10}")
+        for name, moved in edits(items).items():
+            row = f"{name:<14}"
+            for differential in (False, True):
+                for index in moved:
+                    mission.mission_items[index].z += 10
+                start = time.perf_counter()
+                assert await mission.send_mission(differential=differential) == 0
+                row += f"{time.perf_counter() - start:>10.2f}"
+            print(row)
+            readback = await Mission.download(controller)
+            assert readback is not None and fields(readback) == fields(mission)
+        await controller.stop()
+        controller.master.close()
+    finally:
+        radio.terminate()
+        autopilot.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=600)
+    parser.add_argument("--baud", type=int, default=57600)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every frame by the radio")
+    parser.add_argument("--rate", type=float, default=40, help="telemetry messages per second")
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.baud, args.latency, args.rate))
@@ -0,0 +1,76 @@
+"""
+Benchmark uploading a survey mission through a simulated telemetry radio.
+
+Puts a RadioLink shaped like a 57600 baud radio between a Controller and a FakeAutopilot streaming telemetry,
+uploads a lawnmower survey with MissionUpload at increasing frame loss, and reports the upload time,
+the measured round trip and how often items were sent again.
+
+Run:
+    python testing/bench_mission_upload.py --items 600 --losses 0 0.01 0.03
+"""
+
+import argparse
+import asyncio
+import time
+
+from fake_autopilot import start_fake_autopilot
+from radio_link import start_radio_link
+
+from MAVez.controller import Controller
+from MAVez.coordinate import Coordinate
+from MAVez.mission import Mission
+from MAVez.mission_item import MissionItem
+from MAVez.mission_upload import MissionUpload
+
+
+def survey(controller: Controller, count: int) -> Mission:
+    """A lawnmower pattern of count waypoints, 20 per leg."""
+    mission = Mission(controller)
+    for seq in range(count):
+        leg, step = divmod(seq, 20)
+        lat = 38.3152762 + leg * 0.0002
+        lon = -76.5490833 + (step if leg % 2 == 0 else 19 - step) * 0.0002
+        mission.add_mission_item(MissionItem(seq, 3, 16, 0, 1, Coordinate(lat, lon, 60)))
+    return mission
+
+
+async def upload(port: int, message_port: int, items: int) -> tuple[int, float, MissionUpload]:
+    controller = await Controller.connect(f"tcp:127.0.0.1:{port}", message_port=message_port, publish_types=[])
+    await controller.start()
+    try:
+        mission = survey(controller, items)
+        engine = MissionUpload(controller, mission.mission_items)
+        start = time.perf_counter()
+        result = await engine.run(timeout=600)
+        return result, time.perf_counter() - start, engine
+    finally:
+        await controller.stop()
+        controller.master.close()
+
+
+async def main(items: int, losses: list[float], baud: int, latency: float, rate: float):
+    autopilot = start_fake_autopilot(5776, rate=rate)
+    try:
+        print(f"{items} items at {baud} baud, {latency * 1000:.0f} ms latency, {rate:.0f} telemetry msg/s")
+        print(f"{'loss':<8}{'result':>8}{'seconds':>10}{'ms/item':>10}{'srtt ms':>10}{'resent':>8}{'repeats':>9}")
+        for i, loss in enumerate(losses):
+            radio = start_radio_link(5786 + i, 5776, baud, latency, loss)
+            try:
+                result, elapsed, engine = await upload(5786 + i, 5633, items)
+            finally:
+                radio.terminate()
+            srtt = engine.timer.srtt * 1000 if engine.timer.srtt is not None else float("nan")
+            print(f"{loss:<8}{result:>8}{elapsed:>10.2f}{elapsed / items * 1000:>10.1f}{srtt:>10.1f}{engine.retransmissions:>8}{engine.repeated_requests:>9}")
+    finally:
+        autopilot.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=600)
+    parser.add_argument("--losses", type=float, nargs="+", default=[0, 0.01, 0.03])
+    parser.add_argument("--baud", type=int, default=57600)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every frame by the radio")
+    parser.add_argument("--rate", type=float, default=40, help="telemetry messages per second")
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.losses, args.baud, args.latency, args.rate))
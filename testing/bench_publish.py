@@ -0,0 +1,96 @@
+"""
+Benchmark the publishing path of the Controller against the stand-in autopilot.
+
+For each publish format and batch size this reports the CPU% of the controller process at a fixed telemetry rate,
+and how many frames and messages a subscriber in another process received.
+
+Run:
+    python testing/bench_publish.py --duration 5 --rate 1000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from fake_autopilot import start_fake_autopilot
+from lingo import Subscriber
+from MAVez.controller import Controller
+from MAVez.publish_batch import unbatch_message
+
+
+def _subscribe(port: int, frames, messages, stop):
+    async def run():
+        def on_message(message):
+            frames.value += 1
+            messages.value += len(unbatch_message(message)) if message.topic.endswith("BATCH") else 1
+
+        sub = Subscriber("127.0.0.1", port, callback=on_message, wait_time=0.001)
+        sub.start()
+        while not stop.is_set():
+            await asyncio.sleep(0.1)
+        sub.close()
+
+    asyncio.run(run())
+
+
+async def measure(publish_format: str, batch_size: int, port: int, message_port: int, duration: float) -> tuple[float, int, int]:
+    """
+    Run a controller with a subscriber for the given duration.
+
+    Returns:
+        tuple[float, int, int]: CPU percent of this process, frames received, messages received.
+    """
+    context = multiprocessing.get_context("spawn")
+    frames, messages, stop = context.Value("q", 0), context.Value("q", 0), context.Event()
+    subscriber = context.Process(target=_subscribe, args=(message_port, frames, messages, stop), daemon=True)
+
+    controller = Controller(
+        connection_string=f"tcp:127.0.0.1:{port}",
+        message_port=message_port,
+        publish_wait_time=0.001,
+        reader="asyncio",
+        batch=True,
+        publish_format=publish_format,
+        publish_batch_size=batch_size,
+    )
+    subscriber.start()
+    await controller.start()
+    await asyncio.sleep(1)  # let the link and the subscriber settle
+
+    start_frames, start_messages = frames.value, messages.value
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    await asyncio.sleep(duration)
+    cpu = time.process_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+    received = frames.value - start_frames, messages.value - start_messages
+
+    await controller.stop()
+    controller.master.close()
+    stop.set()
+    subscriber.join()
+    return 100 * cpu / wall, *received
+
+
+async def main(duration: float, rate: float, batch_sizes: list[int]):
+    autopilot = start_fake_autopilot(5772, rate=rate)
+    message_port = 5620
+    try:
+        print(f"{'format':<8}{'batch':>6}{'CPU%':>8}{'frames/s':>10}{'msgs/s':>10}")
+        for publish_format in ("dict", "raw"):
+            for batch_size in batch_sizes:
+                cpu, frames, messages = await measure(publish_format, batch_size, 5772, message_port, duration)
+                message_port += 1
+                print(f"{publish_format:<8}{batch_size:>6}{cpu:>8.1f}{frames / duration:>10.0f}{messages / duration:>10.0f}")
+    finally:
+        autopilot.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--rate", type=float, default=1000, help="telemetry rate of the stand-in autopilot")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[0, 16, 64])
+    args = parser.parse_args()
+    asyncio.run(main(args.duration, args.rate, args.batch_sizes))
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark routing a shared link to per-vehicle views, without any link I/O.
+
+Feeds pre-decoded telemetry from a growing number of vehicles, interleaved message by message (the worst case for grouping),
+straight into a VehicleRouter with a FlightController view per vehicle and publishing disabled, reporting the dispatch cost per message.
+Once vehicles outnumber the messages of a batch, every view is handed single messages, so larger reader batches (batch=True) route cheaper.
+
+Run:
+    python testing/bench_router.py --count 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fake_autopilot import FakeAutopilot, start_fake_autopilot
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from MAVez.vehicle_router import VehicleRouter
+
+
+def telemetry(count: int, vehicles: int) -> list:
+    autopilots = []
+    for system in range(1, vehicles + 1):
+        autopilot = FakeAutopilot(0)
+        autopilot.mav.srcSystem = system
+        autopilots.append(autopilot)
+    data = b"".join(autopilots[i % vehicles].telemetry(i // vehicles) for i in range(count))
+    return mavlink2.MAVLink(None).parse_buffer(data)
+
+
+def dispatch_cost(router: VehicleRouter, batches: list, vehicles: int) -> float:
+    for system in range(1, vehicles + 1):
+        router.vehicle(system, publish_types=[])
+    start = time.perf_counter()
+    for batch in batches:
+        router.dispatch(batch)
+    elapsed = time.perf_counter() - start
+    # every vehicle got its share
+    assert router.vehicle(vehicles).get_message_seq("ATTITUDE") > 0
+    return elapsed / sum(len(batch) for batch in batches) * 1e6
+
+
+async def main(count: int, batch_sizes: list[int]):
+    autopilot = start_fake_autopilot(5775, rate=1)
+    try:
+        print(f"{count} messages, us/msg per batch size")
+        print(f"{'vehicles':<10}" + "".join(f"{batch_size:>8}" for batch_size in batch_sizes))
+        for vehicles in (1, 2, 8, 32, 128):
+            messages = telemetry(count, vehicles)
+            row = f"{vehicles:<10}"
+            for batch_size in batch_sizes:
+                batches = [messages[i:i + batch_size] for i in range(0, count, batch_size)]
+                # best of a few runs, each on a fresh router
+                costs = []
+                for _ in range(3):
+                    router = VehicleRouter("tcp:127.0.0.1:5775", message_port=5632, publish_types=[])
+                    costs.append(dispatch_cost(router, batches, vehicles))
+                    router.pub.close()
+                    router.master.close()
+                row += f"{min(costs):>8.2f}"
+            print(row)
+    finally:
+        autopilot.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 1024])
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.batch_sizes))
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark message translation over a common ArduPilot telemetry set.
+
+Compares the original per-message get_fieldnames()/getattr translation against translate_message,
+both for the field dict alone and for the full lingo Message.
+
+Run:
+    python testing/bench_translate.py --count 200000
+"""
+
+import argparse
+import time
+
+from lingo import Message
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from MAVez.translate_message import translate_fields, translate_message
+
+
+class _Buffer:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, buf):
+        self.data += buf
+
+
+def telemetry_set() -> list:
+    """Encode and decode one of each common telemetry message so the objects match what the pump receives."""
+    sink = _Buffer()
+    mav = mavlink2.MAVLink(sink, srcSystem=1, srcComponent=1)
+    mav.heartbeat_send(1, 3, 0, 0, 4)
+    mav.sys_status_send(0, 0, 0, 500, 12600, 1500, 80, 0, 0, 0, 0, 0, 0)
+    mav.gps_raw_int_send(0, 3, 383152762, -765490833, 40000, 100, 100, 1800, 28250, 12)
+    mav.attitude_send(1000, 0.1, 0.02, 1.5, 0.0, 0.0, 0.0)
+    mav.global_position_int_send(1000, 383152762, -765490833, 40000, 10000, 100, 0, 0, 28250)
+    mav.servo_output_raw_send(0, 0, *([1500] * 8))
+    mav.rc_channels_send(1000, 16, *([1500] * 18), 255)
+    mav.vfr_hud_send(18.0, 18.5, 282, 55, 40.0, 0.1)
+    mav.nav_controller_output_send(0.1, 0.2, 282, 282, 100, 0.5, 0.1, 0.2)
+    mav.mission_current_send(3)
+    mav.system_time_send(0, 1000)
+    mav.wind_send(90, 3.0, 0.0)
+    parser = mavlink2.MAVLink(None)
+    return parser.parse_buffer(bytes(sink.data))
+
+
+def legacy_fields(csvm) -> dict:
+    fields = csvm.get_fieldnames()
+    return {field: getattr(csvm, field) for field in fields}
+
+
+def legacy_message(csvm, topic: str = "") -> Message | None:
+    if csvm.get_type().startswith('UNKNOWN'):
+        return None
+    data = legacy_fields(csvm)
+    return Message(topic=f"{topic}_{csvm.get_type()}" if topic else csvm.get_type(), header=data)
+
+
+def rate(function, messages: list, count: int) -> float:
+    """Translations per second of function over count messages cycling through the telemetry set."""
+    batch = (messages * (count // len(messages) + 1))[:count]
+    start = time.perf_counter()
+    for msg in batch:
+        function(msg)
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int):
+    messages = telemetry_set()
+    assert all(legacy_fields(msg) == translate_fields(msg) for msg in messages)
+
+    rows = [
+        ("field dict", rate(legacy_fields, messages, count), rate(translate_fields, messages, count)),
+        ("Message", rate(lambda msg: legacy_message(msg, "mavlink"), messages, count), rate(lambda msg: translate_message(msg, "mavlink"), messages, count)),
+    ]
+    print(f"{len(messages)} message types, {count} translations")
+    print(f"{'':<12}{'before /s':>14}{'after /s':>14}{'speedup':>10}")
+    for name, before, after in rows:
+        print(f"{name:<12}{before:>14.0f}{after:>14.0f}{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.count)
@@ -0,0 +1,91 @@
+"""
+Benchmark loading large QGC WPL 110 missions line by line and into columns.
+
+Writes a lawnmower survey of each size with a takeoff, a landing and a few comments, then loads it with
+Mission.load_mission_from_file and with columnar=True, checking both give the same items, sequence numbers and flags,
+also for a start/end/first_seq slice. Reports the best load time and the memory held by the loaded items.
+
+Run:
+    python testing/bench_wpl_parse.py --items 1000 10000 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from MAVez.mission import Mission
+
+
+class _Controller:
+    logger = None
+
+
+def write_survey(path: str, count: int):
+    """A takeoff, a lawnmower pattern, 20 waypoints per leg, and a landing, count items in all."""
+    lines = ["QGC WPL 110\n", "0\t1\t0\t22\t0.00000000\t0.00000000\t0.00000000\t0.00000000\t38.31527620\t-76.54908330\t30.000000\t1\n"]
+    for seq in range(1, count - 1):
+        leg, step = divmod(seq, 20)
+        lat = 38.3152762 + leg * 0.0002
+        lon = -76.5490833 + (step if leg % 2 == 0 else 19 - step) * 0.0002
+        comment = f"\t# leg {leg}" if step == 0 else ""
+        lines.append(f"{seq}\t0\t3\t16\t0.00000000\t0.00000000\t0.00000000\t0.00000000\t{lat:.8f}\t{lon:.8f}\t60.000000\t1{comment}\n")
+    lines.append(f"{count - 1}\t0\t3\t21\t0.00000000\t0.00000000\t0.00000000\t0.00000000\t38.31527620\t-76.54908330\t0.000000\t1\n")
+    with open(path, "w") as file:
+        file.writelines(lines)
+
+
+def load(path: str, columnar: bool, **kwargs) -> Mission:
+    mission = Mission(_Controller())  # type: ignore[arg-type]
+    assert mission.load_mission_from_file(path, columnar=columnar, **kwargs) == 0
+    return mission
+
+
+def rows(mission: Mission) -> list[tuple]:
+    return [(item.seq, item.fields) for item in mission.mission_items]
+
+
+def check(path: str, count: int):
+    for kwargs in ({}, {"start": count // 4, "end": count // 2, "first_seq": 1}):
+        lines, columns = load(path, False, **kwargs), load(path, True, **kwargs)
+        assert rows(lines) == rows(columns), kwargs
+        assert (lines.is_takeoff, lines.is_landing) == (columns.is_takeoff, columns.is_landing), kwargs
+
+
+def best(path: str, columnar: bool, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(path, columnar)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def held(path: str, columnar: bool) -> int:
+    tracemalloc.start()
+    mission = load(path, columnar)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del mission
+    return size
+
+
+def main(counts: list[int], repeat: int):
+    print(f"{'items':>8}{'lines s':>10}{'columns s':>11}{'speedup':>9}{'lines MB':>10}{'columns MB':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            path = os.path.join(directory, f"survey_{count}.waypoints")
+            write_survey(path, count)
+            check(path, count)
+            lines, columns = best(path, False, repeat), best(path, True, repeat)
+            lines_mb, columns_mb = held(path, False) / 1e6, held(path, True) / 1e6
+            print(f"{count:>8}{lines:>10.4f}{columns:>11.4f}{lines / columns:>9.1f}{lines_mb:>10.1f}{columns_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5, help="loads timed per size, the best is reported")
+    args = parser.parse_args()
+    main(args.items, args.repeat)
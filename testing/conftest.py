@@ -0,0 +1,57 @@
+"""
+Shared pytest fixtures: a FakeAutopilot per test, free ports for links and publishers,
+and a mission record file per test in place of the user's.
+
+Run:
+    python -m pytest testing
+"""
+
+import socket
+
+import pytest
+
+from fake_autopilot import start_fake_autopilot
+from radio_link import start_radio_link
+
+from MAVez.mission import Mission
+
+
+def free_port() -> int:
+    """A TCP port nothing listens on right now."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(autouse=True)
+def record_file(tmp_path, monkeypatch):
+    """Path of Mission.RECORD_FILE, kept in the test's temporary directory."""
+    path = tmp_path / "missions.json"
+    monkeypatch.setattr(Mission, "RECORD_FILE", path)
+    return path
+
+
+@pytest.fixture
+def autopilot():
+    """Port of a FakeAutopilot streaming 200 telemetry messages per second."""
+    port = free_port()
+    process = start_fake_autopilot(port, rate=200)
+    yield port
+    process.terminate()
+    process.join()
+
+
+@pytest.fixture
+def radio():
+    """Start RadioLinks with start(upstream_port, latency=..., loss=...), each returning its port."""
+    processes = []
+
+    def start(upstream: int, latency: float = 0.0, loss: float = 0.0, baud: int = 10_000_000) -> int:
+        port = free_port()
+        processes.append(start_radio_link(port, upstream, baud, latency, loss))
+        return port
+
+    yield start
+    for process in processes:
+        process.terminate()
+        process.join()
@@ -0,0 +1,256 @@
+"""
+A minimal stand-in autopilot for benchmarking MAVez without SITL.
+
+Listens on a TCP port like SITL does, sends a HEARTBEAT as soon as a client connects,
+streams a fixed ArduPilot-style telemetry set and acknowledges every COMMAND_LONG / COMMAND_INT.
+Accepts mission uploads, whole or partial, like ArduPilot: requests each item in turn, requests it again if it does not arrive,
+and answers items it did not request with MAV_MISSION_INVALID_SEQUENCE. Mission downloads are answered request by request.
+
+Run standalone:
+    python testing/fake_autopilot.py --port 5770 --rate 400
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+
+class _Buffer:
+    """File-like sink so pymavlink can pack messages without a real connection."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, buf):
+        self.data += buf
+
+
+class FakeAutopilot:
+    """
+    Stand-in autopilot speaking MAVLink 2 over TCP.
+
+    Args:
+        port (int): TCP port to listen on.
+        rate (float): Total telemetry rate in messages per second. 0 streams as fast as the client reads.
+        host (str): Host to bind to. Default is "127.0.0.1".
+        mission_request_int (bool): Request mission items with MISSION_REQUEST_INT, or the deprecated MISSION_REQUEST. Default is True.
+    """
+
+    SYSTEM_ID = 1
+    COMPONENT_ID = 1
+    BURST = 50  # messages packed per write when streaming unthrottled
+    MISSION_REREQUEST = 1.0  # seconds before requesting a mission item again
+
+    def __init__(self, port: int, rate: float = 400, host: str = "127.0.0.1", mission_request_int: bool = True):
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self.mission_request_int = mission_request_int
+        self.missions: dict[int, list] = {}  # accepted mission items per mission type
+        self.upload: list | None = None  # items received so far of the upload in progress
+        self.upload_tail: list = []  # items kept after the range of a partial upload
+        self.upload_type = 0
+        self.upload_count = 0
+        self.last_request = 0.0
+        self.sink = _Buffer()
+        self.mav = mavlink2.MAVLink(self.sink, srcSystem=self.SYSTEM_ID, srcComponent=self.COMPONENT_ID)
+        self.parser = mavlink2.MAVLink(None)
+        self.parser.robust_parsing = True
+        self.start = time.monotonic()
+
+    def _pack(self, message) -> bytes:
+        self.mav.send(message)
+        data = bytes(self.sink.data)
+        self.sink.data.clear()
+        return data
+
+    def _boot_ms(self) -> int:
+        return int((time.monotonic() - self.start) * 1000) & 0xFFFFFFFF
+
+    def heartbeat(self) -> bytes:
+        return self._pack(self.mav.heartbeat_encode(
+            mavlink2.MAV_TYPE_FIXED_WING, mavlink2.MAV_AUTOPILOT_ARDUPILOTMEGA, 0, 0, mavlink2.MAV_STATE_ACTIVE
+        ))
+
+    def telemetry(self, i: int) -> bytes:
+        """Pack the i-th message of the rotating telemetry set."""
+        t = self._boot_ms()
+        kind = i % 5
+        if kind == 0:
+            message = self.mav.attitude_encode(t, 0.01 * (i % 100), 0.02, 1.5, 0.0, 0.0, 0.0)
+        elif kind == 1:
+            message = self.mav.global_position_int_encode(t, 383152762, -765490833, 40000, 10000, 100, 0, 0, 28250)
+        elif kind == 2:
+            message = self.mav.rc_channels_encode(t, 16, *([1500] * 18), 255)
+        elif kind == 3:
+            message = self.mav.vfr_hud_encode(18.0, 18.5, 282, 55, 40.0, 0.1)
+        else:
+            message = self.mav.sys_status_encode(0, 0, 0, 500, 12600, 1500, 80, 0, 0, 0, 0, 0, 0)
+        return self._pack(message)
+
+    def mission_ack(self, result: int, mission_type: int) -> bytes:
+        return self._pack(self.mav.mission_ack_encode(255, 0, result, mission_type))
+
+    def mission_item(self, item, as_int: bool) -> bytes:
+        """Pack a stored mission item as MISSION_ITEM_INT, or as the deprecated MISSION_ITEM."""
+        x, y = item.x, item.y
+        if item.get_type() == "MISSION_ITEM" and as_int:
+            x, y = int(x * 1e7), int(y * 1e7)
+        elif item.get_type() == "MISSION_ITEM_INT" and not as_int:
+            x, y = x / 1e7, y / 1e7
+        encode = self.mav.mission_item_int_encode if as_int else self.mav.mission_item_encode
+        return self._pack(encode(
+            255, 0, item.seq, item.frame, item.command, item.current, item.autocontinue,
+            item.param1, item.param2, item.param3, item.param4, x, y, item.z, item.mission_type
+        ))
+
+    def request_item(self) -> bytes:
+        """Pack the request for the next item of the upload in progress."""
+        self.last_request = time.monotonic()
+        if self.mission_request_int:
+            message = self.mav.mission_request_int_encode(255, 0, len(self.upload), self.upload_type)
+        else:
+            message = self.mav.mission_request_encode(255, 0, len(self.upload), self.upload_type)
+        return self._pack(message)
+
+    def handle(self, message, writer: asyncio.StreamWriter):
+        """Respond to a message received from the ground station."""
+        msg_type = message.get_type()
+        if msg_type in ("COMMAND_LONG", "COMMAND_INT"):
+            writer.write(self._pack(self.mav.command_ack_encode(message.command, 0)))
+        elif msg_type == "TIMESYNC" and message.tc1 == 0:
+            writer.write(self._pack(self.mav.timesync_encode(time.monotonic_ns(), message.ts1)))
+        elif msg_type == "MISSION_COUNT":
+            self.upload = []
+            self.upload_tail = []
+            self.upload_type = message.mission_type
+            self.upload_count = message.count
+            if message.count == 0:
+                self.missions[self.upload_type] = self.upload
+                self.upload = None
+                writer.write(self.mission_ack(mavlink2.MAV_MISSION_ACCEPTED, message.mission_type))
+            else:
+                writer.write(self.request_item())
+        elif msg_type in ("MISSION_ITEM_INT", "MISSION_ITEM"):
+            if self.upload is None or message.mission_type != self.upload_type:
+                writer.write(self.mission_ack(mavlink2.MAV_MISSION_ERROR, message.mission_type))
+            elif message.seq != len(self.upload):
+                writer.write(self.mission_ack(mavlink2.MAV_MISSION_INVALID_SEQUENCE, message.mission_type))
+            else:
+                self.upload.append(message)
+                if len(self.upload) < self.upload_count:
+                    writer.write(self.request_item())
+                else:
+                    self.missions[self.upload_type] = self.upload + self.upload_tail
+                    self.upload = None
+                    writer.write(self.mission_ack(mavlink2.MAV_MISSION_ACCEPTED, message.mission_type))
+        elif msg_type == "MISSION_WRITE_PARTIAL_LIST":
+            mission = self.missions.get(message.mission_type, [])
+            if not 0 <= message.start_index <= message.end_index < len(mission):
+                writer.write(self.mission_ack(mavlink2.MAV_MISSION_ERROR, message.mission_type))
+            else:
+                # keep the items before the range so the next item requested is len(self.upload)
+                self.upload = mission[:message.start_index]
+                self.upload_tail = mission[message.end_index + 1:]
+                self.upload_type = message.mission_type
+                self.upload_count = message.end_index + 1
+                writer.write(self.request_item())
+        elif msg_type == "MISSION_REQUEST_LIST":
+            mission = self.missions.get(message.mission_type, [])
+            writer.write(self._pack(self.mav.mission_count_encode(255, 0, len(mission), message.mission_type)))
+        elif msg_type in ("MISSION_REQUEST_INT", "MISSION_REQUEST"):
+            mission = self.missions.get(message.mission_type, [])
+            if message.seq >= len(mission):
+                writer.write(self.mission_ack(mavlink2.MAV_MISSION_INVALID_SEQUENCE, message.mission_type))
+            else:
+                writer.write(self.mission_item(mission[message.seq], msg_type == "MISSION_REQUEST_INT"))
+        elif msg_type == "MISSION_CLEAR_ALL":
+            self.missions.pop(message.mission_type, None)
+            writer.write(self.mission_ack(mavlink2.MAV_MISSION_ACCEPTED, message.mission_type))
+
+    async def _receive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                return
+            for message in self.parser.parse_buffer(data) or []:
+                self.handle(message, writer)
+
+    async def _stream(self, writer: asyncio.StreamWriter):
+        i = 0
+        last_heartbeat = 0.0
+        interval = 1 / self.rate if self.rate else 0
+        next_send = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now - last_heartbeat >= 1:
+                writer.write(self.heartbeat())
+                last_heartbeat = now
+            if self.upload is not None and now - self.last_request >= self.MISSION_REREQUEST:
+                writer.write(self.request_item())
+            if interval:
+                # send everything that is due, then sleep until the next message
+                while next_send <= now:
+                    writer.write(self.telemetry(i))
+                    i += 1
+                    next_send += interval
+                await writer.drain()
+                await asyncio.sleep(max(0.0, next_send - time.monotonic()))
+            else:
+                writer.write(b"".join(self.telemetry(i + j) for j in range(self.BURST)))
+                i += self.BURST
+                await writer.drain()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.write(self.heartbeat())
+        tasks = [asyncio.create_task(self._receive(reader, writer)), asyncio.create_task(self._stream(writer))]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_server(self._client, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+
+def _run(port: int, rate: float, mission_request_int: bool = True):
+    try:
+        asyncio.run(FakeAutopilot(port, rate, mission_request_int=mission_request_int).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def start_fake_autopilot(port: int, rate: float = 400, mission_request_int: bool = True) -> multiprocessing.Process:
+    """
+    Start a FakeAutopilot in a child process so it does not share CPU accounting with the caller.
+
+    Args:
+        port (int): TCP port to listen on.
+        rate (float): Total telemetry rate in messages per second. 0 streams unthrottled.
+        mission_request_int (bool): Request mission items with MISSION_REQUEST_INT, or the deprecated MISSION_REQUEST. Default is True.
+
+    Returns:
+        multiprocessing.Process: The running autopilot process. Terminate it when done.
+    """
+    process = multiprocessing.get_context("spawn").Process(target=_run, args=(port, rate, mission_request_int), daemon=True)
+    process.start()
+    time.sleep(1)  # give the server time to bind
+    return process
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=5770)
+    parser.add_argument("--rate", type=float, default=400, help="messages per second, 0 for unthrottled")
+    parser.add_argument("--legacy-mission-requests", action="store_true", help="request mission items with MISSION_REQUEST")
+    args = parser.parse_args()
+    _run(args.port, args.rate, not args.legacy_mission_requests)
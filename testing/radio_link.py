@@ -0,0 +1,147 @@
+"""
+A stand-in telemetry radio between MAVez and an autopilot, for benchmarking over slow, lossy links without hardware.
+
+Proxies TCP like a serial radio: each direction carries MAVLink frames one at a time at the serial baud rate,
+delivers them after a fixed latency, and drops whole frames at random.
+
+Run standalone in front of fake_autopilot.py:
+    python testing/radio_link.py --port 5780 --upstream 5770 --baud 57600 --latency 0.02 --loss 0.01
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+
+
+def split_frames(buffer: bytearray) -> list[bytes]:
+    """Remove and return the complete MAVLink 1 and 2 frames at the start of the buffer, discarding bytes before a start marker."""
+    frames = []
+    while buffer:
+        if buffer[0] == 0xFD:
+            if len(buffer) < 3:
+                break
+            length = 12 + buffer[1] + (13 if buffer[2] & 0x01 else 0)
+        elif buffer[0] == 0xFE:
+            if len(buffer) < 2:
+                break
+            length = 8 + buffer[1]
+        else:
+            del buffer[0]
+            continue
+        if len(buffer) < length:
+            break
+        frames.append(bytes(buffer[:length]))
+        del buffer[:length]
+    return frames
+
+
+class RadioLink:
+    """
+    TCP proxy shaped like a telemetry radio, accepting one client at a time.
+
+    Args:
+        port (int): TCP port to listen on.
+        upstream_port (int): TCP port of the autopilot.
+        baud (int): Serial baud rate of each direction, 10 bits per byte. Default is 57600.
+        latency (float): Seconds added to every frame on top of its serialisation time. Default is 0.02.
+        loss (float): Probability of dropping each frame. Default is 0.
+        host (str): Host to bind to and of the autopilot. Default is "127.0.0.1".
+    """
+
+    def __init__(self, port: int, upstream_port: int, baud: int = 57600, latency: float = 0.02, loss: float = 0.0, host: str = "127.0.0.1"):
+        self.port = port
+        self.upstream_port = upstream_port
+        self.baud = baud
+        self.latency = latency
+        self.loss = loss
+        self.host = host
+
+    async def _carry(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Carry one direction: frame, pace to the baud rate, drop, delay, deliver."""
+        queue: asyncio.Queue = asyncio.Queue()
+        byte_time = 10 / self.baud
+
+        async def deliver():
+            while True:
+                due, frame = await queue.get()
+                await asyncio.sleep(max(0.0, due - time.monotonic()))
+                writer.write(frame)
+                await writer.drain()
+
+        delivery = asyncio.create_task(deliver())
+        buffer = bytearray()
+        wire_free = time.monotonic()
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    return
+                buffer += data
+                for frame in split_frames(buffer):
+                    # the radio transmits frames back to back once its buffer is non-empty
+                    wire_free = max(wire_free, time.monotonic()) + len(frame) * byte_time
+                    if random.random() >= self.loss:
+                        queue.put_nowait((wire_free + self.latency, frame))
+        finally:
+            delivery.cancel()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        upstream_reader, upstream_writer = await asyncio.open_connection(self.host, self.upstream_port)
+        tasks = [
+            asyncio.create_task(self._carry(reader, upstream_writer)),
+            asyncio.create_task(self._carry(upstream_reader, writer)),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            upstream_writer.close()
+
+    async def serve(self):
+        server = await asyncio.start_server(self._client, self.host, self.port)
+        async with server:
+            await server.serve_forever()
+
+
+def _run(port: int, upstream_port: int, baud: int, latency: float, loss: float):
+    try:
+        asyncio.run(RadioLink(port, upstream_port, baud, latency, loss).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def start_radio_link(port: int, upstream_port: int, baud: int = 57600, latency: float = 0.02, loss: float = 0.0) -> multiprocessing.Process:
+    """
+    Start a RadioLink in a child process.
+
+    Args:
+        port (int): TCP port to listen on.
+        upstream_port (int): TCP port of the autopilot.
+        baud (int): Serial baud rate of each direction. Default is 57600.
+        latency (float): Seconds added to every frame. Default is 0.02.
+        loss (float): Probability of dropping each frame. Default is 0.
+
+    Returns:
+        multiprocessing.Process: The running link process. Terminate it when done.
+    """
+    process = multiprocessing.get_context("spawn").Process(target=_run, args=(port, upstream_port, baud, latency, loss), daemon=True)
+    process.start()
+    time.sleep(1)  # give the server time to bind
+    return process
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=5780)
+    parser.add_argument("--upstream", type=int, default=5770)
+    parser.add_argument("--baud", type=int, default=57600)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to every frame")
+    parser.add_argument("--loss", type=float, default=0.0, help="probability of dropping each frame")
+    args = parser.parse_args()
+    _run(args.port, args.upstream, args.baud, args.latency, args.loss)
@@ -0,0 +1,135 @@
+"""
+Check the Controller's message pump and dispatch against a FakeAutopilot: batched draining under each reader mode,
+and, with messages dispatched by hand to a controller whose pump is not running, the per-type message history
+and waiters keyed by a message type's discriminator field.
+
+Run:
+    python -m pytest testing/test_controller.py
+"""
+
+import asyncio
+
+import pytest
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from conftest import free_port
+from MAVez.controller import Controller
+from MAVez.enums.mav_message import MAVMessage
+
+
+async def connect(port: int, **kwargs) -> Controller:
+    return await Controller.connect(f"tcp:127.0.0.1:{port}", message_port=free_port(), publish_types=[], **kwargs)
+
+
+def attitudes(count: int) -> list:
+    """count packed ATTITUDE messages, time_boot_ms counting from 0."""
+    mav = mavlink2.MAVLink(None, srcSystem=1, srcComponent=1)
+    messages = []
+    for index in range(count):
+        message = mav.attitude_encode(index, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0)
+        message.pack(mav)
+        messages.append(message)
+    return messages
+
+
+def command_acks(commands: list[int]) -> list:
+    """A packed COMMAND_ACK accepting each command."""
+    mav = mavlink2.MAVLink(None, srcSystem=1, srcComponent=1)
+    messages = []
+    for command in commands:
+        message = mav.command_ack_encode(command, 0)
+        message.pack(mav)
+        messages.append(message)
+    return messages
+
+
+@pytest.mark.parametrize("reader", ["executor", "asyncio", "thread"])
+def test_batch(autopilot, reader):
+    async def run():
+        controller = await connect(autopilot, reader=reader, batch=True)
+        await controller.start()
+        try:
+            times = []
+            async with controller.stream(MAVMessage.ATTITUDE) as attitudes:
+                async for attitude in attitudes:
+                    times.append(attitude["time_boot_ms"])
+                    if len(times) == 50:
+                        break
+            # every message of a drained batch dispatched, in order
+            assert times == sorted(times)
+            assert await controller.receive_message(MAVMessage.GLOBAL_POSITION_INT, timeout=2) is not None
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
+
+
+def test_history(autopilot):
+    async def run():
+        controller = await connect(autopilot, history_depths={MAVMessage.ATTITUDE: 4})
+        try:
+            controller.dispatch(attitudes(10))
+            assert controller.get_message_seq("ATTITUDE") == 10
+            # the oldest kept message at or after seq, messages 1 to 6 were pushed out
+            assert (await controller.receive_message(MAVMessage.ATTITUDE, 1))["time_boot_ms"] == 6
+            assert (await controller.receive_message(MAVMessage.ATTITUDE, 9))["time_boot_ms"] == 8
+            found = await controller.receive_message(MAVMessage.ATTITUDE, 1, qualifier=lambda msg: msg["time_boot_ms"] == 9)
+            assert found["time_boot_ms"] == 9
+            assert await controller.receive_message(MAVMessage.ATTITUDE, 1, qualifier=lambda msg: msg["time_boot_ms"] == 2, timeout=0.1) is None
+
+            # a waiter for a seq past the history is resolved once that seq arrives
+            waiting = asyncio.ensure_future(controller.receive_message(MAVMessage.ATTITUDE, 12))
+            await asyncio.sleep(0)
+            controller.dispatch(attitudes(2))
+            assert (await waiting)["time_boot_ms"] == 1
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("depth", [0, -1, 1.5, True])
+def test_invalid_history_depth(autopilot, depth):
+    async def run():
+        with pytest.raises(ValueError):
+            await connect(autopilot, history_depths={MAVMessage.ATTITUDE: depth})
+
+    asyncio.run(run())
+
+
+def test_keyed_waiters(autopilot):
+    async def run():
+        controller = await connect(autopilot)
+        try:
+            arm = asyncio.ensure_future(controller.receive_message(MAVMessage.COMMAND_ACK, key=mavlink2.MAV_CMD_COMPONENT_ARM_DISARM, timeout=2))
+            mode = asyncio.ensure_future(controller.receive_message(MAVMessage.COMMAND_ACK, key=mavlink2.MAV_CMD_DO_SET_MODE, timeout=2))
+            any_ack = asyncio.ensure_future(controller.receive_message(MAVMessage.COMMAND_ACK, timeout=2))
+            await asyncio.sleep(0)
+            controller.dispatch(command_acks([mavlink2.MAV_CMD_DO_SET_MODE]))
+            await asyncio.sleep(0)
+            # only the waiters on this command and on any command are woken
+            assert mode.done() and any_ack.done() and not arm.done()
+            assert (await mode)["command"] == mavlink2.MAV_CMD_DO_SET_MODE
+            assert (await any_ack)["command"] == mavlink2.MAV_CMD_DO_SET_MODE
+            controller.dispatch(command_acks([mavlink2.MAV_CMD_COMPONENT_ARM_DISARM]))
+            assert (await arm)["command"] == mavlink2.MAV_CMD_COMPONENT_ARM_DISARM
+
+            with pytest.raises(ValueError):
+                await controller.receive_message(MAVMessage.ATTITUDE, key=1)
+
+            # a failing qualifier is raised in its receiver, other waiters are still resolved
+            def fail(msg):
+                raise RuntimeError("qualifier failed")
+
+            failing = asyncio.ensure_future(controller.receive_message(MAVMessage.COMMAND_ACK, qualifier=fail, timeout=2))
+            other = asyncio.ensure_future(controller.receive_message(MAVMessage.COMMAND_ACK, key=mavlink2.MAV_CMD_DO_SET_MODE, timeout=2))
+            await asyncio.sleep(0)
+            controller.dispatch(command_acks([mavlink2.MAV_CMD_DO_SET_MODE]))
+            with pytest.raises(RuntimeError):
+                await failing
+            assert (await other)["command"] == mavlink2.MAV_CMD_DO_SET_MODE
+            assert await controller.receive_message(MAVMessage.COMMAND_ACK, key=mavlink2.MAV_CMD_NAV_TAKEOFF, timeout=0.1) is None
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
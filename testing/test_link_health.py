@@ -0,0 +1,98 @@
+"""
+Check that LinkDeduplicator dispatches each packet once when one link lags the other, including by more than
+the 128 packet half of the 8-bit MAVLink sequence, that a filtered frame is keyed by the same checksum,
+and that a Controller reading two links to a FakeAutopilot dispatches each packet once under every reader mode.
+
+Run:
+    python testing/test_link_health.py
+    python -m pytest testing/test_link_health.py
+"""
+
+import asyncio
+
+import pytest
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from conftest import free_port
+from MAVez.controller import Controller
+from MAVez.link_health import LinkDeduplicator, LinkHealth
+from MAVez.message_filter import FilteredMessage
+
+
+class _Buffer:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, buf):
+        self.data += buf
+
+
+def packets(count: int) -> list:
+    """count packets from one source, the sequence wrapping every 256, with a payload of their own."""
+    sink = _Buffer()
+    mav = mavlink2.MAVLink(sink, srcSystem=1, srcComponent=1)
+    for index in range(count):
+        if index % 50 == 0:
+            mav.heartbeat_send(1, 3, 0, 0, 4)
+        else:
+            mav.attitude_send(index, 0.1, 0.02, 1.5, 0.0, 0.0, 0.0)
+    return mavlink2.MAVLink(None).parse_buffer(bytes(sink.data))
+
+
+def dispatched(lag: int, count: int = 2000) -> int:
+    """Messages dispatched when the second link delivers each packet lag packets after the first."""
+    sent = packets(count)
+    first, second = LinkHealth("first", None), LinkHealth("second", None)
+    deduplicator = LinkDeduplicator([first, second])
+    total = 0
+    for index in range(count + lag):
+        if index < count:
+            total += len(deduplicator.filter(first, [sent[index]]))
+        if index >= lag:
+            total += len(deduplicator.filter(second, [sent[index - lag]]))
+    assert second.duplicates == count, (lag, second.duplicates)
+    return total
+
+
+def test_lag_within_sequence_window():
+    for lag in (0, 1, 50, 127):
+        assert dispatched(lag) == 2000, lag
+
+
+def test_lag_beyond_sequence_window():
+    for lag in (128, 130, 200, 255, 256, 600):
+        assert dispatched(lag) == 2000, lag
+
+
+def test_filtered_message_crc():
+    for mav_msg in packets(300):
+        frame = FilteredMessage(mav_msg.get_msgbuf(), mav_msg.get_type(), mav_msg.get_msgId())
+        assert frame.get_crc() == mav_msg.get_crc()
+
+
+@pytest.mark.parametrize("reader", ["executor", "asyncio", "thread", "process"])
+def test_controller_links(autopilot, radio, reader):
+    first, second = radio(autopilot), radio(autopilot, latency=0.05)
+
+    async def run():
+        controller = Controller(f"tcp:127.0.0.1:{first}", links=[f"tcp:127.0.0.1:{second}"], message_port=free_port(), publish_types=[], reader=reader)
+        await controller.start()
+        await asyncio.sleep(2)
+        await controller.stop()
+        return controller
+
+    controller = asyncio.run(run())
+    links = controller.links
+    dispatched = controller.get_message_seq("ATTITUDE")
+    assert dispatched > 0
+    assert links[0].received > 0 and links[1].received > 0
+    assert links[0].duplicates + links[1].duplicates > 0
+    # each ATTITUDE once: no more than the link that delivered the most of them
+    assert dispatched <= max(link.received for link in links)
+
+
+if __name__ == "__main__":
+    test_lag_within_sequence_window()
+    test_lag_beyond_sequence_window()
+    test_filtered_message_crc()
+    print("ok")
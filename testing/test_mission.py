@@ -0,0 +1,97 @@
+"""
+Check Mission.send_mission with skip_identical against a FakeAutopilot: a mission the vehicle holds is not sent again
+and the mission index is left alone, the record of the last transfer is kept in RECORD_FILE across controllers,
+and the vehicle's mission is downloaded when its item count does not match the record.
+
+Run:
+    python -m pytest testing/test_mission.py
+"""
+
+import asyncio
+import json
+
+from bench_mission_upload import survey
+from conftest import free_port
+from MAVez.controller import Controller
+from MAVez.coordinate import Coordinate
+from MAVez.mission import Mission, mission_fingerprint
+from MAVez.mission_item import MissionItem
+
+
+async def connect(port: int) -> Controller:
+    controller = await Controller.connect(f"tcp:127.0.0.1:{port}", message_port=free_port(), publish_types=[])
+    await controller.start()
+    return controller
+
+
+def test_fingerprint_ignores_home():
+    mission = survey(None, 5)  # type: ignore[arg-type]
+    fields = [item.fields for item in mission.mission_items]
+    home = [MissionItem(0, 0, 16, 1, 1, Coordinate(40.0, -77.0, 300)).fields] + fields[1:]
+    assert mission_fingerprint(0, home) == mission.fingerprint
+    assert mission_fingerprint(1, home) != mission_fingerprint(1, fields)
+    assert mission_fingerprint(0, fields[:4]) != mission.fingerprint
+
+
+def test_skip_identical(autopilot, record_file):
+    async def run():
+        controller = await connect(autopilot)
+        try:
+            mission = survey(controller, 20)
+            assert await mission.send_mission() == 0
+            assert json.loads(record_file.read_text())["0"]["0"]["fingerprint"] == mission.fingerprint
+
+            acks = controller.get_message_seq("COMMAND_ACK")
+            items = controller.get_message_seq("MISSION_ITEM_INT")
+            assert await mission.send_mission(skip_identical=True) == 0
+            # neither uploaded nor downloaded, and the mission index not reset
+            assert controller.get_message_seq("COMMAND_ACK") == acks
+            assert controller.get_message_seq("MISSION_ITEM_INT") == items
+
+            changed = survey(controller, 20)
+            changed.mission_items[7].z = 80
+            assert not await changed.is_on_vehicle()
+            assert await changed.send_mission(skip_identical=True) == 0
+            assert controller.get_message_seq("COMMAND_ACK") > acks
+            assert await changed.is_on_vehicle()
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
+
+
+def test_record_across_controllers(autopilot, record_file):
+    async def run():
+        controller = await connect(autopilot)
+        try:
+            assert await survey(controller, 20).send_mission() == 0
+        finally:
+            await controller.stop()
+
+        controller = await connect(autopilot)
+        try:
+            items = controller.get_message_seq("MISSION_ITEM_INT")
+            assert await survey(controller, 20).is_on_vehicle()
+            # trusted from the record, the count matched
+            assert controller.get_message_seq("MISSION_ITEM_INT") == items
+            assert not await survey(controller, 21).is_on_vehicle()
+
+            # replace the vehicle's mission without updating the record
+            record = record_file.read_text()
+            assert await survey(controller, 25).send_mission() == 0
+            record_file.write_text(record)
+        finally:
+            await controller.stop()
+
+        controller = await connect(autopilot)
+        try:
+            assert not await survey(controller, 20).is_on_vehicle()
+            items = controller.get_message_seq("MISSION_ITEM_INT")
+            # the count does not match the record, so the mission is downloaded and the record replaced
+            assert await survey(controller, 25).is_on_vehicle()
+            assert controller.get_message_seq("MISSION_ITEM_INT") > items
+            assert json.loads(record_file.read_text())["0"]["0"]["count"] == 25
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
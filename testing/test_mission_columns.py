@@ -0,0 +1,84 @@
+"""
+Check columnar mission loading: parse_wpl gives the same items as the line by line loader, rejects malformed lines,
+MissionColumns behaves as a list of MissionItem, and a columnar mission uploads to a FakeAutopilot like any other.
+
+Run:
+    python -m pytest testing/test_mission_columns.py
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from bench_mission_upload import survey
+from bench_wpl_parse import check, load, rows, write_survey
+from conftest import free_port
+from MAVez.controller import Controller
+from MAVez.mission import Mission
+from MAVez.mission_columns import MissionColumns, parse_wpl
+
+HOME = "0\t1\t0\t22\t0\t0\t0\t0\t38.3152762\t-76.5490833\t30\t1\n"
+
+
+def test_same_as_lines(tmp_path):
+    path = str(tmp_path / "survey.waypoints")
+    write_survey(path, 500)
+    check(path, 500)
+
+
+def test_malformed_lines():
+    columns = parse_wpl(["# comment\n", "\n", HOME])
+    assert len(columns) == 1 and columns[0].command == 22
+    assert len(parse_wpl([])) == 0
+    with pytest.raises(ValueError):
+        parse_wpl(["0\t1\t0\t22\t0\t0\t0\t0\t38.3\t-76.5\t30\n"])
+    with pytest.raises(ValueError):
+        parse_wpl([HOME.replace("\t22\t", "\t22.5\t")])
+
+
+def test_sequence(tmp_path):
+    items = survey(None, 10).mission_items  # type: ignore[arg-type]
+    columns = MissionColumns.from_items(items)
+    assert [item.fields for item in columns] == [item.fields for item in items]
+
+    # items are copies, assign them back to change the mission
+    item = columns[3]
+    item.z = 99
+    assert columns[3].z != 99
+    columns[3] = item
+    assert columns[3].z == 99
+
+    part = columns[2:5]
+    assert isinstance(part, MissionColumns) and len(part) == 3
+    part.columns["z"] += 1
+    assert columns[2].z == items[2].z
+
+    del columns[0]
+    columns.insert(0, items[0])
+    columns.append(items[9])
+    columns.extend(items[:2])
+    assert [item.fields for item in columns][9:] == [items[9].fields, items[9].fields, items[0].fields, items[1].fields]
+    assert len(columns) == 13
+
+
+def test_upload_columns(autopilot, tmp_path):
+    path = str(tmp_path / "survey.waypoints")
+    write_survey(path, 200)
+
+    async def run():
+        controller = await Controller.connect(f"tcp:127.0.0.1:{autopilot}", message_port=free_port(), publish_types=[])
+        await controller.start()
+        try:
+            mission = Mission(controller)
+            assert mission.load_mission_from_file(path, columnar=True) == 0
+            assert isinstance(mission.mission_items, MissionColumns)
+            assert await mission.send_mission() == 0
+            vehicle_mission = await Mission.download(controller, timeout=60)
+            assert vehicle_mission is not None
+            assert rows(vehicle_mission) == rows(load(path, False))
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+"""
+Check Mission.download against a FakeAutopilot: an empty mission, a mission uploaded first, read back with one
+or several requests outstanding, also over a lossy radio, and the controller's record of the vehicle's mission.
+
+Run:
+    python -m pytest testing/test_mission_download.py
+"""
+
+import asyncio
+
+import pytest
+
+from bench_mission_upload import survey
+from conftest import free_port
+from MAVez.controller import Controller
+from MAVez.mission import Mission
+from MAVez.mission_download import MissionDownload
+from MAVez.mission_upload import MissionUpload
+
+
+async def connect(port: int) -> Controller:
+    controller = await Controller.connect(f"tcp:127.0.0.1:{port}", message_port=free_port(), publish_types=[])
+    await controller.start()
+    return controller
+
+
+def test_download_empty(autopilot):
+    async def run():
+        controller = await connect(autopilot)
+        try:
+            mission = await Mission.download(controller, timeout=10)
+            assert mission is not None and len(mission) == 0
+            assert controller.uploaded_missions[0] == []
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("window", [1, MissionDownload.WINDOW])
+@pytest.mark.parametrize("loss", [0.0, 0.05])
+def test_download(autopilot, radio, window, loss):
+    async def run():
+        controller = await connect(radio(autopilot, latency=0.005, loss=loss))
+        try:
+            uploaded = survey(controller, 60)
+            assert await MissionUpload(controller, uploaded.mission_items).run(timeout=60) == 0
+            # forget the upload, the download records what the vehicle holds
+            controller.uploaded_missions.clear()
+
+            progress = []
+            mission = await Mission.download(controller, progress=lambda done, total: progress.append((done, total)), timeout=60, window=window)
+            assert mission is not None
+            assert [(item.seq, item.fields) for item in mission.mission_items] == [(item.seq, item.fields) for item in uploaded.mission_items]
+            assert progress[-1] == (60, 60) and len(progress) == 60
+            assert controller.uploaded_missions[0] == [item.fields for item in uploaded.mission_items]
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
+
+
+def test_invalid_window():
+    with pytest.raises(ValueError):
+        MissionDownload(Mission(None), window=0)  # type: ignore[arg-type]
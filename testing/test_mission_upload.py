@@ -0,0 +1,124 @@
+"""
+Check MissionUpload against a FakeAutopilot: the vehicle ends up with every item whether it requests them with
+MISSION_REQUEST_INT or the deprecated MISSION_REQUEST, also over a lossy radio, progress is reported as items are confirmed,
+and the controller records what the vehicle holds. A differential send_mission writes only the changed ranges
+with MISSION_WRITE_PARTIAL_LIST, and falls back to a full upload when the length changes.
+
+Run:
+    python -m pytest testing/test_mission_upload.py
+"""
+
+import asyncio
+
+import pytest
+
+from bench_mission_upload import survey
+from conftest import free_port
+from fake_autopilot import start_fake_autopilot
+from MAVez.controller import Controller
+from MAVez.mission import Mission
+from MAVez.mission_upload import MissionUpload, changed_ranges
+
+
+async def connect(port: int) -> Controller:
+    controller = await Controller.connect(f"tcp:127.0.0.1:{port}", message_port=free_port(), publish_types=[])
+    await controller.start()
+    return controller
+
+
+async def upload_and_check(port: int, count: int) -> MissionUpload:
+    """Upload a survey of count items, check the vehicle holds it, and return the finished upload."""
+    controller = await connect(port)
+    try:
+        mission = survey(controller, count)
+        progress = []
+        upload = MissionUpload(controller, mission.mission_items, progress=lambda done, total: progress.append((done, total)))
+        assert await upload.run(timeout=60) == 0
+        assert progress[-1] == (count, count) and progress == sorted(progress)
+        assert controller.uploaded_missions[0] == [item.fields for item in mission.mission_items]
+
+        vehicle_mission = await Mission.download(controller, timeout=60)
+        assert vehicle_mission is not None and vehicle_mission.fingerprint == mission.fingerprint
+        return upload
+    finally:
+        await controller.stop()
+
+
+def test_upload(autopilot):
+    upload = asyncio.run(upload_and_check(autopilot, 100))
+    assert upload.retransmissions == 0
+
+
+def test_upload_mission_request():
+    port = free_port()
+    process = start_fake_autopilot(port, rate=200, mission_request_int=False)
+    try:
+        asyncio.run(upload_and_check(port, 50))
+    finally:
+        process.terminate()
+        process.join()
+
+
+def test_upload_lossy(autopilot, radio):
+    asyncio.run(upload_and_check(radio(autopilot, latency=0.005, loss=0.05), 100))
+
+
+def test_invalid_range(autopilot):
+    async def run():
+        controller = await Controller.connect(f"tcp:127.0.0.1:{autopilot}", message_port=free_port(), publish_types=[])
+        try:
+            items = survey(controller, 10).mission_items
+            with pytest.raises(ValueError):
+                MissionUpload(controller, items, start=2)
+            with pytest.raises(ValueError):
+                MissionUpload(controller, items, start=5, end=10)
+            assert len(MissionUpload(controller, items, start=5, end=9)) == 5
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
+
+
+def test_changed_ranges():
+    items = survey(None, 20).mission_items  # type: ignore[arg-type]
+    uploaded = [item.fields for item in items]
+    assert changed_ranges(uploaded, items) == []
+    for index in (3, 5, 12, 19):
+        items[index].z += 5
+    # 3 and 5 are one unchanged item apart, merged
+    assert changed_ranges(uploaded, items) == [(3, 5), (12, 12), (19, 19)]
+
+
+def test_differential(autopilot):
+
+    async def run():
+        controller = await connect(autopilot)
+        try:
+            assert await survey(controller, 100).send_mission() == 0
+
+            mission = survey(controller, 100)
+            for index in (10, 11, 60):
+                mission.mission_items[index].z = 90
+            requests = controller.get_message_seq("MISSION_REQUEST_INT")
+            assert await mission.send_mission(differential=True) == 0
+            # only the changed items were requested
+            assert controller.get_message_seq("MISSION_REQUEST_INT") - requests == 3
+            vehicle_mission = await Mission.download(controller, timeout=60)
+            assert vehicle_mission is not None and vehicle_mission.fingerprint == mission.fingerprint
+
+            # nothing changed, nothing written
+            requests = controller.get_message_seq("MISSION_REQUEST_INT")
+            assert await mission.send_mission(differential=True) == 0
+            assert controller.get_message_seq("MISSION_REQUEST_INT") == requests
+
+            # a partial write cannot change the length, the whole mission is sent
+            longer = survey(controller, 110)
+            requests = controller.get_message_seq("MISSION_REQUEST_INT")
+            assert await longer.send_mission(differential=True) == 0
+            assert controller.get_message_seq("MISSION_REQUEST_INT") - requests == 110
+            vehicle_mission = await Mission.download(controller, timeout=60)
+            assert vehicle_mission is not None and vehicle_mission.fingerprint == longer.fingerprint
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,68 @@
+"""
+Check that PublishQueue never blocks its producer: a full queue drops by its policy and counts what it dropped.
+
+Run:
+    python -m pytest testing/test_publish_queue.py
+"""
+
+import asyncio
+
+import pytest
+from lingo import Message
+
+from MAVez.publish_queue import PublishQueue
+
+
+def message(topic: str, index: int) -> Message:
+    return Message(topic=topic, header={"index": index}, payload=b"")
+
+
+def drain(queue: PublishQueue) -> list[tuple[str, int]]:
+    items = []
+    while not queue.empty():
+        item = queue.get_nowait()
+        items.append((item.topic, item.header["index"]))
+    return items
+
+
+def test_drop_oldest():
+    queue = PublishQueue(3, "drop_oldest")
+    for index in range(5):
+        queue.put_nowait(message("ATTITUDE", index))
+    assert drain(queue) == [("ATTITUDE", 2), ("ATTITUDE", 3), ("ATTITUDE", 4)]
+    assert queue.dropped == 2 and queue.dropped_by_topic == {"ATTITUDE": 2}
+
+
+def test_drop_newest():
+    queue = PublishQueue(3, "drop_newest")
+    for index in range(5):
+        queue.put_nowait(message("ATTITUDE", index))
+    assert drain(queue) == [("ATTITUDE", 0), ("ATTITUDE", 1), ("ATTITUDE", 2)]
+    assert queue.dropped == 2
+
+
+def test_coalesce():
+    queue = PublishQueue(2, "coalesce")
+    queue.put_nowait(message("ATTITUDE", 0))
+    queue.put_nowait(message("VFR_HUD", 1))
+    queue.put_nowait(message("ATTITUDE", 2))  # replaces the queued ATTITUDE in place
+    assert queue.qsize() == 2
+    queue.put_nowait(message("HEARTBEAT", 3))  # a new topic on a full queue discards the oldest
+    assert drain(queue) == [("VFR_HUD", 1), ("HEARTBEAT", 3)]
+    assert queue.dropped_by_topic == {"ATTITUDE": 2}
+
+
+def test_unbounded_and_async_put():
+    async def run():
+        queue = PublishQueue(0)
+        for index in range(5000):
+            await queue.put(message("ATTITUDE", index))
+        assert queue.qsize() == 5000 and queue.dropped == 0
+        assert (await queue.get()).header["index"] == 0
+
+    asyncio.run(run())
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        PublishQueue(policy="drop_everything")
@@ -0,0 +1,77 @@
+"""
+Check the shared state block: a reader sees the latest message of each kept type written by a SharedStateWriter
+or by a Controller reading a FakeAutopilot, and gives up on a slot left mid-write instead of spinning forever.
+
+Run:
+    python -m pytest testing/test_shared_state.py
+"""
+
+import asyncio
+import mmap
+import time
+
+import pytest
+from pymavlink.dialects.v20 import ardupilotmega as mavlink2
+
+from conftest import free_port
+from MAVez.controller import Controller
+from MAVez.enums.mav_message import MAVMessage
+from MAVez.shared_state import SharedStateReader, SharedStateWriter, _slots_offset
+
+
+def attitudes(count: int) -> list:
+    mav = mavlink2.MAVLink(None, srcSystem=1, srcComponent=1)
+    messages = []
+    for index in range(count):
+        message = mav.attitude_encode(index, 0.1, 0.2, 0.3, 0.0, 0.0, 0.0)
+        message.pack(mav)
+        messages.append(message)
+    return messages
+
+
+def test_latest_message(tmp_path):
+    path = str(tmp_path / "state")
+    writer = SharedStateWriter(path, [MAVMessage.ATTITUDE, MAVMessage.HEARTBEAT])
+    with SharedStateReader(path) as reader:
+        assert reader.message_types == [MAVMessage.ATTITUDE, MAVMessage.HEARTBEAT]
+        assert reader.read(MAVMessage.ATTITUDE) is None
+        for message in attitudes(3):
+            writer.update("ATTITUDE", message)
+        writer.update("VFR_HUD", message)  # not kept
+        frame, count, timestamp = reader.read_frame(MAVMessage.ATTITUDE)
+        assert frame == message.get_msgbuf() and count == 3 and timestamp <= time.time()
+        assert reader.read(MAVMessage.ATTITUDE)["time_boot_ms"] == 2
+        assert reader.read(MAVMessage.HEARTBEAT) is None
+        with pytest.raises(KeyError):
+            reader.read(MAVMessage.VFR_HUD)
+    writer.close()
+
+
+def test_writer_died_mid_write(tmp_path):
+    path = str(tmp_path / "state")
+    writer = SharedStateWriter(path, [MAVMessage.ATTITUDE])
+    writer.update("ATTITUDE", attitudes(1)[0])
+    with open(path, "r+b") as file, mmap.mmap(file.fileno(), 0) as block, SharedStateReader(path) as reader:
+        block[_slots_offset(1)] |= 1  # leave the seqlock odd, as a writer killed mid-write would
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            reader.read_frame(MAVMessage.ATTITUDE)
+        assert time.monotonic() - start < reader.READ_TIMEOUT + 0.5
+    writer.close()
+
+
+def test_controller_shared_state(autopilot, tmp_path):
+    path = str(tmp_path / "state")
+
+    async def run():
+        controller = await Controller.connect(f"tcp:127.0.0.1:{autopilot}", message_port=free_port(), publish_types=[], shared_state_path=path)
+        await controller.start()
+        try:
+            await asyncio.sleep(1)
+            with SharedStateReader(path) as reader:
+                assert reader.read(MAVMessage.HEARTBEAT) is not None
+                assert reader.read_frame(MAVMessage.ATTITUDE)[1] > 0
+        finally:
+            await controller.stop()
+
+    asyncio.run(run())
@@ -2,17 +2,62 @@
 
 import xml.etree.ElementTree as ET
 import argparse
+import datetime
+import os
+import re
 
+DEFAULT_HEADER = [
+    "# mav_message.py",
+    "# version: 1.0.0",
+    "# ENUMS FROM MAVLINK",
+    "# Creation Date: {today}",
+    "# Last Modified: {today}",
+    "# Organization: PSU UAS",
+]
+
+STRING_METHOD = '''
+    @staticmethod
+    def string(message_code: int | None) -> str:
+        """Get the MAV_MESSAGE string from the enum
+
+        Args:
+            message_code (int | None): Integer value of MAV_MESSAGE enum
+
+        Returns:
+            str: String representation of corresponding MAV_MESSAGE
+        """
+        if message_code is None:
+            return "UNKNOWN"
+
+        try:
+            return MAVMessage(message_code).name
+        except ValueError:
+            return f"UNKNOWN CODE: {message_code}"
+'''
+
+
+def parse_mavlink_messages(xml_path: str, seen: set[str] | None = None) -> dict[str, int]:
+    """Messages of a dialect, including those of the dialects it includes, such as HEARTBEAT from minimal.xml."""
+    seen = set() if seen is None else seen
+    xml_path = os.path.abspath(xml_path)
+    if xml_path in seen:
+        return {}
+    seen.add(xml_path)
 
-def parse_mavlink_messages(xml_path: str) -> dict[str, int]:
     tree = ET.parse(xml_path)
     root = tree.getroot()
 
+    result = {}
+    for include in root.findall("include"):
+        if include.text:
+            result.update(parse_mavlink_messages(os.path.join(os.path.dirname(xml_path), include.text.strip()), seen))
+
     messages_el = root if root.tag == "messages" else root.find(".//messages")
     if messages_el is None:
-        raise ValueError("No <messages> section found in XML.")
+        if not result:
+            raise ValueError(f"No <messages> section found in {xml_path} or the files it includes.")
+        return result
 
-    result = {}
     for msg in messages_el.findall("message"):
         name = msg.get("name")
         msg_id = msg.get("id")
@@ -21,30 +66,57 @@ def parse_mavlink_messages(xml_path: str) -> dict[str, int]:
     return result
 
 
-def write_enum_file(messages: dict[str, int], output_path: str) -> None:
-    lines = [
-        "from enum import Enum",
+def read_enum_file(output_path: str) -> tuple[list[str], dict[str, int]]:
+    """Header comment lines and members of a previously generated file, empty if there is none."""
+    if not os.path.exists(output_path):
+        return [], {}
+    with open(output_path) as f:
+        text = f.read()
+    header = []
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            break
+        header.append(line)
+    members = {name: int(id_) for name, id_ in re.findall(r"^    (\w+) = (\d+)$", text, re.M)}
+    return header, members
+
+
+def write_enum_file(messages: dict[str, int], output_path: str, header: list[str]) -> None:
+    today = datetime.date.today().isoformat()
+    if header:
+        header = [f"# Last Modified: {today}" if line.startswith("# Last Modified:") else line for line in header]
+    else:
+        header = [line.format(today=today) for line in DEFAULT_HEADER]
+    lines = header + [
         "",
+        "from enum import Enum",
         "",
-        "class MavMessageType(Enum):",
-        '    """',
-        "    Enum for MAVLink message types.",
+        "class MAVMessage(Enum):",
+        '    """Enum for MAVLink message types.',
         '    """',
-        "",
     ]
     for name, id_ in sorted(messages.items(), key=lambda x: x[1]):
         lines.append(f"    {name} = {id_}")
 
     with open(output_path, "w") as f:
-        f.write("\n".join(lines) + "\n")
+        f.write("\n".join(lines) + "\n" + STRING_METHOD)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("xml_path", help="Path to MAVLink XML file")
+    parser.add_argument("xml_path", help="Path to MAVLink XML file, the files it includes are read too")
     parser.add_argument("output_path", help="Path for generated Python enum file")
+    parser.add_argument("--prune", action="store_true", help="Drop members of the existing file that are not in the XML, by default they are kept")
     args = parser.parse_args()
 
     messages = parse_mavlink_messages(args.xml_path)
-    write_enum_file(messages, args.output_path)
-    print(f"Wrote {len(messages)} message types to {args.output_path}")
\ No newline at end of file
+    header, existing = read_enum_file(args.output_path)
+    if not args.prune:
+        # a member removed from the enum breaks code using it, keep those the dialect no longer has unless their id was reused
+        ids = set(messages.values())
+        kept = {name: id_ for name, id_ in existing.items() if name not in messages and id_ not in ids}
+        if kept:
+            print(f"Kept {len(kept)} message types not in {args.xml_path}: {', '.join(sorted(kept))}")
+        messages.update(kept)
+    write_enum_file(messages, args.output_path, header)
+    print(f"Wrote {len(messages)} message types to {args.output_path}")